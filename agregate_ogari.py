@@ -0,0 +1,386 @@
+# --- Agregate per ogar, actualizate incremental ---
+# Pentru fiecare (ogar, pistă, distanță) se păstrează sume, numărători, minime și rândul cel mai recent,
+# actualizate la fiecare rând adăugat (O(1), plus O(log n) pentru heap-uri) și la eliminarea unui rând corectat.
+# Indicatorii unui participant se citesc direct din agregate, fără a parcurge istoricul ogarului, deci latența
+# per cursă nu mai crește cu numărul de curse ale unui veteran.
+#
+# Construit din HistoryIndex (ordinea cea mai recentă primul), rezultatul este identic cu calculeaza_indicatori_ogar.
+# După adăugări/eliminări ulterioare, mediile timpilor pot diferi doar prin rotunjirea în virgulă mobilă.
+
+import heapq
+from datetime import datetime
+from fractions import Fraction
+
+from predictor_logic import (
+    flaguri_remark,
+    extrage_indicatori_curba,
+    determina_stil_curba,
+    determina_status_recenta,
+    calculeaza_indicatori_ogar,
+)
+from index_istoric import cheie_rand_istoric
+
+
+def _ordine_rand(rand, numar_ordine):
+    """
+    Cheia de ordonare a unui rând: cele mai recente primele, la aceeași dată ordinea de adăugare,
+    rândurile fără dată la final (aceeași ordine ca listele din HistoryIndex).
+    """
+    data = rand.get('Data Cursei Parsata')
+    if isinstance(data, datetime):
+        return (0, -data.toordinal(), numar_ordine)
+    return (1, 0, numar_ordine)
+
+
+def _medie_intregi(suma, numar):
+    """
+    Media unor întregi ca în statistics.mean: int dacă este exactă, altfel float.
+    """
+    medie = Fraction(suma) / numar
+    return int(medie) if medie.denominator == 1 else float(medie)
+
+
+class _MinimCuEliminare:
+    """
+    Minim al unui multiset cu eliminări leneșe (heap + contor de valori eliminate).
+    """
+
+    __slots__ = ('heap', 'eliminate')
+
+    def __init__(self):
+        self.heap = []
+        self.eliminate = {}
+
+    def adauga(self, valoare):
+        heapq.heappush(self.heap, valoare)
+
+    def elimina(self, valoare):
+        self.eliminate[valoare] = self.eliminate.get(valoare, 0) + 1
+
+    def minim(self):
+        heap = self.heap
+        while heap and self.eliminate.get(heap[0]):
+            valoare = heapq.heappop(heap)
+            self.eliminate[valoare] -= 1
+            if not self.eliminate[valoare]:
+                del self.eliminate[valoare]
+        return heap[0] if heap else None
+
+
+class _PrimulRand:
+    """
+    Primul rând (după _ordine_rand) dintr-o mulțime cu eliminări: heap de (ordine, id) + id-uri eliminate.
+    """
+
+    __slots__ = ('heap', 'eliminate')
+
+    def __init__(self):
+        self.heap = []
+        self.eliminate = set()
+
+    def adauga(self, ordine, id_rand):
+        heapq.heappush(self.heap, (ordine, id_rand))
+
+    def elimina(self, id_rand):
+        self.eliminate.add(id_rand)
+
+    def primul(self):
+        heap = self.heap
+        while heap and heap[0][1] in self.eliminate:
+            self.eliminate.discard(heapq.heappop(heap)[1])
+        return heap[0][1] if heap else None
+
+
+class _AgregateCheie:
+    """
+    Agregatele rândurilor unui (ogar, pistă, distanță).
+    """
+
+    __slots__ = ('numar_randuri', 'suma_timp', 'numar_timp', 'min_timp', 'suma_sectional', 'numar_sectional',
+                 'min_sectional', 'suma_timp_box', 'numar_timp_box', 'suma_box_start', 'numar_box_start',
+                 'numar_remark', 'numar_probleme', 'numar_liber', 'suma_media_curba', 'numar_media_curba', 'numar_media_curba_float',
+                 'suma_ultima_curba', 'numar_ultima_curba', 'suma_diferenta_curba', 'numar_diferenta_curba',
+                 'cu_varsta', 'cu_sex', 'cu_data')
+
+    def __init__(self):
+        self.numar_randuri = 0
+        self.suma_timp = 0.0
+        self.numar_timp = 0
+        self.min_timp = _MinimCuEliminare()
+        self.suma_sectional = 0.0
+        self.numar_sectional = 0
+        self.min_sectional = _MinimCuEliminare()
+        self.suma_timp_box = {}
+        self.numar_timp_box = {}
+        self.suma_box_start = 0
+        self.numar_box_start = 0
+        self.numar_remark = 0
+        self.numar_probleme = 0
+        self.numar_liber = 0
+        # Media pe curbă a unui rând (int sau float, din statistics.mean); suma exactă + tipul valorilor
+        # dau același rezultat ca statistics.mean peste toate rândurile
+        self.suma_media_curba = Fraction(0)
+        self.numar_media_curba = 0
+        self.numar_media_curba_float = 0
+        self.suma_ultima_curba = 0
+        self.numar_ultima_curba = 0
+        self.suma_diferenta_curba = 0
+        self.numar_diferenta_curba = 0
+        self.cu_varsta = _PrimulRand()
+        self.cu_sex = _PrimulRand()
+        self.cu_data = _PrimulRand()
+
+    def aplica(self, rand, id_rand, ordine, semn):
+        """
+        Adaugă (semn=1) sau elimină (semn=-1) contribuția unui rând.
+        """
+        self.numar_randuri += semn
+
+        timp = rand.get('Timp Final (s)')
+        timp_valid = timp is not None and timp > 0.0
+        if timp_valid:
+            self.suma_timp = self.suma_timp + timp if semn > 0 else self.suma_timp - timp
+            self.numar_timp += semn
+            if semn > 0:
+                self.min_timp.adauga(timp)
+            else:
+                self.min_timp.elimina(timp)
+            if not self.numar_timp:
+                self.suma_timp = 0.0
+
+        sectional = rand.get('Timp Secțional 1 (s)')
+        if sectional is not None and sectional > 0.0:
+            self.suma_sectional = self.suma_sectional + sectional if semn > 0 else self.suma_sectional - sectional
+            self.numar_sectional += semn
+            if semn > 0:
+                self.min_sectional.adauga(sectional)
+            else:
+                self.min_sectional.elimina(sectional)
+            if not self.numar_sectional:
+                self.suma_sectional = 0.0
+
+        box = rand.get('Numar Box (Trap)')
+        if box is not None and isinstance(box, int) and 1 <= box <= 6:
+            self.suma_box_start += semn * box
+            self.numar_box_start += semn
+            if timp_valid:
+                suma = self.suma_timp_box.get(box, 0.0)
+                self.suma_timp_box[box] = suma + timp if semn > 0 else suma - timp
+                self.numar_timp_box[box] = self.numar_timp_box.get(box, 0) + semn
+                if not self.numar_timp_box[box]:
+                    del self.suma_timp_box[box]
+                    del self.numar_timp_box[box]
+
+        if rand.get('REMARK', '') is not None:
+            are_probleme, alergare_libera = flaguri_remark(rand)
+            self.numar_remark += semn
+            self.numar_probleme += semn * are_probleme
+            self.numar_liber += semn * alergare_libera
+
+        _, media, poz_ultima, diff = extrage_indicatori_curba(rand.get('CURBA', rand.get('Curba', '')))
+        if media is not None:
+            self.suma_media_curba += semn * Fraction(media)
+            self.numar_media_curba += semn
+            self.numar_media_curba_float += semn * isinstance(media, float)
+        if poz_ultima is not None:
+            self.suma_ultima_curba += semn * poz_ultima
+            self.numar_ultima_curba += semn
+        if diff is not None:
+            self.suma_diferenta_curba += semn * diff
+            self.numar_diferenta_curba += semn
+
+        for conditie, prim in ((rand.get('Varsta') is not None, self.cu_varsta),
+                               (rand.get('Sex') is not None and str(rand.get('Sex')).strip() != '', self.cu_sex),
+                               (isinstance(rand.get('Data Cursei Parsata'), datetime), self.cu_data)):
+            if conditie:
+                if semn > 0:
+                    prim.adauga(ordine, id_rand)
+                else:
+                    prim.elimina(id_rand)
+
+
+class AgregateOgari:
+    """
+    Depozit de agregate per (ogar, pistă, distanță), cu adăugare și eliminare de rânduri.
+    indicatori_ogar(...) are aceeași semnătură ca IstoricColumnar.indicatori_ogar, deci depozitul poate fi dat
+    ca index_istoric în prezice_cursa_combinata.
+    """
+
+    def __init__(self, istoric=None):
+        self.istoric = []
+        self._randuri = {}
+        self._ordine = {}
+        self._ids_pe_cheie_rand = {}
+        self._ids_relevante = {}
+        self._agregate = {}
+        self._numar_randuri_ogar = {}
+        self._urmatorul_id = 0
+        if istoric:
+            self.adauga_randuri(istoric)
+
+    @classmethod
+    def din_index(cls, index_istoric):
+        """
+        Construiește depozitul din HistoryIndex, adăugând rândurile fiecărei chei în ordinea indexului
+        (cele mai recente primele), astfel încât sumele să fie identice cu cele din calculeaza_indicatori_ogar.
+        """
+        depozit = cls()
+        pozitie = {id(rand): i for i, rand in enumerate(index_istoric.istoric)}
+        for randuri in index_istoric.per_ogar_pista_distanta.values():
+            for rand in randuri:
+                depozit._adauga(rand, pozitie[id(rand)])
+        depozit.istoric = list(index_istoric.istoric)
+        depozit._urmatorul_id = len(index_istoric.istoric)
+        return depozit
+
+    def _adauga(self, rand, id_rand):
+        ordine = _ordine_rand(rand, id_rand)
+        self._randuri[id_rand] = rand
+        self._ordine[id_rand] = ordine
+        self._ids_pe_cheie_rand.setdefault(cheie_rand_istoric(rand), []).append(id_rand)
+        nume = rand.get('Nume Ogar')
+        self._numar_randuri_ogar[nume] = self._numar_randuri_ogar.get(nume, 0) + 1
+        cheie = (nume, rand.get('Pista'), rand.get('Distanta Cursei (m)'))
+        self._ids_relevante.setdefault(cheie, set()).add(id_rand)
+        agregate = self._agregate.get(cheie)
+        if agregate is None:
+            agregate = self._agregate[cheie] = _AgregateCheie()
+        agregate.aplica(rand, id_rand, ordine, 1)
+
+    def adauga(self, rand):
+        id_rand = self._urmatorul_id
+        self._urmatorul_id += 1
+        self.istoric.append(rand)
+        self._adauga(rand, id_rand)
+
+    def adauga_randuri(self, randuri):
+        for rand in randuri:
+            self.adauga(rand)
+
+    def elimina(self, rand):
+        """
+        Elimină un rând (identificat după cheie_rand_istoric, ex. un rezultat corectat ulterior).
+        Returnează False dacă rândul nu există în depozit.
+        """
+        ids = self._ids_pe_cheie_rand.get(cheie_rand_istoric(rand))
+        if not ids:
+            return False
+        id_rand = ids.pop()
+        if not ids:
+            del self._ids_pe_cheie_rand[cheie_rand_istoric(rand)]
+        rand_stocat = self._randuri.pop(id_rand)
+        ordine = self._ordine.pop(id_rand)
+
+        nume = rand_stocat.get('Nume Ogar')
+        self._numar_randuri_ogar[nume] -= 1
+        if not self._numar_randuri_ogar[nume]:
+            del self._numar_randuri_ogar[nume]
+        cheie = (nume, rand_stocat.get('Pista'), rand_stocat.get('Distanta Cursei (m)'))
+        agregate = self._agregate[cheie]
+        agregate.aplica(rand_stocat, id_rand, ordine, -1)
+        if not agregate.numar_randuri:
+            del self._agregate[cheie]
+        ids_relevante = self._ids_relevante[cheie]
+        ids_relevante.discard(id_rand)
+        if not ids_relevante:
+            del self._ids_relevante[cheie]
+
+        # Singura operație O(n): lista completă a istoricului (eliminările sunt rare)
+        for i, r in enumerate(self.istoric):
+            if r is rand_stocat:
+                del self.istoric[i]
+                break
+        return True
+
+    def inlocuieste(self, rand_vechi, rand_nou):
+        """
+        Corectează un rezultat: elimină rândul vechi și adaugă rândul nou.
+        """
+        gasit = self.elimina(rand_vechi)
+        self.adauga(rand_nou)
+        return gasit
+
+    def __len__(self):
+        return len(self._randuri)
+
+    def randuri_relevante(self, nume_ogar, pista, distanta):
+        """
+        Rândurile ogarului pe pistă și distanță, în ordinea din HistoryIndex (cele mai recente primele).
+        """
+        ids = self._ids_relevante.get((nume_ogar, pista, distanta))
+        if not ids:
+            return []
+        return [self._randuri[id_rand] for id_rand in sorted(ids, key=self._ordine.__getitem__)]
+
+    def indicatori_ogar(self, nume_ogar, pista_cursa, distanta_cursa, box_curent, data_cursa_curenta):
+        """
+        Indicatorii ogarului citiți din agregate, în forma întoarsă de calculeaza_indicatori_ogar.
+        """
+        rezultat = calculeaza_indicatori_ogar([], pista_cursa, distanta_cursa, box_curent, data_cursa_curenta)
+        if not self._numar_randuri_ogar.get(nume_ogar):
+            return rezultat
+
+        rezultat['Stil_Curba'] = determina_stil_curba(None)
+        a = self._agregate.get((nume_ogar, pista_cursa, distanta_cursa))
+        if a is None:
+            return rezultat
+
+        if a.numar_remark:
+            rezultat['Prob_Probleme'] = a.numar_probleme / a.numar_remark
+            rezultat['Prob_Liber'] = a.numar_liber / a.numar_remark
+        if a.numar_media_curba:
+            media_curba = a.suma_media_curba / a.numar_media_curba
+            rezultat['Media_Curba'] = float(media_curba) if a.numar_media_curba_float else _medie_intregi(media_curba, 1)
+        if a.numar_ultima_curba:
+            rezultat['Pozitie_Ultima_Curba'] = _medie_intregi(a.suma_ultima_curba, a.numar_ultima_curba)
+        if a.numar_diferenta_curba:
+            rezultat['Diferenta_Prima_Ultima_Curba'] = _medie_intregi(a.suma_diferenta_curba, a.numar_diferenta_curba)
+        rezultat['Stil_Curba'] = determina_stil_curba(rezultat['Diferenta_Prima_Ultima_Curba'])
+
+        id_varsta = a.cu_varsta.primul()
+        if id_varsta is not None:
+            rezultat['Varsta'] = self._randuri[id_varsta]['Varsta']
+            rezultat['Are Istoric Varsta'] = True
+        id_sex = a.cu_sex.primul()
+        if id_sex is not None:
+            rezultat['Sex'] = str(self._randuri[id_sex]['Sex']).strip()
+            rezultat['Are Istoric Sex'] = True
+
+        ultima_data = None
+        id_recent = a.cu_data.primul()
+        if id_recent is not None:
+            ultimul_rand = self._randuri[id_recent]
+            ultima_data = ultimul_rand['Data Cursei Parsata']
+            rezultat['Are Istoric Recenta'] = True
+            grad = ultimul_rand.get('Grad Cursa')
+            if grad is not None and str(grad).strip() != '':
+                rezultat['Grad Istoric'] = str(grad).strip()
+                rezultat['Are Istoric Grad'] = True
+        status, zile = determina_status_recenta(ultima_data, data_cursa_curenta)
+        rezultat['Recency Status'] = status
+        rezultat['Days Since Last Race'] = zile
+
+        if a.numar_timp:
+            rezultat['Are Istoric Relevant General'] = True
+            rezultat['Cel_Mai_Bun_Timp'] = a.min_timp.minim()
+            rezultat['Timp_Mediu'] = a.suma_timp / a.numar_timp
+
+        if a.numar_timp_box:
+            timpi_medii_per_box = {box: a.suma_timp_box[box] / numar for box, numar in a.numar_timp_box.items()}
+            rezultat['Timpi_Medii_Per_Box'] = timpi_medii_per_box
+            rezultat['Are Istoric Timpi Per Box'] = True
+            if box_curent is not None and box_curent in timpi_medii_per_box:
+                rezultat['Are Istoric Relevant Box'] = True
+                rezultat['Timp_Mediu_Box_Specific'] = timpi_medii_per_box[box_curent]
+
+        if a.numar_sectional:
+            rezultat['Are Istoric Relevant Sectional'] = True
+            rezultat['Are Istoric Relevant Sectional Avg'] = True
+            rezultat['Cel_Mai_Bun_Sectional'] = a.min_sectional.minim()
+            rezultat['Timp_Mediu_Sectional'] = a.suma_sectional / a.numar_sectional
+
+        if a.numar_box_start:
+            rezultat['Are Istoric Relevant Box Start'] = True
+            rezultat['Medie_Box_Start'] = a.suma_box_start / a.numar_box_start
+
+        return rezultat
@@ -0,0 +1,253 @@
+# --- Backtest walk-forward pe cursele din istoric ---
+# Cursele trecute se reconstruiesc grupând rândurile după (dată, pistă, distanță, grad). Pentru fiecare cursă
+# se prezice clasamentul folosind DOAR istoricul strict anterior datei cursei, cu aceleași funcții ca predicția
+# normală (calculeaza_indicatori_ogar + calculeaza_timp_prezis_combinat), apoi se compară cu rezultatul real.
+# Implicit indicatorii se obțin din agregatele prefix (IndicatoriAsOf): un bisect per ogar în loc de
+# re-filtrarea istoricului pentru fiecare cursă; varianta directă rămâne referința (foloseste_as_of=False).
+
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from config import TIMP_MAX_NECUNOSCUT, BACKTEST_MAX_PROCESE, BACKTEST_MIN_PARTICIPANTI, BACKTEST_FOLOSESTE_AS_OF
+from predictor_logic import (
+    PONDERI_TIMP_FINAL_IMPLICITE,
+    calculeaza_indicatori_ogar,
+    calculeaza_timp_prezis_combinat,
+    incarca_istoric_indexat,
+)
+from indicatori_asof import IndicatoriAsOf
+from diagnostice import colecteaza, colector_curent, cu_diagnostice
+
+# Indexul istoricului (și agregatele as-of) în procesele worker, încărcate o dată per proces
+_INDEX_WORKER = None
+_AS_OF_WORKER = None
+
+
+def reconstruieste_curse(istoric, pista=None, data_start=None, data_sfarsit=None, min_participanti=None):
+    """
+    Reconstruiește cursele din istoric. Returnează (curse, numar_ambigue), curse sortate după dată.
+    Grupurile în care același box apare de două ori (ex. două curse de același grad în aceeași zi)
+    sunt ambigue și se ignoră; la fel grupurile cu mai puțin de min_participanti ogari.
+    """
+    min_participanti = BACKTEST_MIN_PARTICIPANTI if min_participanti is None else min_participanti
+    grupuri = defaultdict(list)
+    for rand in istoric:
+        data = rand.get('Data Cursei Parsata')
+        if data is None or rand.get('Pista') is None or not isinstance(rand.get('Distanta Cursei (m)'), int):
+            continue
+        if pista is not None and rand.get('Pista') != pista:
+            continue
+        if (data_start is not None and data < data_start) or (data_sfarsit is not None and data > data_sfarsit):
+            continue
+        cheie = (data, rand.get('Pista'), rand.get('Distanta Cursei (m)'), (rand.get('Grad Cursa') or '').strip())
+        grupuri[cheie].append(rand)
+
+    curse = []
+    numar_ambigue = 0
+    for (data, pista_cursa, distanta, grad), randuri in sorted(grupuri.items(), key=lambda kv: kv[0][0]):
+        boxe = [rand.get('Numar Box (Trap)') for rand in randuri]
+        if None in boxe or len(set(boxe)) != len(boxe) or len({rand.get('Nume Ogar') for rand in randuri}) != len(randuri):
+            numar_ambigue += 1
+            continue
+        if len(randuri) < min_participanti:
+            continue
+        randuri = sorted(randuri, key=lambda r: r['Numar Box (Trap)'])
+        curse.append({
+            'data': data,
+            'pista': pista_cursa,
+            'distanta_m': distanta,
+            'grad': grad,
+            'ogari_participanti': [(r['Nume Ogar'], r['Numar Box (Trap)']) for r in randuri],
+            'pozitii': {r['Nume Ogar']: r.get('Pozitie Finala') for r in randuri},
+            'timpi': {r['Nume Ogar']: r.get('Timp Final (s)') for r in randuri},
+        })
+    return curse, numar_ambigue
+
+
+def indicatori_inainte_de(index_istoric, nume_ogar, pista, distanta, box, data_cursa):
+    """
+    Indicatorii ogarului calculați doar din cursele cu dată strict anterioară data_cursa.
+    """
+    istoric_anterior = [r for r in index_istoric.randuri_ogar(nume_ogar)
+                        if r.get('Data Cursei Parsata') is not None and r['Data Cursei Parsata'] < data_cursa]
+    relevant_anterior = [r for r in index_istoric.randuri_relevante(nume_ogar, pista, distanta)
+                         if r.get('Data Cursei Parsata') is not None and r['Data Cursei Parsata'] < data_cursa]
+    return calculeaza_indicatori_ogar(istoric_anterior, pista, distanta, box, data_cursa, istoric_relevant=relevant_anterior)
+
+
+def prezice_cursa_istorica(index_istoric, cursa, greutati_timp_final=None, functie_indicatori=None):
+    """
+    Predicția pentru o cursă reconstruită: [(nume_ogar, timp_prezis), ...], cel mai rapid primul.
+    functie_indicatori(nume, pista, distanta, box, data) înlocuiește calculul implicit din index (ex. as-of).
+    """
+    greutati_timp_final = greutati_timp_final or PONDERI_TIMP_FINAL_IMPLICITE
+    if functie_indicatori is None:
+        def functie_indicatori(nume, pista, distanta, box, data):
+            return indicatori_inainte_de(index_istoric, nume, pista, distanta, box, data)
+
+    predictie = []
+    for nume_ogar, box in cursa['ogari_participanti']:
+        indicatori = functie_indicatori(nume_ogar, cursa['pista'], cursa['distanta_m'], box, cursa['data'])
+        indicatori['Nume Ogar'] = nume_ogar
+        indicatori['Grad Cursa Curenta'] = cursa['grad']
+        predictie.append((nume_ogar, calculeaza_timp_prezis_combinat(indicatori, greutati_timp_final)))
+    return sorted(predictie, key=lambda p: p[1])
+
+
+def _spearman(ranguri_a, ranguri_b):
+    n = len(ranguri_a)
+    if n < 2:
+        return None
+    d2 = sum((a - b) ** 2 for a, b in zip(ranguri_a, ranguri_b))
+    return 1.0 - 6.0 * d2 / (n * (n * n - 1))
+
+
+def evalueaza_cursa(cursa, predictie):
+    """
+    Scorurile unei curse: câștigător ghicit, suprapunere top 3, Spearman (predicție vs. sosire)
+    și eroarea absolută medie a timpului. Ogarii fără poziție reală nu intră în scoruri.
+    None dacă mai puțin de doi ogari au atât timp prezis cât și poziție reală.
+    """
+    cu_predictie = [(nume, timp) for nume, timp in predictie
+                    if timp < TIMP_MAX_NECUNOSCUT and isinstance(cursa['pozitii'].get(nume), int)]
+    if len(cu_predictie) < 2:
+        return None
+
+    ordine_prezisa = [nume for nume, _ in cu_predictie]
+    ordine_reala = sorted(ordine_prezisa, key=lambda nume: cursa['pozitii'][nume])
+    rang_real = {nume: i for i, nume in enumerate(ordine_reala)}
+
+    erori_timp = [abs(timp - cursa['timpi'][nume]) for nume, timp in cu_predictie
+                  if isinstance(cursa['timpi'].get(nume), (int, float)) and cursa['timpi'][nume] > 0]
+    top = min(3, len(ordine_prezisa))
+    return {
+        'participanti_evaluati': len(cu_predictie),
+        'castigator_ghicit': ordine_prezisa[0] == ordine_reala[0],
+        'top3_suprapunere': len(set(ordine_prezisa[:top]) & set(ordine_reala[:top])) / top,
+        'spearman': _spearman(list(range(len(ordine_prezisa))), [rang_real[nume] for nume in ordine_prezisa]),
+        'mae_timp': sum(erori_timp) / len(erori_timp) if erori_timp else None,
+        'sansa_aleatoare': 1.0 / len(cu_predictie),
+    }
+
+
+def _evalueaza_curse(index_istoric, as_of, curse, greutati_timp_final):
+    functie_indicatori = as_of.indicatori_ogar if as_of is not None else None
+    return [evalueaza_cursa(cursa, prezice_cursa_istorica(index_istoric, cursa, greutati_timp_final, functie_indicatori))
+            for cursa in curse]
+
+
+def _initializeaza_worker(csv_path, foloseste_as_of):
+    global _INDEX_WORKER, _AS_OF_WORKER
+    _, _INDEX_WORKER = incarca_istoric_indexat(csv_path, [])
+    _AS_OF_WORKER = IndicatoriAsOf(_INDEX_WORKER) if foloseste_as_of else None
+
+
+def _evalueaza_lot(curse, greutati_timp_final):
+    # Contoarele diagnosticelor se întorc procesului principal, care emite un singur rezumat pentru tot backtest-ul
+    with colecteaza('backtest', emite=False) as colector:
+        rezultate = _evalueaza_curse(_INDEX_WORKER, _AS_OF_WORKER, curse, greutati_timp_final)
+    return rezultate, colector.categorii
+
+
+def _imparte_in_loturi(elemente, numar_loturi):
+    return [elemente[i::numar_loturi] for i in range(numar_loturi) if elemente[i::numar_loturi]]
+
+
+def agrega_scoruri(scoruri):
+    """
+    Mediile scorurilor pe toate cursele evaluate.
+    """
+    def medie(valori):
+        valori = [v for v in valori if v is not None]
+        return sum(valori) / len(valori) if valori else None
+
+    return {
+        'curse_evaluate': len(scoruri),
+        'rata_castigator': medie([float(s['castigator_ghicit']) for s in scoruri]),
+        'rata_castigator_aleatoare': medie([s['sansa_aleatoare'] for s in scoruri]),
+        'top3_suprapunere': medie([s['top3_suprapunere'] for s in scoruri]),
+        'spearman_mediu': medie([s['spearman'] for s in scoruri]),
+        'mae_timp': medie([s['mae_timp'] for s in scoruri]),
+    }
+
+
+@cu_diagnostice('backtest')
+def ruleaza_backtest(csv_path, pista=None, data_start=None, data_sfarsit=None, greutati_timp_final=None, max_procese=None,
+                     foloseste_as_of=None):
+    """
+    Rulează backtest-ul pe fișierul dat. Cursele se împart pe procese worker (fiecare încarcă istoricul o
+    singură dată, din cache); cu max_procese=1 sau dacă pool-ul nu poate porni, rulează în procesul curent.
+    Diagnosticele tuturor proceselor se adună într-un singur rezumat la final. Returnează (raport, erori).
+    """
+    start = time.perf_counter()
+    max_procese = BACKTEST_MAX_PROCESE if max_procese is None else max_procese
+    foloseste_as_of = BACKTEST_FOLOSESTE_AS_OF if foloseste_as_of is None else foloseste_as_of
+    erori = []
+    istoric, index = incarca_istoric_indexat(csv_path, erori)
+    if any("FATALA" in eroare for eroare in erori):
+        return None, erori
+
+    curse, numar_ambigue = reconstruieste_curse(istoric, pista=pista, data_start=data_start, data_sfarsit=data_sfarsit)
+    numar_procese = min(max_procese or os.cpu_count() or 1, len(curse))
+
+    rezultate = None
+    if numar_procese > 1:
+        loturi = _imparte_in_loturi(curse, numar_procese)
+        try:
+            with ProcessPoolExecutor(max_workers=numar_procese, initializer=_initializeaza_worker,
+                                     initargs=(csv_path, foloseste_as_of)) as executor:
+                rezultate_loturi = list(executor.map(_evalueaza_lot, loturi, [greutati_timp_final] * len(loturi)))
+            # Refacem ordinea inițială a curselor (loturile sunt intercalate)
+            rezultate = [None] * len(curse)
+            for i, (rezultate_lot, categorii_lot) in enumerate(rezultate_loturi):
+                rezultate[i::len(loturi)] = rezultate_lot
+                colector_curent().adauga_categorii(categorii_lot)
+        except (OSError, RuntimeError):
+            rezultate = None
+    if rezultate is None:
+        as_of = IndicatoriAsOf(index) if foloseste_as_of else None
+        rezultate = _evalueaza_curse(index, as_of, curse, greutati_timp_final)
+
+    scoruri = [s for s in rezultate if s is not None]
+    raport = agrega_scoruri(scoruri)
+    raport.update({
+        'curse_reconstruite': len(curse),
+        'curse_ambigue': numar_ambigue,
+        'curse_fara_istoric': len(curse) - len(scoruri),
+        'durata_s': time.perf_counter() - start,
+        'procese': max(numar_procese, 1),
+    })
+    return raport, erori
+
+
+def formateaza_raport_backtest(raport):
+    def procent(valoare):
+        return f"{100 * valoare:.1f}%" if valoare is not None else "N/A"
+
+    def numar(valoare, format_numar=".3f"):
+        return format(valoare, format_numar) if valoare is not None else "N/A"
+
+    return "\n".join([
+        f"Curse reconstruite: {raport['curse_reconstruite']} (ambigue ignorate: {raport['curse_ambigue']}, "
+        f"fara istoric anterior suficient: {raport['curse_fara_istoric']})",
+        f"Curse evaluate: {raport['curse_evaluate']}",
+        f"Castigator ghicit: {procent(raport['rata_castigator'])} (aleator: {procent(raport['rata_castigator_aleatoare'])})",
+        f"Suprapunere top 3: {procent(raport['top3_suprapunere'])}",
+        f"Spearman mediu: {numar(raport['spearman_mediu'])}",
+        f"Eroare absoluta medie timp: {numar(raport['mae_timp'])}s",
+        f"Durata: {raport['durata_s']:.2f}s pe {raport['procese']} procese",
+    ])
+
+
+if __name__ == '__main__':
+    import sys
+    import logging
+
+    logging.disable(logging.WARNING)
+    raport_backtest, erori_backtest = ruleaza_backtest(sys.argv[1] if len(sys.argv) > 1 else 'Yarmouth.csv')
+    for eroare_backtest in erori_backtest:
+        print(eroare_backtest)
+    if raport_backtest:
+        print(formateaza_raport_backtest(raport_backtest))
@@ -0,0 +1,281 @@
+# --- Benchmark: încărcare, index, predicție, simulare și căutarea ponderilor pe istoric sintetic ---
+# Pentru fiecare dimensiune (număr de rânduri) se generează o dată un CSV sintetic (generator_istoric_sintetic.py),
+# apoi se măsoară etapele fluxului de predicție. Rezultatele se scriu în JSON împreună cu versiunea (commit git),
+# Python și platforma, ca să poată fi comparate între versiuni:
+#
+#   python benchmarks/bench_flux.py --randuri 10000 100000 1000000 --iesire rezultate.json
+#   python benchmarks/bench_flux.py --randuri 10000 --compara rezultate_vechi.json
+#
+# Fișierele mari (10M rânduri) necesită memorie pentru istoricul complet (rânduri-dict); etapele se rulează
+# pe rând, iar istoricul unei dimensiuni este eliberat înainte de următoarea.
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+DIRECTOR_PROIECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTOR_PROIECT)
+
+from config import (  # noqa: E402
+    BENCHMARK_DIRECTOR,
+    BENCHMARK_SEED,
+    BENCHMARK_DIMENSIUNI,
+    BENCHMARK_REPETARI,
+    BENCHMARK_CURSE_LOT,
+    BENCHMARK_PRAG_REGRESIE,
+    TIMP_MAX_NECUNOSCUT,
+)
+from predictor_logic import parseaza_fisier_csv, prezice_cursa_combinata, simuleaza_cursa, _simuleaza_cursa_memo  # noqa: E402
+from cache_istoric import incarca_din_cache, salveaza_in_cache  # noqa: E402
+from index_istoric import HistoryIndex  # noqa: E402
+from agregate_ogari import AgregateOgari  # noqa: E402
+from generator_istoric_sintetic import genereaza_istoric_sintetic  # noqa: E402
+from snapshot_istoric import SnapshotIstoric, scrie_snapshot  # noqa: E402
+from istoric_sqlite import IstoricSqlite  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:  # dependință opțională: simularea Monte Carlo și căutarea ponderilor sunt sărite
+    np = None
+
+
+def masoara_functie(functie, repetari):
+    """
+    Rulează functie() de `repetari` ori; returnează {'min_s', 'median_s', 'repetari'}.
+    """
+    durate = []
+    for _ in range(repetari):
+        start = time.perf_counter()
+        functie()
+        durate.append(time.perf_counter() - start)
+    return {'min_s': min(durate), 'median_s': statistics.median(durate), 'repetari': repetari}
+
+
+def asigura_fisier_sintetic(director, numar_randuri, seed):
+    os.makedirs(director, exist_ok=True)
+    cale = os.path.join(director, f"sintetic_{numar_randuri}_{seed}.csv")
+    if not os.path.exists(cale):
+        genereaza_istoric_sintetic(cale, numar_randuri, seed=seed)
+    return cale
+
+
+def curse_sintetice(index, numar_curse, seed, marime_camp=6):
+    """
+    Curse de test: pentru o pistă+distanță aleasă aleator, până la 6 ogari care au alergat acolo.
+    """
+    rng = random.Random(seed)
+    ogari_pe_traseu = {}
+    for nume, pista, distanta in index.per_ogar_pista_distanta:
+        ogari_pe_traseu.setdefault((pista, distanta), []).append(nume)
+    trasee = sorted(traseu for traseu, ogari in ogari_pe_traseu.items() if len(ogari) >= 2)
+
+    curse = []
+    for i in range(numar_curse):
+        pista, distanta = rng.choice(trasee)
+        ogari = rng.sample(ogari_pe_traseu[(pista, distanta)], min(marime_camp, len(ogari_pe_traseu[(pista, distanta)])))
+        curse.append({
+            'id': str(i + 1),
+            'pista': pista,
+            'distanta_m': distanta,
+            'grad': rng.choice(['A3', 'A5', 'A7']),
+            'data_cursa': '16/06/2025',
+            'ogari_participanti': [(nume, box) for box, nume in enumerate(ogari, start=1)],
+        })
+    return curse
+
+
+def ruleaza_dimensiune(cale, repetari, seed, numar_curse_lot, cu_cautare_ponderi=True, director_cache=None):
+    """
+    Măsoară toate etapele pentru un fișier; returnează {etapa: masuratoare}.
+    """
+    masuratori = {}
+
+    masuratori['incarcare_csv'] = masoara_functie(lambda: parseaza_fisier_csv(cale, []), repetari)
+    istoric = parseaza_fisier_csv(cale, [])
+
+    director_cache = director_cache or os.path.join(os.path.dirname(cale), 'cache')
+    salveaza_in_cache(cale, istoric, director=director_cache, max_mb=1 << 20)
+    masuratori['incarcare_cache_disc'] = masoara_functie(lambda: incarca_din_cache(cale, director=director_cache), repetari)
+
+    cale_snapshot = os.path.join(director_cache, os.path.splitext(os.path.basename(cale))[0] + '.gpsnap')
+    scrie_snapshot(cale_snapshot, istoric)
+
+    def incarcare_snapshot():
+        with SnapshotIstoric(cale_snapshot) as snapshot:
+            return len(snapshot)
+    masuratori['incarcare_snapshot'] = masoara_functie(incarcare_snapshot, repetari)
+
+    masuratori['sqlite_inserare'] = masoara_functie(lambda: IstoricSqlite.din_randuri(istoric).inchide(), repetari)
+    istoric_sqlite = IstoricSqlite.din_randuri(istoric)
+
+    masuratori['index'] = masoara_functie(lambda: HistoryIndex(istoric), repetari)
+    index = HistoryIndex(istoric)
+    masuratori['agregate'] = masoara_functie(lambda: AgregateOgari.din_index(index), repetari)
+    agregate = AgregateOgari.din_index(index)
+
+    curse = curse_sintetice(index, numar_curse_lot, seed)
+    cursa = curse[0]
+    masuratori['predictie_cursa'] = masoara_functie(
+        lambda: prezice_cursa_combinata(cale, cursa, index_istoric=index), repetari * 10)
+    masuratori['predictie_cursa_agregate'] = masoara_functie(
+        lambda: prezice_cursa_combinata(cale, cursa, index_istoric=agregate), repetari * 10)
+
+    def predictie_cursa_snapshot():
+        # Snapshot deschis din nou: prima predicție fără istoric încărcat în memorie
+        with SnapshotIstoric(cale_snapshot) as snapshot:
+            return prezice_cursa_combinata(cale_snapshot, cursa, index_istoric=snapshot)
+    masuratori['predictie_cursa_snapshot'] = masoara_functie(predictie_cursa_snapshot, repetari * 10)
+    masuratori['predictie_cursa_sqlite'] = masoara_functie(
+        lambda: prezice_cursa_combinata(cale, cursa, index_istoric=istoric_sqlite), repetari * 10)
+    masuratori['predictie_lot'] = masoara_functie(
+        lambda: [prezice_cursa_combinata(cale, c, index_istoric=index) for c in curse], repetari)
+    masuratori['predictie_lot_agregate'] = masoara_functie(
+        lambda: [prezice_cursa_combinata(cale, c, index_istoric=agregate) for c in curse], repetari)
+
+    predictii = [prezice_cursa_combinata(cale, c, index_istoric=index)[0] for c in curse]
+
+    def simulare_lot():
+        _simuleaza_cursa_memo.cache_clear()  # fără memoizare: se măsoară calculul, nu căutarea în cache
+        for c, predictie in zip(curse, predictii):
+            simuleaza_cursa(predictie, c, istoric)
+    masuratori['simulare_lot'] = masoara_functie(simulare_lot, repetari)
+
+    if np is not None:
+        from simulare_monte_carlo import simuleaza_monte_carlo
+        predictie_mc = next((p for p in predictii if any(r['Timp_Prezis_Combinat'] < TIMP_MAX_NECUNOSCUT for r in p)), None)
+        if predictie_mc is not None:
+            cursa_mc = curse[predictii.index(predictie_mc)]
+            masuratori['simulare_monte_carlo'] = masoara_functie(
+                lambda: simuleaza_monte_carlo(predictie_mc, cursa_mc, istoric, index_istoric=index), repetari)
+
+        if cu_cautare_ponderi:
+            from cautare_ponderi import pregateste_componente, genereaza_grila_ponderi, analizeaza_stabilitate
+            grila = genereaza_grila_ponderi(0.01)
+            masuratori['cautare_ponderi'] = masoara_functie(
+                lambda: analizeaza_stabilitate(pregateste_componente(cursa, index), grila), repetari)
+
+    return masuratori
+
+
+def informatii_versiune():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=DIRECTOR_PROIECT, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'commit': commit,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platforma': platform.platform(),
+        'procesoare': os.cpu_count(),
+        'numpy': getattr(np, '__version__', None),
+    }
+
+
+def ruleaza_benchmark(dimensiuni=None, director=None, repetari=None, seed=None, numar_curse_lot=None,
+                      cu_cautare_ponderi=True):
+    """
+    Rulează benchmark-ul pentru fiecare dimensiune și întoarce rezultatul serializabil JSON.
+    """
+    dimensiuni = BENCHMARK_DIMENSIUNI if dimensiuni is None else dimensiuni
+    director = BENCHMARK_DIRECTOR if director is None else director
+    repetari = BENCHMARK_REPETARI if repetari is None else repetari
+    seed = BENCHMARK_SEED if seed is None else seed
+    numar_curse_lot = BENCHMARK_CURSE_LOT if numar_curse_lot is None else numar_curse_lot
+
+    rezultate = []
+    for numar_randuri in dimensiuni:
+        start = time.perf_counter()
+        cale = asigura_fisier_sintetic(director, numar_randuri, seed)
+        durata_generare = time.perf_counter() - start
+        masuratori = ruleaza_dimensiune(cale, repetari, seed, numar_curse_lot, cu_cautare_ponderi)
+        rezultate.append({
+            'randuri': numar_randuri,
+            'fisier_octeti': os.path.getsize(cale),
+            'generare_s': durata_generare,
+            'masuratori': masuratori,
+        })
+    return {
+        'versiune': informatii_versiune(),
+        'parametri': {'seed': seed, 'repetari': repetari, 'curse_lot': numar_curse_lot},
+        'rezultate': rezultate,
+    }
+
+
+def compara_rezultate(referinta, curent, prag=None):
+    """
+    Compară mediana fiecărei etape cu rularea de referință (aceeași dimensiune).
+    Returnează lista (randuri, etapa, median_referinta_s, median_curent_s, raport, este_regresie).
+    """
+    prag = BENCHMARK_PRAG_REGRESIE if prag is None else prag
+    referinta_pe_dimensiune = {r['randuri']: r['masuratori'] for r in referinta.get('rezultate', [])}
+    comparatii = []
+    for rezultat in curent['rezultate']:
+        masuratori_referinta = referinta_pe_dimensiune.get(rezultat['randuri'])
+        if not masuratori_referinta:
+            continue
+        for etapa, masuratoare in rezultat['masuratori'].items():
+            if etapa not in masuratori_referinta:
+                continue
+            vechi = masuratori_referinta[etapa]['median_s']
+            nou = masuratoare['median_s']
+            raport = nou / vechi if vechi > 0 else float('inf')
+            comparatii.append((rezultat['randuri'], etapa, vechi, nou, raport, raport > 1.0 + prag))
+    return comparatii
+
+
+def formateaza_rezultate(rezultat):
+    linii = [f"Benchmark (commit {rezultat['versiune']['commit'] or '?'}, Python {rezultat['versiune']['python']})"]
+    for r in rezultat['rezultate']:
+        linii.append(f"\n{r['randuri']} rânduri ({r['fisier_octeti'] / 1e6:.1f} MB):")
+        for etapa, m in r['masuratori'].items():
+            linii.append(f"  {etapa:<28}{1000 * m['median_s']:>12.2f} ms (min {1000 * m['min_s']:.2f} ms, n={m['repetari']})")
+    return "\n".join(linii)
+
+
+def formateaza_comparatie(comparatii):
+    linii = [f"{'Rânduri':>10}  {'Etapa':<28}{'Referință ms':>14}{'Curent ms':>12}{'Raport':>8}"]
+    for randuri, etapa, vechi, nou, raport, regresie in comparatii:
+        linii.append(f"{randuri:>10}  {etapa:<28}{1000 * vechi:>14.2f}{1000 * nou:>12.2f}{raport:>8.2f}"
+                     f"{'  REGRESIE' if regresie else ''}")
+    return "\n".join(linii)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark al fluxului de predicție pe istoric sintetic.")
+    parser.add_argument('--randuri', type=int, nargs='+', default=None,
+                        help=f"Dimensiunile fișierelor sintetice (implicit {BENCHMARK_DIMENSIUNI})")
+    parser.add_argument('--repetari', type=int, default=None, help=f"Repetări per etapă (implicit {BENCHMARK_REPETARI})")
+    parser.add_argument('--director', default=None, help=f"Directorul fișierelor sintetice (implicit {BENCHMARK_DIRECTOR})")
+    parser.add_argument('--seed', type=int, default=None, help=f"Seed pentru generator și curse (implicit {BENCHMARK_SEED})")
+    parser.add_argument('--iesire', default=None, help="Fișierul JSON pentru rezultate (implicit benchmark_<data>.json)")
+    parser.add_argument('--compara', metavar='REFERINTA_JSON', help="Compară cu o rulare anterioară; cod de ieșire 1 la regresie")
+    parser.add_argument('--fara-cautare-ponderi', action='store_true', help="Sare peste căutarea ponderilor (NumPy)")
+    argumente = parser.parse_args()
+
+    # Log-ul per ogar din predicție ar domina timpii măsurați
+    logging.disable(logging.WARNING)
+
+    rezultat_benchmark = ruleaza_benchmark(argumente.randuri, argumente.director, argumente.repetari, argumente.seed,
+                                           cu_cautare_ponderi=not argumente.fara_cautare_ponderi)
+    cale_iesire = argumente.iesire or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(cale_iesire, 'w', encoding='utf-8') as f:
+        json.dump(rezultat_benchmark, f, indent=2)
+    print(formateaza_rezultate(rezultat_benchmark))
+    print(f"\nRezultate salvate în {cale_iesire}")
+
+    if argumente.compara:
+        with open(argumente.compara, 'r', encoding='utf-8') as f:
+            comparatii_benchmark = compara_rezultate(json.load(f), rezultat_benchmark)
+        print("\n" + formateaza_comparatie(comparatii_benchmark))
+        if any(comparatie[-1] for comparatie in comparatii_benchmark):
+            sys.exit(1)
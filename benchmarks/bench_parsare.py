@@ -0,0 +1,62 @@
+# --- Benchmark parsare istoric: DictReader (referință) vs. convertor rapid compilat pe antet ---
+# Utilizare: python benchmarks/bench_parsare.py [--sursa Yarmouth.csv] [--scala 1000]
+# Fișierul sursă este multiplicat de --scala ori (doar rândurile de date) într-un fișier temporar.
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+DIRECTOR_PROIECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTOR_PROIECT)
+
+from predictor_logic import parseaza_fisier_csv  # noqa: E402
+
+
+def genereaza_fisier_scalat(cale_sursa, scala, cale_destinatie):
+    with open(cale_sursa, 'r', encoding='utf-8', newline='') as f:
+        antet = f.readline()
+        date = f.read()
+    if date and not date.endswith('\n'):
+        date += '\r\n'
+    with open(cale_destinatie, 'w', encoding='utf-8', newline='') as f:
+        f.write(antet)
+        for _ in range(scala):
+            f.write(date)
+
+
+def masoara(cale_fisier, mod_rapid):
+    erori = []
+    start = time.perf_counter()
+    istoric = parseaza_fisier_csv(cale_fisier, erori, mod_rapid=mod_rapid)
+    durata = time.perf_counter() - start
+    return len(istoric), durata, erori
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsare istoric CSV (rânduri/secundă).")
+    parser.add_argument('--sursa', default=os.path.join(DIRECTOR_PROIECT, 'Yarmouth.csv'))
+    parser.add_argument('--scala', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as director_tmp:
+        cale_scalata = os.path.join(director_tmp, 'istoric_scalat.csv')
+        genereaza_fisier_scalat(args.sursa, args.scala, cale_scalata)
+        dimensiune_mb = os.path.getsize(cale_scalata) / (1024 * 1024)
+        print(f"Fișier: {os.path.basename(args.sursa)} x{args.scala} ({dimensiune_mb:.1f} MB)")
+
+        rezultate = {}
+        for eticheta, mod_rapid in (('referinta (DictReader)', False), ('rapid (convertor compilat)', True)):
+            randuri, durata, erori = masoara(cale_scalata, mod_rapid)
+            if erori:
+                print(f"  Erori {eticheta}: {erori}")
+            rezultate[eticheta] = durata
+            print(f"  {eticheta:<28} {randuri:>10} rânduri  {durata:8.2f}s  {randuri / durata:>12,.0f} rânduri/s")
+
+        durata_ref, durata_rapid = rezultate.values()
+        print(f"  Accelerare: {durata_ref / durata_rapid:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# --- Timpul de pornire: importuri (python -X importtime, rezumat) și timpul până la prima predicție ---
+# Utilizare: python benchmarks/bench_pornire.py [--module predictor_logic predictor_cli] [--repetari 5] [--top 15]
+# Fiecare măsurătoare rulează într-un proces nou (importurile nu sunt în cache); se raportează cea mai rapidă rulare.
+# "Prima predicție" = procesul complet predictor_cli.py (fără simulare) pe o cursă cu ogari din DEFAULT_CSV_FILE,
+# comparat cu un interpretor gol (`python -c pass`).
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+DIRECTOR_PROIECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRECTOR_PROIECT)
+
+MODULE_IMPLICITE = ('predictor_logic', 'predictor_cli', 'server_predictii', 'predictor_simplu')
+
+
+def citeste_importtime(text):
+    """
+    Liniile 'import time: propriu | cumulat | nume' -> [(nume, propriu_us, cumulat_us, adancime)], în ordinea din ieșire.
+    """
+    intrari = []
+    for linie in text.splitlines():
+        if not linie.startswith('import time:') or 'self [us]' in linie:
+            continue
+        propriu, cumulat, nume = linie[len('import time:'):].split('|')
+        adancime = (len(nume) - len(nume.lstrip())) // 2
+        intrari.append((nume.strip(), int(propriu), int(cumulat), adancime))
+    return intrari
+
+
+def masoara_importuri(modul, repetari):
+    """
+    Importul modulului într-un proces nou, de `repetari` ori; întoarce intrările rulării celei mai rapide.
+    """
+    cea_mai_buna = None
+    for _ in range(repetari):
+        proces = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modul}'],
+                                cwd=DIRECTOR_PROIECT, capture_output=True, text=True)
+        if proces.returncode != 0:
+            raise RuntimeError(f"Importul '{modul}' a eșuat:\n{proces.stderr.strip().splitlines()[-1]}")
+        intrari = citeste_importtime(proces.stderr)
+        total = next((cumulat for nume, _, cumulat, _ in intrari if nume == modul), 0)
+        if cea_mai_buna is None or total < cea_mai_buna[0]:
+            cea_mai_buna = (total, intrari)
+    return cea_mai_buna
+
+
+def rezuma_importuri(intrari, top):
+    """
+    Modulele cu cel mai mare timp propriu și timpul propriu însumat pe pachetul de nivel superior.
+    """
+    pe_pachet = {}
+    for nume, propriu, _, _ in intrari:
+        pachet = nume.split('.')[0]
+        pe_pachet[pachet] = pe_pachet.get(pachet, 0) + propriu
+    module_lente = sorted(intrari, key=lambda intrare: -intrare[1])[:top]
+    pachete_lente = sorted(pe_pachet.items(), key=lambda element: -element[1])[:top]
+    return module_lente, pachete_lente
+
+
+def cursa_de_test(csv_path, numar_ogari=6):
+    # Ogarii cu cele mai multe curse pe pista+distanța implicită din GUI
+    from config import DEFAULT_CURSA_NOUA_GUI, TRACK_NAME_MAP_GUI_TO_CSV
+    from predictor_logic import parseaza_fisier_csv
+
+    pista = TRACK_NAME_MAP_GUI_TO_CSV.get(DEFAULT_CURSA_NOUA_GUI['pista'], DEFAULT_CURSA_NOUA_GUI['pista'])
+    distanta = DEFAULT_CURSA_NOUA_GUI['distanta_m']
+    curse_per_ogar = {}
+    for rand in parseaza_fisier_csv(csv_path, []):
+        if rand.get('Pista') == pista and rand.get('Distanta Cursei (m)') == distanta:
+            curse_per_ogar[rand['Nume Ogar']] = curse_per_ogar.get(rand['Nume Ogar'], 0) + 1
+    ogari = sorted(curse_per_ogar, key=lambda nume: -curse_per_ogar[nume])[:numar_ogari]
+    return DEFAULT_CURSA_NOUA_GUI['pista'], distanta, DEFAULT_CURSA_NOUA_GUI.get('grad', ''), ogari
+
+
+def masoara_proces(comanda, repetari):
+    durate = []
+    for _ in range(repetari):
+        start = time.perf_counter()
+        subprocess.run(comanda, cwd=DIRECTOR_PROIECT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        durate.append(time.perf_counter() - start)
+    return min(durate)
+
+
+def masoara_prima_predictie(csv_path, repetari):
+    """
+    (secunde interpretor gol, secunde predictor_cli până la rezultat), cel mai bun timp din `repetari`.
+    """
+    pista, distanta, grad, ogari = cursa_de_test(csv_path)
+    comanda = [sys.executable, os.path.join(DIRECTOR_PROIECT, 'predictor_cli.py'), '--pista', pista,
+               '--distanta', str(distanta), '--grad', grad, '--istoric', csv_path, '--fara-simulare']
+    for box, nume in enumerate(ogari, start=1):
+        comanda += ['--box', str(box), nume]
+    masoara_proces(comanda, 1)  # încălzire: cache-ul pe disc al istoricului
+    return masoara_proces([sys.executable, '-c', 'pass'], repetari), masoara_proces(comanda, repetari)
+
+
+def main():
+    from config import DEFAULT_CSV_FILE
+
+    parser = argparse.ArgumentParser(description="Raport al timpului de pornire (importuri și prima predicție).")
+    parser.add_argument('--module', nargs='+', default=list(MODULE_IMPLICITE), help="Modulele măsurate")
+    parser.add_argument('--repetari', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12, help="Câte module/pachete se afișează")
+    parser.add_argument('--istoric', default=os.path.join(DIRECTOR_PROIECT, DEFAULT_CSV_FILE))
+    parser.add_argument('--fara-predictie', action='store_true', help="Doar importurile")
+    args = parser.parse_args()
+
+    for modul in args.module:
+        try:
+            total, intrari = masoara_importuri(modul, args.repetari)
+        except RuntimeError as eroare:
+            print(eroare)
+            continue
+        module_lente, pachete_lente = rezuma_importuri(intrari, args.top)
+        print(f"\nimport {modul}: {total / 1000:.1f} ms ({len(intrari)} module)")
+        print(f"  {'Modul (timp propriu)':<44}{'ms':>8}    {'Pachet (însumat)':<24}{'ms':>8}")
+        for i in range(max(len(module_lente), len(pachete_lente))):
+            stanga = f"{module_lente[i][0]:<44}{module_lente[i][1] / 1000:>8.2f}" if i < len(module_lente) else ' ' * 52
+            dreapta = f"{pachete_lente[i][0]:<24}{pachete_lente[i][1] / 1000:>8.2f}" if i < len(pachete_lente) else ''
+            print(f"  {stanga}    {dreapta}")
+
+    if not args.fara_predictie:
+        gol, predictie = masoara_prima_predictie(args.istoric, args.repetari)
+        print(f"\nPrima predicție (predictor_cli, {os.path.basename(args.istoric)}): {1000 * predictie:.0f} ms proces complet, "
+              f"{1000 * (predictie - gol):.0f} ms peste interpretorul gol ({1000 * gol:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+# --- Cache pe disc pentru istoricul parsat din fișierele CSV ---
+# Evită re-parsarea completă a fișierului la fiecare predicție când fișierul nu s-a modificat.
+# Cheia unei intrări: cale absolută + dimensiune + mtime + hash al conținutului (+ versiunea formatului).
+# Fiecare intrare păstrează și starea parsării (offset, hash prefix, antet), astfel încât un fișier
+# la care s-au adăugat doar rânduri noi la final să poată fi actualizat fără re-parsare completă.
+
+import os
+import json
+import time
+import pickle
+import hashlib
+
+from config import (
+    CACHE_ISTORIC_DIR,
+    CACHE_ISTORIC_MAX_MB,
+)
+
+# Se incrementează la orice modificare a formatului rândurilor parsate,
+# astfel încât intrările vechi să fie ignorate automat.
+VERSIUNE_CACHE = 4
+
+NUME_INDEX_CACHE = 'index.json'
+
+
+def calculeaza_hash_continut(cale_fisier, dimensiune_bloc=1 << 20):
+    """
+    Returnează hash-ul SHA-1 (hex) al conținutului fișierului, citit pe blocuri.
+    """
+    h = hashlib.sha1()
+    with open(cale_fisier, 'rb') as f:
+        while True:
+            bloc = f.read(dimensiune_bloc)
+            if not bloc:
+                break
+            h.update(bloc)
+    return h.hexdigest()
+
+
+def semnatura_fisier(cale_fisier):
+    """
+    Returnează semnătura fișierului folosită drept cheie de cache:
+    dict cu cale absolută, dimensiune, mtime (ns) și hash-ul conținutului.
+    """
+    cale_absoluta = os.path.abspath(cale_fisier)
+    info = os.stat(cale_absoluta)
+    return {
+        'cale': cale_absoluta,
+        'dimensiune': info.st_size,
+        'mtime_ns': info.st_mtime_ns,
+        'hash': calculeaza_hash_continut(cale_absoluta),
+        'versiune': VERSIUNE_CACHE,
+    }
+
+
+def semnatura_din_stare(cale_fisier, stare_parsare):
+    """
+    Semnătura conținutului efectiv parsat, din starea întoarsă de parser (fără re-citirea fișierului).
+    """
+    return {
+        'cale': os.path.abspath(cale_fisier),
+        'dimensiune': stare_parsare['offset'],
+        'mtime_ns': stare_parsare['mtime_ns'],
+        'hash': stare_parsare['hash_prefix'],
+        'versiune': VERSIUNE_CACHE,
+    }
+
+
+def _cheie_cache(semnatura):
+    text = json.dumps(semnatura, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _cale_index(director):
+    return os.path.join(director, NUME_INDEX_CACHE)
+
+
+def _citeste_index(director):
+    try:
+        with open(_cale_index(director), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if isinstance(index, dict):
+            return index
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        pass
+    return {}
+
+
+def _scrie_index(director, index):
+    # Scriere atomică: fișier temporar + os.replace
+    cale_tmp = _cale_index(director) + f'.{os.getpid()}.tmp'
+    with open(cale_tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    os.replace(cale_tmp, _cale_index(director))
+
+
+def _sterge_fisier(cale):
+    try:
+        os.remove(cale)
+    except OSError:
+        pass
+
+
+def incarca_din_cache(cale_fisier, director=None):
+    """
+    Caută istoricul parsat pentru fișierul dat.
+    Returnează (istoric, avertismente, stare_parsare) dacă există o intrare validă pentru conținutul curent,
+    altfel None.
+    """
+    director = director or CACHE_ISTORIC_DIR
+    try:
+        semnatura = semnatura_fisier(cale_fisier)
+    except OSError:
+        return None
+
+    index = _citeste_index(director)
+    intrare = index.get(semnatura['cale'])
+    cheie = _cheie_cache(semnatura)
+    if not intrare or intrare.get('cheie') != cheie:
+        return None
+
+    continut = _citeste_intrare(director, index, semnatura['cale'])
+    if continut is None or continut.get('cheie') != cheie:
+        return None
+
+    intrare['ultima_accesare'] = time.time()
+    try:
+        _scrie_index(director, index)
+    except OSError:
+        pass
+    return continut['istoric'], continut.get('avertismente', []), continut.get('stare_parsare')
+
+
+def incarca_intrare_anterioara(cale_fisier, director=None):
+    """
+    Returnează ultima intrare salvată pentru fișierul dat, chiar dacă acesta s-a modificat între timp:
+    (istoric, avertismente, stare_parsare) sau None. Folosită pentru ingestia incrementală,
+    care verifică ea însăși (prin hash-ul prefixului) că vechiul conținut nu s-a schimbat.
+    """
+    director = director or CACHE_ISTORIC_DIR
+    cale_absoluta = os.path.abspath(cale_fisier)
+    index = _citeste_index(director)
+    intrare = index.get(cale_absoluta)
+    if not intrare:
+        return None
+
+    continut = _citeste_intrare(director, index, cale_absoluta)
+    if continut is None or continut.get('cheie') != intrare.get('cheie') or not continut.get('stare_parsare'):
+        return None
+    return continut['istoric'], continut.get('avertismente', []), continut['stare_parsare']
+
+
+def _citeste_intrare(director, index, cale_absoluta):
+    try:
+        with open(os.path.join(director, index[cale_absoluta]['fisier']), 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Intrare coruptă sau ștearsă de alt proces: o eliminăm din index
+        index.pop(cale_absoluta, None)
+        try:
+            _scrie_index(director, index)
+        except OSError:
+            pass
+        return None
+
+
+def salveaza_in_cache(cale_fisier, istoric, avertismente=None, stare_parsare=None, director=None, max_mb=None):
+    """
+    Salvează istoricul parsat pentru fișierul dat și aplică limita de dimensiune (LRU între piste).
+    Cu stare_parsare, cheia descrie exact conținutul parsat (nu se mai re-citește fișierul).
+    Erorile la scriere sunt ignorate: cache-ul este doar o optimizare.
+    """
+    director = director or CACHE_ISTORIC_DIR
+    max_mb = CACHE_ISTORIC_MAX_MB if max_mb is None else max_mb
+    try:
+        if stare_parsare:
+            semnatura = semnatura_din_stare(cale_fisier, stare_parsare)
+        else:
+            semnatura = semnatura_fisier(cale_fisier)
+        os.makedirs(director, exist_ok=True)
+        cheie = _cheie_cache(semnatura)
+        nume_intrare = cheie + '.pickle'
+        cale_intrare = os.path.join(director, nume_intrare)
+        cale_tmp = cale_intrare + f'.{os.getpid()}.tmp'
+        with open(cale_tmp, 'wb') as f:
+            pickle.dump({'cheie': cheie, 'istoric': istoric, 'avertismente': list(avertismente or []),
+                         'stare_parsare': stare_parsare},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(cale_tmp, cale_intrare)
+
+        index = _citeste_index(director)
+        intrare_veche = index.get(semnatura['cale'])
+        if intrare_veche and intrare_veche.get('fisier') != nume_intrare:
+            _sterge_fisier(os.path.join(director, intrare_veche['fisier']))
+        index[semnatura['cale']] = {
+            'cheie': cheie,
+            'fisier': nume_intrare,
+            'dimensiune': os.path.getsize(cale_intrare),
+            'ultima_accesare': time.time(),
+        }
+        _aplica_limita_lru(director, index, max_mb * 1024 * 1024)
+        _scrie_index(director, index)
+    except OSError:
+        pass
+
+
+def _aplica_limita_lru(director, index, max_octeti):
+    """
+    Elimină intrările accesate cel mai demult până când dimensiunea totală intră sub limită.
+    Intrarea cea mai recentă este păstrată chiar dacă singură depășește limita.
+    """
+    total = sum(intrare.get('dimensiune', 0) for intrare in index.values())
+    ordine_lru = sorted(index.items(), key=lambda kv: kv[1].get('ultima_accesare', 0))
+    for cale_sursa, intrare in ordine_lru[:-1]:
+        if total <= max_octeti:
+            break
+        _sterge_fisier(os.path.join(director, intrare['fisier']))
+        total -= intrare.get('dimensiune', 0)
+        del index[cale_sursa]
+
+
+def invalideaza_cache_istoric(cale_fisier=None, director=None):
+    """
+    Invalidează explicit cache-ul: doar intrarea fișierului dat sau, fără argument, tot cache-ul.
+    Returnează numărul de intrări eliminate.
+    """
+    director = director or CACHE_ISTORIC_DIR
+    index = _citeste_index(director)
+    if cale_fisier is None:
+        de_eliminat = list(index.keys())
+    else:
+        cale_absoluta = os.path.abspath(cale_fisier)
+        de_eliminat = [cale_absoluta] if cale_absoluta in index else []
+
+    for cale_sursa in de_eliminat:
+        _sterge_fisier(os.path.join(director, index[cale_sursa]['fisier']))
+        del index[cale_sursa]
+
+    if de_eliminat:
+        try:
+            _scrie_index(director, index)
+        except OSError:
+            pass
+    return len(de_eliminat)
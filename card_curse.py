@@ -0,0 +1,201 @@
+# --- Predicție pe un card întreg de curse ---
+# Un card (ex. o seară cu 14 curse pe mai multe piste) se citește dintr-un fișier JSON sau CSV.
+# Istoricul se încarcă o singură dată (un fișier dat explicit sau toate pistele din card, în paralel),
+# iar indexul rezultat este folosit de toate cursele; nu se mai re-citește fișierul la fiecare cursă.
+
+import csv
+import os
+import json
+import time
+
+from config import CSV_PER_ARENA, TRACK_NAME_MAP_GUI_TO_CSV
+from predictor_logic import incarca_istoric_indexat, prezice_cursa_combinata, simuleaza_cursa
+from diagnostice import cu_diagnostice
+
+# Pistă din CSV (abreviere) -> pistă din GUI
+TRACK_NAME_MAP_CSV_TO_GUI = {csv_nume: gui_nume for gui_nume, csv_nume in TRACK_NAME_MAP_GUI_TO_CSV.items()}
+
+# Coloanele acceptate într-un card CSV (un rând per ogar); CURSA grupează rândurile pe curse
+COLOANE_CARD_CSV = ('CURSA', 'PISTA', 'DISTANTA', 'GRAD', 'DATA', 'BOXA', 'NUME')
+
+
+def normalizeaza_pista(pista):
+    """
+    Returnează (nume_pista_csv, nume_pista_gui); se acceptă atât numele din GUI ('Yarmouth'),
+    cât și abrevierea din CSV ('Yrmth').
+    """
+    pista = (pista or '').strip()
+    if pista in TRACK_NAME_MAP_GUI_TO_CSV:
+        return TRACK_NAME_MAP_GUI_TO_CSV[pista], pista
+    return pista, TRACK_NAME_MAP_CSV_TO_GUI.get(pista)
+
+
+def _normalizeaza_cursa(cursa, pozitie, lista_erori):
+    """
+    Transformă o cursă din card în dicționarul detalii_cursa folosit de prezice_cursa_combinata.
+    Participanții pot fi dați ca listă [[nume, box], ...] ('ogari_participanti') sau dicționar {box: nume} ('ogari').
+    """
+    id_cursa = str(cursa.get('id') or cursa.get('cursa') or pozitie)
+    pista_csv, pista_gui = normalizeaza_pista(cursa.get('pista'))
+
+    try:
+        distanta = int(str(cursa.get('distanta_m', cursa.get('distanta', ''))).strip())
+    except ValueError:
+        lista_erori.append(f"Avertisment: Cursa '{id_cursa}' din card nu are o distanta valida; cursa este ignorata.")
+        return None
+
+    participanti = []
+    if 'ogari_participanti' in cursa:
+        for nume, box in cursa['ogari_participanti']:
+            participanti.append((str(nume).strip(), int(box)))
+    else:
+        for box, nume in (cursa.get('ogari') or {}).items():
+            participanti.append((str(nume).strip(), int(box)))
+    participanti = sorted((p for p in participanti if p[0]), key=lambda p: p[1])
+
+    return {
+        'id': id_cursa,
+        'pista': pista_csv,
+        'pista_gui': pista_gui,
+        'distanta_m': distanta,
+        'grad': str(cursa.get('grad') or '').strip(),
+        'data_cursa': str(cursa.get('data_cursa') or cursa.get('data') or '').strip(),
+        'ogari_participanti': participanti,
+    }
+
+
+def citeste_card_curse(cale_card, lista_erori):
+    """
+    Citește un card de curse din JSON (listă de curse sau {'curse': [...]}) sau din CSV
+    (un rând per ogar, coloanele din COLOANE_CARD_CSV). Returnează lista detaliilor curselor.
+    """
+    try:
+        if cale_card.lower().endswith('.json'):
+            with open(cale_card, 'r', encoding='utf-8') as f:
+                continut = json.load(f)
+            curse_brute = continut.get('curse', []) if isinstance(continut, dict) else continut
+        else:
+            curse_brute = _citeste_card_csv(cale_card)
+    except FileNotFoundError:
+        lista_erori.append(f"Eroare FATALA: Cardul de curse '{os.path.basename(cale_card)}' nu a fost gasit.")
+        return []
+    except (json.JSONDecodeError, csv.Error, UnicodeDecodeError) as eroare:
+        lista_erori.append(f"Eroare FATALA: Cardul de curse '{os.path.basename(cale_card)}' nu poate fi citit: {eroare}")
+        return []
+
+    return normalizeaza_curse(curse_brute, lista_erori)
+
+
+def normalizeaza_curse(curse_brute, lista_erori):
+    """
+    Normalizează o listă de curse (dicționare ca în cardul JSON); cursele invalide sunt ignorate cu avertisment.
+    """
+    curse = []
+    for pozitie, cursa in enumerate(curse_brute, start=1):
+        try:
+            detalii = _normalizeaza_cursa(cursa, pozitie, lista_erori)
+        except (TypeError, ValueError, AttributeError) as eroare:
+            lista_erori.append(f"Avertisment: Cursa {pozitie} din card are un format invalid ({eroare}); cursa este ignorata.")
+            continue
+        if detalii is not None:
+            curse.append(detalii)
+    return curse
+
+
+def _citeste_card_csv(cale_card):
+    with open(cale_card, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        reader.fieldnames = [(nume or '').strip().upper() for nume in (reader.fieldnames or [])]
+        curse = {}
+        for rand in reader:
+            nume = (rand.get('NUME') or '').strip()
+            if not nume:
+                continue
+            cheie = rand.get('CURSA') or (rand.get('PISTA'), rand.get('DISTANTA'), rand.get('GRAD'), rand.get('DATA'))
+            cursa = curse.setdefault(cheie, {
+                'id': rand.get('CURSA'),
+                'pista': rand.get('PISTA'),
+                'distanta_m': rand.get('DISTANTA'),
+                'grad': rand.get('GRAD'),
+                'data_cursa': rand.get('DATA'),
+                'ogari_participanti': [],
+            })
+            cursa['ogari_participanti'].append((nume, rand.get('BOXA')))
+    return list(curse.values())
+
+
+def _incarca_istoric_card(curse, fisier_istoric, lista_erori):
+    """
+    Încarcă istoricul o singură dată pentru tot cardul: fișierul dat explicit sau,
+    altfel, fișierele tuturor pistelor din card (încărcate în paralel și unificate).
+    """
+    if fisier_istoric:
+        _, index = incarca_istoric_indexat(fisier_istoric, lista_erori)
+        return index
+
+    # Import întârziat: pool-ul de procese este necesar doar pentru carduri fără fișier explicit
+    from incarcare_multipista import incarca_piste
+
+    arene = sorted({cursa['pista_gui'] for cursa in curse if cursa.get('pista_gui') in CSV_PER_ARENA})
+    for cursa in curse:
+        if cursa.get('pista_gui') not in CSV_PER_ARENA:
+            lista_erori.append(f"Avertisment: Pista '{cursa['pista']}' (cursa '{cursa['id']}') nu are fisier CSV asociat; se folosesc doar pistele cunoscute din card.")
+    _, index, raport = incarca_piste(arene)
+    lista_erori.extend(raport['avertismente'])
+    for fisier in raport['fisiere']:
+        lista_erori.extend(fisier['avertismente'])
+    return index
+
+
+@cu_diagnostice('card')
+def prezice_card_curse(curse, fisier_istoric=None, greutati_timp_final_override=None, index_istoric=None, cu_simulare=False,
+                       numar_curse_monte_carlo=None):
+    """
+    Prezice toate cursele unui card (lista întoarsă de citeste_card_curse sau construită direct).
+    Istoricul/indexul se încarcă o singură dată; index_istoric permite refolosirea unuia deja încărcat.
+    numar_curse_monte_carlo: dacă este dat, fiecare cursă primește și simularea Monte Carlo (necesită numpy).
+    Returnează {'curse': [{'id', 'detalii', 'predictie', 'erori', 'simulare', 'monte_carlo'}], 'avertismente', 'durata_s'}.
+    Dacă istoricul nu poate fi încărcat (eroare FATALA), nicio cursă nu este prezisă: 'curse' este gol,
+    iar eroarea apare în 'avertismente'.
+    """
+    start = time.perf_counter()
+    avertismente = []
+    if index_istoric is None:
+        index_istoric = _incarca_istoric_card(curse, fisier_istoric, avertismente)
+        if [eroare for eroare in avertismente if "FATALA" in eroare]:
+            return {'curse': [], 'avertismente': avertismente, 'durata_s': time.perf_counter() - start}
+
+    rezultate = []
+    for cursa in curse:
+        predictie, istoric_complet, erori = prezice_cursa_combinata(
+            fisier_istoric,
+            cursa,
+            greutati_timp_final_override=greutati_timp_final_override,
+            index_istoric=index_istoric,
+        )
+        rezultat = {'id': cursa.get('id'), 'detalii': cursa, 'predictie': predictie, 'erori': erori, 'simulare': None,
+                    'monte_carlo': None}
+        if cu_simulare and predictie:
+            rezultat['simulare'] = simuleaza_cursa(predictie, cursa, istoric_complet)
+        if numar_curse_monte_carlo and predictie:
+            # Import întârziat: numpy este necesar doar în modul Monte Carlo
+            from simulare_monte_carlo import simuleaza_monte_carlo
+            rezultat['monte_carlo'] = simuleaza_monte_carlo(predictie, cursa, istoric_complet, numar_curse=numar_curse_monte_carlo,
+                                                            index_istoric=index_istoric)
+        rezultate.append(rezultat)
+
+    return {'curse': rezultate, 'avertismente': avertismente, 'durata_s': time.perf_counter() - start}
+
+
+def prezice_card_din_fisier(cale_card, fisier_istoric=None, greutati_timp_final_override=None, cu_simulare=False):
+    """
+    Citește cardul din fișier și îl prezice; erorile de citire ale cardului apar în 'avertismente'.
+    """
+    erori_card = []
+    curse = citeste_card_curse(cale_card, erori_card)
+    if not curse:
+        return {'curse': [], 'avertismente': erori_card, 'durata_s': 0.0}
+    rezultat = prezice_card_curse(curse, fisier_istoric=fisier_istoric,
+                                  greutati_timp_final_override=greutati_timp_final_override, cu_simulare=cu_simulare)
+    rezultat['avertismente'] = erori_card + rezultat['avertismente']
+    return rezultat
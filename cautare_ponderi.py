@@ -0,0 +1,285 @@
+# --- Căutare vectorizată a ponderilor timpului final (NumPy) ---
+# Indicatorii fiecărui ogar (cel mai bun timp, timpul mediu și ajustările) nu depind de ponderi, deci se
+# calculează o singură dată. Pentru o grilă de vectori (best, average, average_trap) timpii prezisi se
+# obțin într-o singură operație pe matricea (nr. vectori x nr. ogari), apoi se analizează stabilitatea clasamentului.
+#
+# Formula replică exact calculeaza_timp_prezis_combinat: baza folosește doar 'best' și 'average', normalizate
+# la suma ponderilor pozitive aplicabile; ponderea 'average_trap' NU influențează timpul de bază (timpul mediu
+# pe box intră doar prin ajustarea box_specific). Pe această grilă, average_trap schimbă deci clasamentul
+# numai prin raportul best/average rămas.
+#
+# Din linia de comandă, raportul de stabilitate pentru o cursă sau pentru fiecare cursă dintr-un card:
+#   python cautare_ponderi.py --istoric Towcester.csv --pista Towcester --distanta 500 --grad A3 \
+#       --box 1 "Thornfield Love" --box 2 "Julies Own" [--pas 0.02] [--format json]
+#   python cautare_ponderi.py --card card_seara.json [--istoric Towcester.csv]
+
+import sys
+import json
+import argparse
+from collections import Counter
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # dependință opțională
+    np = None
+
+from config import TIMP_MAX_NECUNOSCUT, CSV_PER_ARENA
+from predictor_logic import (
+    PONDERI_TIMP_FINAL_IMPLICITE,
+    calculeaza_ajustari,
+    calculeaza_indicatori_participanti,
+    incarca_istoric_indexat,
+    parseaza_data_cursa_curenta,
+)
+from diagnostice import cu_diagnostice
+
+# Ordinea în care ajustările se adună la baza (aceeași ca în calculeaza_timp_prezis_combinat)
+ORDINE_AJUSTARI = ('box_specific', 'varsta', 'sex', 'box_pozitie', 'grad', 'recency', 'remark', 'curba')
+
+
+def _necesita_numpy():
+    if np is None:
+        raise ImportError("Căutarea vectorizată a ponderilor necesită pachetul 'numpy' (pip install numpy).")
+
+
+def genereaza_grila_ponderi(pas=0.01):
+    """
+    Toți vectorii (best, average, average_trap) cu componente multiplu de pas și suma 1.
+    Returnează un array (m, 3); pentru pas=0.01 sunt 5151 de vectori.
+    """
+    _necesita_numpy()
+    n = int(round(1.0 / pas))
+    i, j = np.meshgrid(np.arange(n + 1), np.arange(n + 1), indexing='ij')
+    masca = (i + j) <= n
+    i, j = i[masca], j[masca]
+    return np.column_stack((i, j, n - i - j)).astype(np.float64) / n
+
+
+@cu_diagnostice('cautare ponderi')
+def pregateste_componente(detalii_cursa, index_istoric, lista_erori=None):
+    """
+    Calculează o singură dată componentele independente de ponderi pentru participanții cursei.
+    Returnează dict cu 'nume', 'best', 'average' (NaN = lipsă) și 'ajustari' (n x 8, în ORDINE_AJUSTARI).
+    """
+    _necesita_numpy()
+    lista_erori = [] if lista_erori is None else lista_erori
+    data_cursa = parseaza_data_cursa_curenta(detalii_cursa.get('data_cursa'), lista_erori)
+    participanti = calculeaza_indicatori_participanti(detalii_cursa, index_istoric, data_cursa)
+
+    nume, best, average, ajustari = [], [], [], []
+    for nume_ogar, indicatori in participanti:
+        indicatori['Nume Ogar'] = nume_ogar  # ca în prezice_cursa_combinata: diagnosticele ajustărilor poartă numele ogarului
+        nume.append(nume_ogar)
+        cel_mai_bun = indicatori.get('Cel_Mai_Bun_Timp', TIMP_MAX_NECUNOSCUT)
+        mediu = indicatori.get('Timp_Mediu', TIMP_MAX_NECUNOSCUT)
+        best.append(cel_mai_bun if cel_mai_bun < TIMP_MAX_NECUNOSCUT else np.nan)
+        average.append(mediu if mediu < TIMP_MAX_NECUNOSCUT else np.nan)
+        valori_ajustari = calculeaza_ajustari(indicatori)
+        ajustari.append([valori_ajustari[cheie] for cheie in ORDINE_AJUSTARI])
+
+    return {
+        'nume': nume,
+        'best': np.array(best, dtype=np.float64),
+        'average': np.array(average, dtype=np.float64),
+        'ajustari': np.array(ajustari, dtype=np.float64).reshape(len(nume), len(ORDINE_AJUSTARI)),
+    }
+
+
+def timpi_prezisi_grila(componente, ponderi):
+    """
+    Timpii prezisi pentru fiecare vector de ponderi: array (m, n), TIMP_MAX_NECUNOSCUT unde baza lipsește.
+    ponderi: array (m, 3) cu coloanele best, average, average_trap.
+    """
+    _necesita_numpy()
+    ponderi = np.atleast_2d(np.asarray(ponderi, dtype=np.float64))
+    w_best = ponderi[:, 0:1]
+    w_avg = ponderi[:, 1:2]
+
+    are_best = ~np.isnan(componente['best'])[None, :]
+    are_avg = ~np.isnan(componente['average'])[None, :]
+
+    suma_aplicabila = np.where(are_best & (w_best > 0), w_best, 0.0) + np.where(are_avg & (w_avg > 0), w_avg, 0.0)
+    are_baza = suma_aplicabila > 0
+    numitor = np.where(are_baza, suma_aplicabila, 1.0)
+
+    with np.errstate(invalid='ignore'):
+        baza = np.where(are_best, componente['best'][None, :] * (w_best / numitor), 0.0) + \
+               np.where(are_avg, componente['average'][None, :] * (w_avg / numitor), 0.0)
+
+    # Ajustările se adună în aceeași ordine ca în varianta scalară (rezultat identic bit cu bit)
+    timpi = baza
+    for k in range(componente['ajustari'].shape[1]):
+        timpi = timpi + componente['ajustari'][None, :, k]
+    return np.where(are_baza, timpi, TIMP_MAX_NECUNOSCUT)
+
+
+def clasamente_grila(timpi):
+    """
+    Clasamentul (indici de participanți, cel mai rapid primul) pentru fiecare rând al matricei de timpi.
+    Sortarea stabilă păstrează ordinea participanților la egalitate, ca sorted() în prezice_cursa_combinata.
+    """
+    return np.argsort(timpi, axis=1, kind='stable')
+
+
+def _spearman_fata_de_referinta(pozitii, pozitii_referinta):
+    n = pozitii.shape[1]
+    if n < 2:
+        return np.ones(pozitii.shape[0])
+    d2 = ((pozitii - pozitii_referinta[None, :]) ** 2).sum(axis=1)
+    return 1.0 - 6.0 * d2 / (n * (n * n - 1))
+
+
+def analizeaza_stabilitate(componente, ponderi, ponderi_referinta=None, numar_clasamente_top=5):
+    """
+    Evaluează toată grila și descrie stabilitatea clasamentului:
+      - frecvența fiecărui câștigător și a fiecărui clasament complet;
+      - poziția medie/minimă/maximă a fiecărui ogar;
+      - corelația Spearman față de clasamentul cu ponderile de referință (implicit cele din predicție).
+    """
+    _necesita_numpy()
+    ponderi = np.atleast_2d(np.asarray(ponderi, dtype=np.float64))
+    ponderi_referinta = ponderi_referinta or PONDERI_TIMP_FINAL_IMPLICITE
+    vector_referinta = np.array([[ponderi_referinta.get('best', 0), ponderi_referinta.get('average', 0),
+                                  ponderi_referinta.get('average_trap', 0)]], dtype=np.float64)
+
+    nume = componente['nume']
+    clasamente = clasamente_grila(timpi_prezisi_grila(componente, ponderi))
+    clasament_referinta = clasamente_grila(timpi_prezisi_grila(componente, vector_referinta))[0]
+
+    m, n = clasamente.shape
+    pozitii = np.empty_like(clasamente)
+    np.put_along_axis(pozitii, clasamente, np.arange(n)[None, :].repeat(m, axis=0), axis=1)
+    pozitii_referinta = np.empty(n, dtype=clasamente.dtype)
+    pozitii_referinta[clasament_referinta] = np.arange(n)
+
+    castigatori = Counter(nume[i] for i in clasamente[:, 0]) if n else Counter()
+    frecventa_clasamente = Counter(map(tuple, clasamente.tolist()))
+    spearman = _spearman_fata_de_referinta(pozitii, pozitii_referinta)
+
+    return {
+        'numar_vectori': m,
+        'clasament_referinta': [nume[i] for i in clasament_referinta],
+        'castigatori': {ogar: numar / m for ogar, numar in castigatori.most_common()},
+        'castigator_referinta_pastrat': float((clasamente[:, 0] == clasament_referinta[0]).mean()) if n else 0.0,
+        'clasament_identic_referinta': float((clasamente == clasament_referinta[None, :]).all(axis=1).mean()) if n else 0.0,
+        'clasamente_distincte': len(frecventa_clasamente),
+        'clasamente_frecvente': [([nume[i] for i in clasament], numar / m)
+                                 for clasament, numar in frecventa_clasamente.most_common(numar_clasamente_top)],
+        'pozitii': {nume[i]: {'medie': float(pozitii[:, i].mean()) + 1, 'min': int(pozitii[:, i].min()) + 1,
+                              'max': int(pozitii[:, i].max()) + 1} for i in range(n)},
+        'spearman_mediu': float(spearman.mean()) if m else None,
+        'spearman_minim': float(spearman.min()) if m else None,
+    }
+
+
+def cauta_ponderi_grila(csv_path, detalii_cursa, pas=0.01, ponderi=None):
+    """
+    Echivalentul vectorizat al test_ponderi_sistematizat: istoricul se încarcă o dată, indicatorii se
+    calculează o dată, apoi întreaga grilă (implicit simplexul cu pasul dat) se evaluează deodată.
+    Returnează (raport_stabilitate, erori).
+    """
+    erori = []
+    _, index_istoric = incarca_istoric_indexat(csv_path, erori)
+    if any("FATALA" in eroare for eroare in erori):
+        return None, erori
+    componente = pregateste_componente(detalii_cursa, index_istoric, erori)
+    grila = genereaza_grila_ponderi(pas) if ponderi is None else ponderi
+    return analizeaza_stabilitate(componente, grila), erori
+
+
+def formateaza_raport_stabilitate(raport):
+    linii = [f"Vectori de ponderi evaluați: {raport['numar_vectori']}",
+             f"Clasament cu ponderile de referință: {', '.join(raport['clasament_referinta'])}",
+             f"Câștigătorul de referință păstrat în {100 * raport['castigator_referinta_pastrat']:.1f}% din grilă; "
+             f"clasament identic în {100 * raport['clasament_identic_referinta']:.1f}%",
+             f"Clasamente distincte: {raport['clasamente_distincte']}; Spearman mediu/minim: "
+             f"{raport['spearman_mediu']:.3f} / {raport['spearman_minim']:.3f}",
+             "Câștigători pe grilă:"]
+    for ogar, frecventa in raport['castigatori'].items():
+        linii.append(f"  {ogar:<20} {100 * frecventa:6.1f}%")
+    linii.append("Poziții (medie / min / max):")
+    for ogar, pozitie in raport['pozitii'].items():
+        linii.append(f"  {ogar:<20} {pozitie['medie']:5.2f} / {pozitie['min']} / {pozitie['max']}")
+    return "\n".join(linii)
+
+
+def construieste_parser():
+    parser = argparse.ArgumentParser(
+        description="Căutare pe grila de ponderi (best, average, average_trap) și stabilitatea clasamentului.")
+    sursa = parser.add_mutually_exclusive_group(required=True)
+    sursa.add_argument('--card', help="Card de curse (JSON sau CSV, vezi card_curse.py)")
+    sursa.add_argument('--pista', help="Pista cursei (numele din GUI sau abrevierea din CSV)")
+    parser.add_argument('--distanta', type=int, help="Distanța cursei în metri")
+    parser.add_argument('--grad', default='', help="Gradul cursei (ex. A3)")
+    parser.add_argument('--data', default=date.today().strftime('%d/%m/%Y'),
+                        help="Data cursei (DD/MM/YYYY); implicit data de azi")
+    parser.add_argument('--box', nargs=2, action='append', metavar=('BOX', 'NUME'), default=[],
+                        help="Un participant: numărul boxei și numele ogarului; se repetă pentru fiecare ogar")
+    parser.add_argument('--istoric', help="Fișierul cu istoricul; implicit fișierul pistei din CSV_PER_ARENA")
+    parser.add_argument('--pas', type=float, default=0.01, help="Pasul grilei de ponderi (implicit 0.01)")
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help="Formatul ieșirii (implicit text)")
+    return parser
+
+
+def main(argv=None):
+    """
+    Raportul de stabilitate pe stdout; codul de ieșire: 0 = cel puțin un raport, 1 = niciunul, 2 = argumente invalide.
+    """
+    # Import întârziat: card_curse este necesar doar pentru rularea din linia de comandă
+    from card_curse import citeste_card_curse, normalizeaza_curse
+
+    parser = construieste_parser()
+    argumente = parser.parse_args(argv)
+    if not 0 < argumente.pas <= 0.5:
+        parser.error("--pas trebuie să fie în intervalul (0, 0.5]")
+    if np is None:
+        print("Căutarea vectorizată a ponderilor necesită pachetul 'numpy' (pip install numpy).", file=sys.stderr)
+        return 1
+
+    erori = []
+    if argumente.card:
+        curse = citeste_card_curse(argumente.card, erori)
+    else:
+        if argumente.distanta is None or argumente.distanta <= 0:
+            parser.error("--distanta (număr pozitiv) este obligatorie împreună cu --pista")
+        if not argumente.box:
+            parser.error("adăugați cel puțin un participant cu --box BOX NUME")
+        curse = normalizeaza_curse([{
+            'id': '1',
+            'pista': argumente.pista,
+            'distanta_m': argumente.distanta,
+            'grad': argumente.grad,
+            'data_cursa': argumente.data,
+            'ogari_participanti': [(nume, box) for box, nume in argumente.box],
+        }], erori)
+    for eroare in erori:
+        print(eroare, file=sys.stderr)
+
+    rapoarte = []
+    grila = genereaza_grila_ponderi(argumente.pas)
+    for cursa in curse:
+        fisier_istoric = argumente.istoric or CSV_PER_ARENA.get(cursa.get('pista_gui'))
+        if not fisier_istoric:
+            print(f"Cursa '{cursa['id']}': pista '{cursa['pista']}' nu are fisier de istoric; folositi --istoric.", file=sys.stderr)
+            continue
+        raport, erori_cursa = cauta_ponderi_grila(fisier_istoric, cursa, ponderi=grila)
+        for eroare in erori_cursa:
+            print(eroare, file=sys.stderr)
+        if raport is not None and raport['clasament_referinta']:
+            rapoarte.append({'id': cursa['id'], 'pista': cursa['pista'], 'distanta_m': cursa['distanta_m'],
+                             'raport': raport})
+
+    if argumente.format == 'json':
+        json.dump(rapoarte, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write('\n')
+    else:
+        for intrare in rapoarte:
+            print(f"=== Cursa {intrare['id']}: {intrare['pista']} {intrare['distanta_m']}m ===")
+            print(formateaza_raport_stabilitate(intrare['raport']))
+            print()
+    return 0 if rapoarte else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# --- Citire în flux a fișierelor .xlsx (doar biblioteca standard: zipfile + iterparse) ---
+# Rândurile foii de calcul sunt produse unul câte unul, ca liste de texte, exact în forma în care le-ar fi
+# scris exportul CSV din Excel: numerele fără zecimale inutile, datele formatate după formatul celulei
+# (DATA = dd/mm/yyyy, BIRTH = "Sep-21"), celulele lipsă ca ''. Astfel rândurile trec prin același
+# convertor ca la CSV (compileaza_convertor_rand / proceseaza_rand_istoric).
+#
+# Memoria folosită nu depinde de numărul de rânduri: XML-ul foii este citit în flux din arhivă, iar fiecare
+# rând este eliminat din arbore după procesare. În memorie rămân doar textele partajate (sharedStrings)
+# și formatele celulelor.
+
+import zipfile
+import posixpath
+from datetime import datetime, timedelta
+from xml.etree.ElementTree import iterparse
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# Formatele de dată predefinite (numFmtId) și forma lor în exportul CSV; restul formatelor de dată -> dd/mm/yyyy
+FORMATE_DATA_PREDEFINITE = {
+    14: '%d/%m/%Y', 15: '%d-%b-%y', 16: '%d-%b', 17: '%b-%y', 18: '%I:%M %p', 19: '%I:%M:%S %p',
+    20: '%H:%M', 21: '%H:%M:%S', 22: '%d/%m/%Y %H:%M', 45: '%M:%S', 46: '%H:%M:%S', 47: '%M:%S',
+}
+FORMAT_DATA_IMPLICIT = '%d/%m/%Y'
+
+EPOCA_1900 = datetime(1899, 12, 30)
+EPOCA_1904 = datetime(1904, 1, 1)
+
+
+def _este_format_data(cod_format):
+    # Un format personalizat este de dată dacă, fără textele între ghilimele și secțiunile [..], conține d/m/y
+    text = ''
+    in_ghilimele = False
+    in_paranteze = False
+    for caracter in cod_format:
+        if caracter == '"':
+            in_ghilimele = not in_ghilimele
+        elif in_ghilimele:
+            continue
+        elif caracter == '[':
+            in_paranteze = True
+        elif caracter == ']':
+            in_paranteze = False
+        elif not in_paranteze:
+            text += caracter.lower()
+    return any(litera in text for litera in 'dmy')
+
+
+def _index_coloana(referinta):
+    # 'AB12' -> 27 (de la 0)
+    index = 0
+    for caracter in referinta:
+        if 'A' <= caracter <= 'Z':
+            index = index * 26 + ord(caracter) - 64
+        else:
+            break
+    return index - 1
+
+
+def _text_element(element):
+    # Textul unui <si> sau <is>: toate <t>, inclusiv din secvențele formatate <r>, fără transcrierea fonetică <rPh>
+    parti = []
+    for copil in element:
+        if copil.tag == NS_MAIN + 't':
+            parti.append(copil.text or '')
+        elif copil.tag == NS_MAIN + 'r':
+            for t in copil.iter(NS_MAIN + 't'):
+                parti.append(t.text or '')
+    return ''.join(parti)
+
+
+def formateaza_numar(valoare):
+    """
+    Numărul ca în formatul General din Excel: '28', '5.34' (fără zgomotul de virgulă mobilă).
+    """
+    numar = float(valoare)
+    if numar.is_integer() and abs(numar) < 1e15:
+        return str(int(numar))
+    return format(numar, '.15g')
+
+
+class CititorXlsx:
+    """
+    Deschide arhiva și pregătește foaia (prima din registru sau cea cu numele dat).
+    randuri() produce listele de valori ale rândurilor, antetul primul.
+    """
+
+    def __init__(self, cale_fisier, foaie=None):
+        self.cale_fisier = cale_fisier
+        with zipfile.ZipFile(cale_fisier) as arhiva:
+            nume_membri = set(arhiva.namelist())
+            self.cale_foaie, self.epoca = self._gaseste_foaia(arhiva, foaie)
+            self.texte_partajate = self._citeste_texte_partajate(arhiva) if 'xl/sharedStrings.xml' in nume_membri else []
+            self.formate_data = self._citeste_formate_data(arhiva) if 'xl/styles.xml' in nume_membri else {}
+
+    @staticmethod
+    def _gaseste_foaia(arhiva, foaie):
+        registru = iterparse(arhiva.open('xl/workbook.xml'), events=('end',))
+        foi = []
+        epoca = EPOCA_1900
+        for _, element in registru:
+            if element.tag == NS_MAIN + 'sheet':
+                foi.append((element.get('name'), element.get(NS_REL + 'id')))
+            elif element.tag == NS_MAIN + 'workbookPr' and element.get('date1904') in ('1', 'true'):
+                epoca = EPOCA_1904
+        if not foi:
+            raise ValueError("Registrul nu conține nicio foaie de calcul.")
+        if foaie is None:
+            id_relatie = foi[0][1]
+        else:
+            id_relatie = next((id_foaie for nume, id_foaie in foi if nume == foaie), None)
+            if id_relatie is None:
+                raise ValueError(f"Foaia '{foaie}' nu există (foi: {', '.join(nume for nume, _ in foi)}).")
+
+        for _, element in iterparse(arhiva.open('xl/_rels/workbook.xml.rels'), events=('end',)):
+            if element.tag == NS_PKG_REL + 'Relationship' and element.get('Id') == id_relatie:
+                tinta = element.get('Target')
+                cale = tinta.lstrip('/') if tinta.startswith('/') else posixpath.normpath(posixpath.join('xl', tinta))
+                return cale, epoca
+        raise ValueError(f"Relația '{id_relatie}' a foii nu a fost găsită în registru.")
+
+    @staticmethod
+    def _citeste_texte_partajate(arhiva):
+        texte = []
+        for _, element in iterparse(arhiva.open('xl/sharedStrings.xml'), events=('end',)):
+            if element.tag == NS_MAIN + 'si':
+                texte.append(_text_element(element))
+                element.clear()
+        return texte
+
+    @staticmethod
+    def _citeste_formate_data(arhiva):
+        # index stil (atributul s al celulei) -> format strftime, doar pentru stilurile cu format de dată
+        formate_personalizate = {}
+        formate_stiluri = []
+        in_cell_xfs = False
+        for eveniment, element in iterparse(arhiva.open('xl/styles.xml'), events=('start', 'end')):
+            if element.tag == NS_MAIN + 'cellXfs':
+                in_cell_xfs = eveniment == 'start'
+            elif eveniment == 'end' and element.tag == NS_MAIN + 'numFmt':
+                formate_personalizate[int(element.get('numFmtId'))] = element.get('formatCode', '')
+            elif eveniment == 'end' and element.tag == NS_MAIN + 'xf' and in_cell_xfs:
+                formate_stiluri.append(int(element.get('numFmtId', 0)))
+
+        formate_data = {}
+        for stil, id_format in enumerate(formate_stiluri):
+            if id_format in formate_personalizate:
+                if _este_format_data(formate_personalizate[id_format]):
+                    formate_data[stil] = FORMAT_DATA_IMPLICIT
+            elif id_format in FORMATE_DATA_PREDEFINITE:
+                formate_data[stil] = FORMATE_DATA_PREDEFINITE[id_format]
+            elif 27 <= id_format <= 36 or 50 <= id_format <= 58:  # formate de dată regionale (CJK)
+                formate_data[stil] = FORMAT_DATA_IMPLICIT
+        return formate_data
+
+    def _valoare_celula(self, tip, valoare, stil, element):
+        if tip == 's':
+            return self.texte_partajate[int(valoare)] if valoare is not None else ''
+        if tip == 'inlineStr':
+            text_inline = element.find(NS_MAIN + 'is')
+            return _text_element(text_inline) if text_inline is not None else ''
+        if valoare is None:
+            return ''
+        if tip in ('str', 'e'):
+            return valoare
+        if tip == 'b':
+            return 'TRUE' if valoare == '1' else 'FALSE'
+        format_data = self.formate_data.get(stil)
+        try:
+            if format_data is not None:
+                return (self.epoca + timedelta(days=float(valoare))).strftime(format_data)
+            return formateaza_numar(valoare)
+        except (ValueError, OverflowError):
+            return valoare
+
+    def randuri(self):
+        """
+        Generator: o listă de texte per rând, completată cu '' până la lățimea antetului (rândurile goale sunt sărite).
+        """
+        tag_rand, tag_celula, tag_valoare = NS_MAIN + 'row', NS_MAIN + 'c', NS_MAIN + 'v'
+        tag_date = NS_MAIN + 'sheetData'
+        index_coloane = {}  # literele referinței ('AB') -> index; rândul din referință diferă, literele se repetă
+        with zipfile.ZipFile(self.cale_fisier) as arhiva:
+            date_foaie = None
+            latime = None
+            for eveniment, element in iterparse(arhiva.open(self.cale_foaie), events=('start', 'end')):
+                if eveniment == 'start':
+                    if element.tag == tag_date:
+                        date_foaie = element
+                    continue
+                if element.tag != tag_rand:
+                    continue
+
+                valori = []
+                for celula in element:
+                    if celula.tag != tag_celula:
+                        continue
+                    referinta = celula.get('r')
+                    if referinta:
+                        litere = referinta.rstrip('0123456789')
+                        index = index_coloane.get(litere)
+                        if index is None:
+                            index = index_coloane[litere] = _index_coloana(litere)
+                        if index > len(valori):
+                            valori.extend([''] * (index - len(valori)))
+                    valoare = None
+                    for copil in celula:
+                        if copil.tag == tag_valoare:
+                            valoare = copil.text
+                            break
+                    stil = celula.get('s')
+                    valori.append(self._valoare_celula(celula.get('t'), valoare, int(stil) if stil else 0, celula))
+                # Memorie constantă: rândul procesat nu mai rămâne în arbore
+                if date_foaie is not None:
+                    date_foaie.clear()
+                else:
+                    element.clear()
+                if not any(valori):
+                    continue
+                # Ca la export: fiecare rând are cel puțin atâtea coloane câte are antetul
+                if latime is None:
+                    while valori[-1] == '':
+                        valori.pop()
+                    latime = len(valori)
+                elif len(valori) < latime:
+                    valori.extend([''] * (latime - len(valori)))
+                yield valori
+
+
+def citeste_randuri_xlsx(cale_fisier, foaie=None):
+    """
+    Rândurile foii (antetul primul) ca liste de texte; vezi CititorXlsx.
+    """
+    return CititorXlsx(cale_fisier, foaie).randuri()
@@ -195,6 +195,113 @@ COEFICIENT_BONUS_LIBER_REMARK = 0.1           # -0.1s pentru 100% curse cu alerg
 COEFICIENT_BONUS_CURBA_FINISHER = 0.07   # -0.07s dacă ogarul recuperează >=2 poziții pe final ("Finisher")
 COEFICIENT_PENALIZARE_CURBA_EARLY = 0.07 # +0.07s dacă ogarul pierde >=2 poziții pe final ("Early Pace")
 
+# ----------------------------------------------------------------------
+#  Cache pe disc pentru istoricul parsat din CSV
+# ----------------------------------------------------------------------
+
+CACHE_ISTORIC_ACTIVAT = True          # False = se parsează mereu fișierul CSV de la zero
+CACHE_ISTORIC_DIR = '.cache_istoric'  # Directorul în care se salvează istoricul parsat
+CACHE_ISTORIC_MAX_MB = 256            # Dimensiune maximă totală; peste ea se elimină intrările folosite cel mai demult (LRU)
+
+# Parsare rapidă a CSV-ului (convertor compilat pe antet + memoizare date/valori repetate).
+# False = parsarea de referință cu DictReader, rând cu rând.
+PARSARE_RAPIDA_ISTORIC = True
+
+# ----------------------------------------------------------------------
+#  Încărcare paralelă a mai multor piste (incarcare_multipista.py)
+# ----------------------------------------------------------------------
+
+INCARCARE_PARALELA_MAX_PROCESE = None  # None = numărul de nuclee; 1 = încărcare secvențială, fără procese
+
+# ----------------------------------------------------------------------
+#  Agregate per ogar actualizate incremental (agregate_ogari.py)
+# ----------------------------------------------------------------------
+
+# Predicția citește indicatorii din agregatele per ogar actualizate incremental (agregate_ogari.py).
+# False = indicatorii se recalculează din istoricul complet al ogarului la fiecare cursă.
+AGREGATE_OGARI_ACTIVAT = True
+
+# ----------------------------------------------------------------------
+#  Backtest walk-forward (backtest.py)
+# ----------------------------------------------------------------------
+
+BACKTEST_MAX_PROCESE = None      # None = numărul de nuclee; 1 = rulare în procesul curent
+BACKTEST_MIN_PARTICIPANTI = 2    # Cursele reconstruite cu mai puțini ogari sunt ignorate
+BACKTEST_FOLOSESTE_AS_OF = True  # Indicatori din agregate prefix (bisect) în loc de re-filtrarea istoricului
+
+# ----------------------------------------------------------------------
+#  Simulare deterministă (simuleaza_cursa)
+# ----------------------------------------------------------------------
+
+SIMULARE_MEMO_MAX_INTRARI = 256  # Rezultate de simulare păstrate în memorie per (predicție, detalii cursă)
+
+# ----------------------------------------------------------------------
+#  Simulare Monte Carlo (simulare_monte_carlo.py)
+# ----------------------------------------------------------------------
+
+SIMULARE_MC_NUMAR_CURSE = 100000          # Numărul de curse simulate
+SIMULARE_MC_SEED = 12345                  # Seed fix = rezultate reproductibile
+SIMULARE_MC_SIGMA_IMPLICIT = 0.25         # secunde; abaterea timpului final când istoricul e insuficient
+SIMULARE_MC_SIGMA_SECTIONAL_IMPLICIT = 0.10  # secunde; la fel pentru timpul la primul punct
+SIMULARE_MC_SIGMA_MINIM = 0.05            # secunde; abaterea minimă (evită ogari "fără variație")
+SIMULARE_MC_MIN_CURSE_SIGMA = 3           # Curse minime pe pistă+distanță pentru abaterea din istoric
+SIMULARE_MC_PENALIZARE_NECUNOSCUT = 0.5   # secunde; ogarii fără timp prezis pornesc după cel mai lent ogar cunoscut
+SIMULARE_MC_LOCURI_PLASATE = 2            # "Plasat" = primele N locuri
+
+# ----------------------------------------------------------------------
+#  GUI: predicție pe un fir de execuție separat (predictor_simplu.py)
+# ----------------------------------------------------------------------
+
+GUI_INTERVAL_VERIFICARE_MS = 50  # Cât de des (ms) preia fereastra mesajele de progres/rezultat ale predicției
+GUI_AFISEAZA_TIMPI_ETAPE = False  # Afișează sub rezultate timpii pe etape ai predicției (instrumentare.py)
+
+# ----------------------------------------------------------------------
+#  Server local de predicții (server_predictii.py)
+# ----------------------------------------------------------------------
+
+SERVER_HOST = '127.0.0.1'             # Doar adrese locale (loopback) sunt acceptate
+SERVER_PORT = 8765
+SERVER_INTERVAL_VERIFICARE_S = 2.0    # Cât de des se verifică mtime-ul fișierelor de istoric
+SERVER_MAX_CORP_OCTETI = 1000000      # Dimensiunea maximă a corpului unei cereri
+SERVER_FIRE_PREDICTII = 4             # Fire pentru calculul cererilor, în afara buclei asyncio
+SERVER_MC_MAX_CURSE = 1000000         # Limita curselor simulate Monte Carlo cerute într-o cerere
+
+# ----------------------------------------------------------------------
+#  Benchmark și istoric sintetic (benchmarks/bench_flux.py, generator_istoric_sintetic.py)
+# ----------------------------------------------------------------------
+
+BENCHMARK_DIRECTOR = 'benchmark_date'      # Fișierele sintetice generate (refolosite între rulări)
+BENCHMARK_SEED = 2024                      # Același seed = aceleași fișiere și aceleași curse de test
+BENCHMARK_DIMENSIUNI = [10000, 100000]     # Numărul de rânduri pentru care se rulează implicit
+BENCHMARK_REPETARI = 3                     # Repetări per măsurătoare (se raportează minimul și mediana)
+BENCHMARK_CURSE_LOT = 100                  # Cursele din predicția "în lot"
+BENCHMARK_PRAG_REGRESIE = 0.10             # La comparare: >10% mai lent decât rularea de referință = regresie
+
+# ----------------------------------------------------------------------
+#  Logging și diagnostice agregate (diagnostice.py)
+# ----------------------------------------------------------------------
+
+LOG_FISIER = "greyhound_predictor.log"   # Fișierul de log instalat de configureaza_logging() (None = fără fișier)
+LOG_NIVEL = "WARNING"
+DIAGNOSTICE_JSONL_FISIER = None           # Ex. "diagnostice.jsonl": un rezumat JSON per rulare (None = dezactivat)
+DIAGNOSTICE_JSONL_MAX_OCTETI = 5 * 1024 * 1024   # Rotație când fișierul JSONL depășește dimensiunea
+DIAGNOSTICE_JSONL_COPII = 3               # Câte fișiere rotite (.1, .2, ...) se păstrează
+DIAGNOSTICE_MAX_OGARI_REZUMAT = 5         # Câți ogari sunt numiți per categorie în linia de rezumat
+DIAGNOSTICE_INTERVAL_LOG_S = 60.0         # În afara unei rulări: cel mult un mesaj per categorie în acest interval
+
+# ----------------------------------------------------------------------
+#  Snapshot binar al istoricului (snapshot_istoric.py)
+# ----------------------------------------------------------------------
+
+SNAPSHOT_EXTENSIE = '.gpsnap'  # Fișierele de istoric cu această extensie sunt deschise ca snapshot (mmap)
+
+# ----------------------------------------------------------------------
+#  Backend SQLite pentru istoric (istoric_sqlite.py)
+# ----------------------------------------------------------------------
+
+ISTORIC_SQLITE_DB = 'istoric.sqlite3'  # Baza comună tuturor fișierelor de istoric încărcate (incarca_istoric_sqlite)
+SQLITE_LOT_INSERARE = 50000            # Rânduri per executemany la inserarea în bază
+
 # ----------------------------------------------------------------------
 #  Alte opțiuni suplimentare (de extins la nevoie)
 # ----------------------------------------------------------------------
@@ -0,0 +1,256 @@
+# --- Diagnostice agregate pentru fluxul de predicție ---
+# Avertismentele repetitive din calculul ajustărilor (sex/grad/recență lipsă sau necunoscute, ajustări foarte mari,
+# ponderi invalide) nu se mai scriu în log pentru fiecare ogar. În timpul unei rulări (`with colecteaza():` sau
+# funcții decorate cu @cu_diagnostice) ele sunt doar numărate pe categorie și ogar, iar la sfârșitul rulării
+# exterioare se emite un singur rezumat: o linie de log și, opțional, o înregistrare JSONL (fișier cu rotație
+# după dimensiune). În afara unei rulări, fiecare categorie este scrisă în log cel mult o dată pe interval.
+#
+# Configurarea logging-ului (fișier + consolă) nu mai este un efect al importului: punctele de intrare
+# (GUI, CLI, server) apelează configureaza_logging(). Modulul logging se importă abia la primul mesaj.
+#
+#   with colecteaza('card') as colector:
+#       ...                               # raporteaza(...) din predicție
+#   colector.rezumat()                    # {'avertismente': N, 'categorii': {...}}
+
+import functools
+import json
+import threading
+import time
+from datetime import datetime
+
+from config import (
+    LOG_FISIER,
+    LOG_NIVEL,
+    DIAGNOSTICE_JSONL_FISIER,
+    DIAGNOSTICE_JSONL_MAX_OCTETI,
+    DIAGNOSTICE_JSONL_COPII,
+    DIAGNOSTICE_MAX_OGARI_REZUMAT,
+    DIAGNOSTICE_INTERVAL_LOG_S,
+)
+
+# Mesajele categoriilor (folosite în rezumat și în log-ul limitat din afara rulărilor)
+CATEGORII = {
+    'sex_necunoscut': "Sex necunoscut (ajustare default)",
+    'sex_lipsa': "Sex lipsă (ajustare default)",
+    'grad_necunoscut': "Grad necunoscut (ajustare default)",
+    'grad_lipsa': "Grad lipsă (ajustare default)",
+    'recency_necunoscut': "Recency status necunoscut (ajustare default)",
+    'recency_lipsa': "Recency status lipsă (ajustare default)",
+    'ajustare_mare': "Ajustare totală peste 1s - verifică datele istorice",
+    'ponderi_negative': "Ponderi negative",
+    'suma_ponderi_nula': "Suma ponderilor <= 0 - rezultatele pot fi aberante",
+}
+
+FARA_NUME = "<FĂRĂ NUME>"
+
+_local = threading.local()
+_loggere = None
+
+
+def loggere_diagnostice():
+    """
+    (logger-ul rezumatelor, logger-ul JSONL), create la prima folosire.
+    """
+    global _loggere
+    if _loggere is None:
+        import logging
+        logger_jsonl = logging.getLogger('greyhound.diagnostice.jsonl')
+        logger_jsonl.propagate = False
+        _loggere = (logging.getLogger('greyhound.diagnostice'), logger_jsonl)
+    return _loggere
+
+
+class ColectorDiagnostice:
+    """
+    Contoare pentru o rulare: categorii[categorie] = {'total', 'ogari': {nume: număr}, 'valori': {valoare: număr},
+    'detalii': {nume: ultimul detaliu}}. Valorile sunt de ex. sexul/gradul necunoscut, detaliile - ajustările mari.
+    """
+
+    def __init__(self, nume='rulare'):
+        self.nume = nume
+        self.categorii = {}
+        self.start = time.time()
+        self._lock = threading.Lock()
+
+    def inregistreaza(self, categorie, ogar=None, valoare=None, detalii=None):
+        ogar = ogar if isinstance(ogar, str) and ogar.strip() else FARA_NUME
+        with self._lock:
+            intrare = self.categorii.get(categorie)
+            if intrare is None:
+                intrare = self.categorii[categorie] = {'total': 0, 'ogari': {}, 'valori': {}, 'detalii': {}}
+            intrare['total'] += 1
+            intrare['ogari'][ogar] = intrare['ogari'].get(ogar, 0) + 1
+            if valoare is not None:
+                intrare['valori'][valoare] = intrare['valori'].get(valoare, 0) + 1
+            if detalii is not None:
+                intrare['detalii'][ogar] = detalii
+
+    def adauga_categorii(self, categorii):
+        """
+        Adaugă contoarele altei rulări (ColectorDiagnostice.categorii, ex. întoarse de un proces worker).
+        """
+        with self._lock:
+            for categorie, alta in categorii.items():
+                intrare = self.categorii.get(categorie)
+                if intrare is None:
+                    intrare = self.categorii[categorie] = {'total': 0, 'ogari': {}, 'valori': {}, 'detalii': {}}
+                intrare['total'] += alta['total']
+                for cheie in ('ogari', 'valori'):
+                    for element, numar in alta[cheie].items():
+                        intrare[cheie][element] = intrare[cheie].get(element, 0) + numar
+                intrare['detalii'].update(alta['detalii'])
+
+    def total(self):
+        return sum(intrare['total'] for intrare in self.categorii.values())
+
+    def rezumat(self):
+        """
+        Forma serializabilă (JSON) a rulării.
+        """
+        return {
+            'rulare': self.nume,
+            'moment': datetime.fromtimestamp(self.start).isoformat(timespec='seconds'),
+            'durata_s': round(time.time() - self.start, 3),
+            'avertismente': self.total(),
+            'categorii': {categorie: {
+                'total': intrare['total'],
+                'ogari': dict(intrare['ogari']),
+                'valori': {str(valoare): numar for valoare, numar in intrare['valori'].items()},
+                'detalii': dict(intrare['detalii']),
+            } for categorie, intrare in sorted(self.categorii.items())},
+        }
+
+    def formateaza_rezumat(self, max_ogari=None):
+        """
+        O singură linie: categoriile cu numărul de avertismente, valorile întâlnite și primii ogari afectați.
+        """
+        max_ogari = DIAGNOSTICE_MAX_OGARI_REZUMAT if max_ogari is None else max_ogari
+        parti = []
+        for categorie, intrare in sorted(self.categorii.items(), key=lambda element: -element[1]['total']):
+            ogari = sorted(intrare['ogari'].items(), key=lambda element: -element[1])
+            text_ogari = ', '.join(nume for nume, _ in ogari[:max_ogari])
+            if len(ogari) > max_ogari:
+                text_ogari += f" și încă {len(ogari) - max_ogari}"
+            text_valori = ''
+            if intrare['valori']:
+                text_valori = " [" + ', '.join(f"'{valoare}'" for valoare in sorted(map(str, intrare['valori']))) + "]"
+            parti.append(f"{CATEGORII.get(categorie, categorie)}{text_valori}: {intrare['total']}x, {len(ogari)} ogari ({text_ogari})")
+        return f"Diagnostice {self.nume}: {self.total()} avertismente - " + "; ".join(parti)
+
+    def emite(self):
+        """
+        Scrie rezumatul rulării (dacă există avertismente) în log și în fișierul JSONL, dacă este configurat.
+        """
+        if not self.categorii:
+            return
+        logger_diagnostice, logger_jsonl = loggere_diagnostice()
+        logger_diagnostice.warning(self.formateaza_rezumat())
+        if logger_jsonl.handlers:
+            logger_jsonl.info(json.dumps(self.rezumat(), ensure_ascii=False))
+
+
+class colecteaza:
+    """
+    Context care deschide o rulare pe firul curent. Rulările imbricate se adaugă la cea exterioară;
+    rezumatul se emite o singură dată, la ieșirea din rularea exterioară (emite=False îl lasă apelantului).
+    """
+
+    def __init__(self, nume='rulare', emite=True):
+        self.nume = nume
+        self.emite = emite
+        self.colector = None
+        self._anterior = None
+
+    def __enter__(self):
+        self._anterior = getattr(_local, 'colector', None)
+        self.colector = self._anterior if self._anterior is not None else ColectorDiagnostice(self.nume)
+        _local.colector = self.colector
+        return self.colector
+
+    def __exit__(self, *exc):
+        _local.colector = self._anterior
+        if self._anterior is None and self.emite:
+            self.colector.emite()
+        return False
+
+
+def cu_diagnostice(nume):
+    """
+    Decorator: fiecare apel al funcției este o rulare (sau face parte din rularea deja deschisă).
+    """
+    def decorator(functie):
+        @functools.wraps(functie)
+        def invelis(*args, **kwargs):
+            with colecteaza(nume):
+                return functie(*args, **kwargs)
+        return invelis
+    return decorator
+
+
+def colector_curent():
+    return getattr(_local, 'colector', None)
+
+
+class _LimitatorLog:
+    # În afara unei rulări: cel mult un mesaj per categorie la DIAGNOSTICE_INTERVAL_LOG_S secunde,
+    # cu numărul avertismentelor suprimate între timp.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ultimul = {}
+        self._suprimate = {}
+
+    def raporteaza(self, categorie, ogar, valoare):
+        acum = time.monotonic()
+        with self._lock:
+            ultimul = self._ultimul.get(categorie)
+            if ultimul is not None and acum - ultimul < DIAGNOSTICE_INTERVAL_LOG_S:
+                self._suprimate[categorie] = self._suprimate.get(categorie, 0) + 1
+                return
+            self._ultimul[categorie] = acum
+            suprimate = self._suprimate.pop(categorie, 0)
+        text_valoare = f" '{valoare}'" if valoare is not None else ''
+        text_suprimate = f" ({suprimate} avertismente similare suprimate)" if suprimate else ''
+        loggere_diagnostice()[0].warning("%s%s pentru ogarul %s.%s", CATEGORII.get(categorie, categorie), text_valoare,
+                                   ogar or FARA_NUME, text_suprimate)
+
+
+_limitator = _LimitatorLog()
+
+
+def raporteaza(categorie, ogar=None, valoare=None, detalii=None):
+    """
+    Înregistrează un avertisment în rularea curentă sau, în afara unei rulări, în log-ul limitat.
+    """
+    colector = getattr(_local, 'colector', None)
+    if colector is not None:
+        colector.inregistreaza(categorie, ogar, valoare, detalii)
+    else:
+        _limitator.raporteaza(categorie, ogar, valoare)
+
+
+def configureaza_logging(fisier_log=LOG_FISIER, nivel=LOG_NIVEL, consola=True, fisier_jsonl=DIAGNOSTICE_JSONL_FISIER):
+    """
+    Instalează handler-ele de log (fișier și/sau consolă) și, opțional, fișierul JSONL cu rezumatele rulărilor.
+    Apelată de punctele de intrare; apelurile repetate nu dublează handler-ele.
+    """
+    import logging
+    import logging.handlers
+
+    handlere = []
+    if fisier_log:
+        handlere.append(logging.FileHandler(fisier_log, mode='a', encoding='utf-8'))
+    if consola:
+        handlere.append(logging.StreamHandler())
+    if handlere:
+        logging.basicConfig(level=nivel, format="%(asctime)s [%(levelname)s] %(message)s", handlers=handlere, force=True)
+
+    logger_jsonl = loggere_diagnostice()[1]
+    for handler in list(logger_jsonl.handlers):
+        logger_jsonl.removeHandler(handler)
+        handler.close()
+    if fisier_jsonl:
+        handler_jsonl = logging.handlers.RotatingFileHandler(fisier_jsonl, maxBytes=DIAGNOSTICE_JSONL_MAX_OCTETI,
+                                                             backupCount=DIAGNOSTICE_JSONL_COPII, encoding='utf-8')
+        handler_jsonl.setFormatter(logging.Formatter('%(message)s'))
+        logger_jsonl.addHandler(handler_jsonl)
+        logger_jsonl.setLevel(logging.INFO)
@@ -0,0 +1,154 @@
+# --- Generator de istoric sintetic (CSV în formatul fișierelor reale) ---
+# Produce fișiere cu exact antetul fișierelor de pistă (NUME, SEX, BIRTH, VARSTA, DATA, PISTA, DISTANTA, BOXA,
+# SECTIONAL, CURBA, POZITIE, X, X, REMARK, FINAL, CONDITII, WEIGHT, <cote>, GRAD, FINAL CALC), cu rândurile
+# grupate pe ogar și cele mai recente primele, ca în exporturile reale. Fiecare ogar are o pistă/distanță
+# de bază, o valoare proprie (timp și secțional) și curse la câteva zile distanță; timpii, pozițiile la
+# curbe, REMARK-urile și gradele variază în jurul acestor valori.
+#
+# Scrierea este în flux (rând cu rând), deci se pot genera fișiere de la 10k la 10M de rânduri fără a le ține
+# în memorie. Cu același seed se obține același fișier.
+#
+#   python generator_istoric_sintetic.py sintetic_1M.csv 1000000
+
+import csv
+import random
+import sys
+from datetime import datetime, timedelta
+
+from config import DISTANTE_PUNCTE_SIMULARE, BENCHMARK_SEED
+
+ANTET_CSV = ['NUME', 'SEX', 'BIRTH', 'VARSTA', 'DATA', 'PISTA', 'DISTANTA', 'BOXA', 'SECTIONAL', 'CURBA', 'POZITIE',
+             'X', 'X', 'REMARK', 'FINAL', 'CONDITII', 'WEIGHT', '', 'GRAD', 'FINAL CALC']
+
+PREFIXE_NUME = ['Bit View', 'Droopys', 'Ballymac', 'Swift', 'Kilara', 'Coolavanny', 'Romeo', 'Slippy', 'Prestons',
+                'Muxton', 'Sandwood', 'Thornfield', 'Acomb', 'Avongate', 'Superstar', 'Tibsy', 'Baggins', 'Julies',
+                'Starshine', 'Aero', 'Ardera', 'Boherduff', 'Glengar', 'Kereight']
+SUFIXE_NUME = ['Sal', 'Natalie', 'Blue', 'Oprah', 'Pride', 'Aria', 'Nano', 'Mabel', 'Love', 'Lad', 'Gloss', 'Bobbie',
+               'Wibsy', 'Own', 'Sweetie', 'Rocket', 'Flash', 'Jet', 'Queen', 'King', 'Dancer', 'Storm', 'Blaze', 'Echo']
+
+# Componente REMARK: unele sunt cuvinte cheie de "probleme", altele de "alergare liberă" (vezi config.py)
+REMARK_POZITIE = ['Mid-Rls', 'Rls', 'Mid', 'Wide', 'MidW', 'RlsMid']
+REMARK_START = ['QAw', 'EvAw', 'SAw', 'VQAw', 'MsdBk', 'Awk', 'SlAw']
+REMARK_CURSA = ['Ld1', 'Ld3', 'Ld4', 'ALd', 'ChlFr2', 'ClrRn', 'RnOn', 'Crd1', 'Crd3', 'Bmp1', 'Bmp2', 'Blk2', 'Fcd-Ck1',
+                'StmbStt', 'BmpRnUp', 'Ck1', 'FcdW4', 'Styd', 'DrwClr', 'Wtd']
+MARJE = ['shd', 'hd', 'nk', '½', '¾', '1', '1¼', '1½', '2', '2¾', '3¼', '4', '5¾', '7']
+POZITII = ['1st', '2nd', '3rd', '4th', '5th', '6th']
+GRADE = ['A1', 'A2', 'A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'A9', 'A10', 'HP', 'OR', 'S1', 'S2']
+CONDITII = ['N', 'N', 'N', '-10', '-20', '10', '20', '30']
+COTE = ['1/1F', '6/4', '7/4F', '2/1', '5/2', '3/1', '7/2', '4/1', '5/1', '6/1', '8/1', '10/1']
+
+# Viteza medie aproximativă (m/s) din timpii reali: 462m ~ 28.0s, 480m ~ 29.1s, 500m ~ 30.3s
+VITEZA_MEDIE = 16.5
+TIMP_PRIMUL_PUNCT_PER_METRU = 0.055
+
+
+def _nume_ogar(index):
+    combinatii = len(PREFIXE_NUME) * len(SUFIXE_NUME)
+    nume = f"{PREFIXE_NUME[index % len(PREFIXE_NUME)]} {SUFIXE_NUME[(index // len(PREFIXE_NUME)) % len(SUFIXE_NUME)]}"
+    return nume if index < combinatii else f"{nume} {index // combinatii + 1}"
+
+
+def trasee_disponibile(piste=None):
+    """
+    Perechile (pistă CSV, distanță) din DISTANTE_PUNCTE_SIMULARE, opțional doar pentru pistele date.
+    """
+    return [(pista, distanta) for pista, distante in DISTANTE_PUNCTE_SIMULARE.items()
+            if piste is None or pista in piste for distanta in distante]
+
+
+def _remark(rng):
+    parti = [rng.choice(REMARK_POZITIE)]
+    if rng.random() < 0.5:
+        parti.append(rng.choice(REMARK_START))
+    parti.extend(rng.sample(REMARK_CURSA, rng.randint(1, 2)))
+    return ','.join(parti)
+
+
+def randuri_ogar(rng, index_ogar, trasee, data_referinta, numar_curse):
+    """
+    Rândurile unui ogar (cele mai recente primele), ca liste de valori în ordinea ANTET_CSV.
+    """
+    nume = _nume_ogar(index_ogar)
+    sex = rng.choice('BD')
+    nastere = data_referinta - timedelta(days=rng.randint(600, 2000))
+    varsta = (data_referinta - nastere).days // 365
+    pista_baza, distanta_baza = rng.choice(trasee)
+    valoare_timp = rng.gauss(0.0, 0.35)
+    valoare_sectional = rng.gauss(0.0, 0.12)
+    greutate = rng.uniform(26.0, 36.0)
+    grad = rng.randint(0, 9)
+
+    randuri = []
+    data_cursa = data_referinta - timedelta(days=rng.randint(0, 10))
+    for _ in range(numar_curse):
+        if rng.random() < 0.85:
+            pista, distanta = pista_baza, distanta_baza
+        else:
+            pista, distanta = rng.choice(trasee)
+        box = rng.randint(1, 6)
+        final = distanta / VITEZA_MEDIE + valoare_timp + rng.gauss(0.0, 0.25)
+        sectional = TIMP_PRIMUL_PUNCT_PER_METRU * DISTANTE_PUNCTE_SIMULARE[pista][distanta][0] + 3.0 + \
+            valoare_sectional + rng.gauss(0.0, 0.08)
+        curba = ''.join(str(min(6, max(1, box + rng.randint(-2, 2)))) for _ in range(4))
+        conditii = rng.choice(CONDITII)
+        ajustare_teren = 0.0 if conditii == 'N' else int(conditii) / 100.0
+        grad = min(9, max(0, grad + rng.choice((-1, 0, 0, 0, 1))))
+        fara_timp = rng.random() < 0.01
+
+        randuri.append([
+            nume,
+            sex,
+            nastere.strftime('%d/%m/%Y'),
+            str(varsta),
+            data_cursa.strftime('%d/%m/%Y'),
+            pista,
+            f"{distanta}m",
+            f"[{box}]",
+            '' if rng.random() < 0.05 else f"{sectional:.2f}",
+            curba,
+            rng.choice(POZITII),
+            rng.choice(MARJE),
+            _nume_ogar(rng.randrange(index_ogar + 50)),
+            _remark(rng),
+            '' if fara_timp else f"{final:.2f}",
+            conditii,
+            f"{greutate + rng.uniform(-0.3, 0.3):.1f}",
+            rng.choice(COTE),
+            GRADE[grad] if rng.random() < 0.95 else rng.choice(GRADE[10:]),
+            '' if fara_timp else f"{final + ajustare_teren:.2f}",
+        ])
+        data_cursa -= timedelta(days=rng.randint(4, 14))
+    return randuri
+
+
+def genereaza_istoric_sintetic(cale_fisier, numar_randuri, seed=None, piste=None, curse_per_ogar=(20, 60),
+                               data_referinta=None):
+    """
+    Scrie un CSV sintetic cu exact numar_randuri rânduri de date. Returnează numărul de ogari generați.
+    piste: abrevierile pistelor folosite (implicit toate din DISTANTE_PUNCTE_SIMULARE).
+    """
+    rng = random.Random(BENCHMARK_SEED if seed is None else seed)
+    trasee = trasee_disponibile(piste)
+    if not trasee:
+        raise ValueError(f"Nicio pistă cu distanțe definite în DISTANTE_PUNCTE_SIMULARE pentru {piste}.")
+    data_referinta = data_referinta or datetime(2025, 6, 15)
+
+    scrise = 0
+    index_ogar = 0
+    with open(cale_fisier, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, lineterminator='\r\n')
+        writer.writerow(ANTET_CSV)
+        while scrise < numar_randuri:
+            numar_curse = min(rng.randint(*curse_per_ogar), numar_randuri - scrise)
+            writer.writerows(randuri_ogar(rng, index_ogar, trasee, data_referinta, numar_curse))
+            scrise += numar_curse
+            index_ogar += 1
+    return index_ogar
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Utilizare: python generator_istoric_sintetic.py FISIER.csv NUMAR_RANDURI [SEED]")
+        sys.exit(2)
+    numar_ogari = genereaza_istoric_sintetic(sys.argv[1], int(sys.argv[2]), seed=int(sys.argv[3]) if len(sys.argv) > 3 else None)
+    print(f"{sys.argv[2]} rânduri, {numar_ogari} ogari -> {sys.argv[1]}")
@@ -0,0 +1,139 @@
+# --- Încărcare paralelă a istoricului pentru mai multe piste ---
+# Fiecare fișier din CSV_PER_ARENA este parsat într-un proces separat (ProcessPoolExecutor), apoi
+# rândurile sunt unite într-un singur istoric + HistoryIndex. Un ogar apare de obicei în fișierele mai
+# multor piste (cu aceleași curse), deci rândurile deja văzute într-un fișier anterior sunt eliminate.
+
+import os
+import time
+
+from config import CSV_PER_ARENA, INCARCARE_PARALELA_MAX_PROCESE
+from index_istoric import HistoryIndex, cheie_rand_istoric
+from predictor_logic import citeste_istoric_cu_stare
+
+# Istoricul unificat deja încărcat în acest proces:
+# tuplu (cale absolută, dimensiune, mtime_ns) per fișier -> (istoric, index, raport)
+_ISTORIC_UNIFICAT_IN_MEMORIE = {}
+
+
+def _incarca_fisier(cale_fisier, foloseste_cache):
+    """
+    Worker: parsează un fișier (cu cache-ul pe disc) și măsoară durata.
+    Definit la nivel de modul pentru a putea fi trimis proceselor din pool.
+    """
+    start = time.perf_counter()
+    erori = []
+    istoric, _ = citeste_istoric_cu_stare(cale_fisier, erori, foloseste_cache=foloseste_cache)
+    return istoric, erori, time.perf_counter() - start
+
+
+def _cheie_memorie(fisiere):
+    cheie = []
+    for cale in fisiere:
+        info = os.stat(cale)
+        cheie.append((os.path.abspath(cale), info.st_size, info.st_mtime_ns))
+    return tuple(cheie)
+
+
+def incarca_piste(arene=None, max_procese=None, foloseste_cache=None, director=None):
+    """
+    Încarcă istoricul pentru arenele date (implicit toate din CSV_PER_ARENA) și îl unifică.
+    Returnează (istoric_unificat, index, raport), unde raport conține, per fișier, numărul de rânduri,
+    durata parsării și avertismentele, plus avertismentele generale (ex. fișier lipsă) și numărul de
+    rânduri duplicate eliminate. Un fișier lipsă nu oprește încărcarea celorlalte.
+    """
+    start_total = time.perf_counter()
+    arene = list(CSV_PER_ARENA.keys()) if arene is None else list(arene)
+    if max_procese is None:
+        max_procese = INCARCARE_PARALELA_MAX_PROCESE
+
+    raport = {'fisiere': [], 'avertismente': [], 'randuri_duplicate': 0, 'durata_totala_s': 0.0}
+    de_incarcat = []
+    for arena in arene:
+        fisier = CSV_PER_ARENA.get(arena)
+        if fisier is None:
+            raport['avertismente'].append(f"Avertisment: Arena '{arena}' nu are fisier CSV asociat in CSV_PER_ARENA; arena este ignorata.")
+            continue
+        cale = os.path.join(director, fisier) if director else fisier
+        if not os.path.isfile(cale):
+            raport['avertismente'].append(f"Avertisment: Fisierul '{fisier}' pentru arena '{arena}' nu a fost gasit; arena este ignorata.")
+            continue
+        de_incarcat.append((arena, cale))
+
+    try:
+        cheie_memorie = _cheie_memorie([cale for _, cale in de_incarcat])
+    except OSError:
+        cheie_memorie = None
+    if foloseste_cache is not False and cheie_memorie in _ISTORIC_UNIFICAT_IN_MEMORIE:
+        istoric, index, raport_anterior = _ISTORIC_UNIFICAT_IN_MEMORIE[cheie_memorie]
+        raport_memorie = dict(raport_anterior, avertismente=raport['avertismente'] + raport_anterior['avertismente'],
+                              din_memorie=True, durata_totala_s=time.perf_counter() - start_total)
+        return istoric, index, raport_memorie
+
+    rezultate = _incarca_toate([cale for _, cale in de_incarcat], max_procese, foloseste_cache)
+
+    istoric = []
+    chei_vazute = set()
+    for (arena, cale), (randuri, erori, durata) in zip(de_incarcat, rezultate):
+        chei_fisier = set()
+        adaugate = 0
+        for rand in randuri:
+            cheie = cheie_rand_istoric(rand)
+            if cheie in chei_vazute:
+                raport['randuri_duplicate'] += 1
+                continue
+            chei_fisier.add(cheie)
+            istoric.append(rand)
+            adaugate += 1
+        chei_vazute.update(chei_fisier)
+        raport['fisiere'].append({
+            'arena': arena,
+            'fisier': cale,
+            'randuri': len(randuri),
+            'randuri_adaugate': adaugate,
+            'durata_s': durata,
+            'avertismente': erori,
+        })
+
+    index = HistoryIndex(istoric)
+    raport['durata_totala_s'] = time.perf_counter() - start_total
+
+    fatale = [eroare for f in raport['fisiere'] for eroare in f['avertismente'] if "FATALA" in eroare]
+    if cheie_memorie is not None and foloseste_cache is not False and not fatale:
+        _ISTORIC_UNIFICAT_IN_MEMORIE.clear()
+        _ISTORIC_UNIFICAT_IN_MEMORIE[cheie_memorie] = (istoric, index, dict(raport, avertismente=[]))
+    return istoric, index, raport
+
+
+def _incarca_toate(fisiere, max_procese, foloseste_cache):
+    """
+    Parsează fișierele în paralel; cu un singur fișier (sau max_procese=1) se lucrează direct în proces.
+    Dacă pool-ul de procese nu poate fi pornit, se revine la încărcarea secvențială.
+    """
+    if len(fisiere) <= 1 or max_procese == 1:
+        return [_incarca_fisier(cale, foloseste_cache) for cale in fisiere]
+
+    # concurrent.futures (cu multiprocessing și logging) se importă doar când chiar pornim un pool
+    from concurrent.futures import ProcessPoolExecutor
+    try:
+        with ProcessPoolExecutor(max_workers=min(len(fisiere), max_procese or os.cpu_count() or 1)) as executor:
+            return list(executor.map(_incarca_fisier, fisiere, [foloseste_cache] * len(fisiere)))
+    except (OSError, RuntimeError):
+        return [_incarca_fisier(cale, foloseste_cache) for cale in fisiere]
+
+
+def formateaza_raport_incarcare(raport):
+    """
+    Text scurt cu durata și numărul de rânduri per fișier, pentru afișare în log/consolă.
+    """
+    linii = []
+    for f in raport['fisiere']:
+        linii.append(f"{f['arena']:<10} {os.path.basename(f['fisier']):<16} {f['randuri']:>7} randuri "
+                     f"({f['randuri_adaugate']} noi)  {f['durata_s'] * 1000:8.1f} ms")
+    linii.extend(raport['avertismente'])
+    linii.append(f"Duplicate eliminate: {raport['randuri_duplicate']}; durata totala: {raport['durata_totala_s'] * 1000:.1f} ms")
+    return "\n".join(linii)
+
+
+if __name__ == '__main__':
+    _, _, raport_incarcare = incarca_piste()
+    print(formateaza_raport_incarcare(raport_incarcare))
@@ -0,0 +1,74 @@
+# --- Index pentru istoricul parsat ---
+# Construit o singură dată per fișier încărcat; înlocuiește scanările liniare ale întregului istoric
+# (o scanare per participant) cu căutări O(1) după nume ogar și după (ogar, pistă, distanță).
+
+from datetime import datetime
+
+
+def _cheie_data_descrescator(rand):
+    """
+    Cheie de sortare: cele mai recente curse primele, rândurile fără dată la final.
+    Sortarea este stabilă, deci la aceeași dată se păstrează ordinea din fișier.
+    """
+    data = rand.get('Data Cursei Parsata')
+    if isinstance(data, datetime):
+        return (0, -data.toordinal())
+    return (1, 0)
+
+
+def cheie_rand_istoric(rand):
+    """
+    Identitatea unei curse din istoric, folosită la eliminarea duplicatelor între fișiere
+    și la identificarea rândurilor în agregatele per ogar.
+    """
+    return (
+        rand.get('Nume Ogar'),
+        rand.get('Data Cursei Parsata') or rand.get('Data Cursei'),
+        rand.get('Pista'),
+        rand.get('Distanta Cursei (m)'),
+        rand.get('Numar Box (Trap)'),
+        rand.get('Timp Final (s)'),
+    )
+
+
+class HistoryIndex:
+    """
+    Index peste istoricul complet:
+      - nume ogar -> rândurile ogarului (în ordinea din fișier)
+      - (nume ogar, pistă, distanță) -> rândurile relevante, sortate după dată (cele mai recente primele)
+    """
+
+    def __init__(self, istoric=None):
+        self.istoric = []
+        self.per_ogar = {}
+        self.per_ogar_pista_distanta = {}
+        if istoric:
+            self.adauga(istoric)
+
+    def adauga(self, randuri):
+        """
+        Adaugă rânduri noi în index; doar listele (ogar, pistă, distanță) atinse sunt re-sortate.
+        """
+        chei_atinse = set()
+        for rand in randuri:
+            self.istoric.append(rand)
+            nume = rand.get('Nume Ogar')
+            self.per_ogar.setdefault(nume, []).append(rand)
+            cheie = (nume, rand.get('Pista'), rand.get('Distanta Cursei (m)'))
+            self.per_ogar_pista_distanta.setdefault(cheie, []).append(rand)
+            chei_atinse.add(cheie)
+
+        for cheie in chei_atinse:
+            self.per_ogar_pista_distanta[cheie].sort(key=_cheie_data_descrescator)
+
+    def randuri_ogar(self, nume_ogar):
+        return self.per_ogar.get(nume_ogar, [])
+
+    def randuri_relevante(self, nume_ogar, pista, distanta):
+        return self.per_ogar_pista_distanta.get((nume_ogar, pista, distanta), [])
+
+    def are_istoric_relevant(self, nume_ogar, pista, distanta):
+        return bool(self.per_ogar_pista_distanta.get((nume_ogar, pista, distanta)))
+
+    def __len__(self):
+        return len(self.istoric)
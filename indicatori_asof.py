@@ -0,0 +1,213 @@
+# --- Indicatori "as-of": starea unui ogar la o dată arbitrară ---
+# Pentru fiecare (ogar, pistă, distanță) rândurile datate se păstrează crescător după dată, împreună cu sume
+# prefix, numărători și minime cumulative (timp final, secțional, timpi per box, box de start, REMARK, CURBA).
+# O interogare "cum arăta ogarul înainte de data X" costă un bisect + câteva operații O(1), în loc de
+# recalcularea completă a calculeaza_indicatori_ogar pentru fiecare dată de referință.
+#
+# Se iau în calcul doar rândurile cu dată, strict anterioare datei de referință (rândurile fără dată nu pot fi
+# plasate în timp). Mediile sunt aceleași ca în calculeaza_indicatori_ogar, cu diferențe doar de rotunjire
+# în virgulă mobilă (sumele se fac în altă ordine).
+
+from bisect import bisect_left
+from datetime import datetime
+
+from config import TIMP_MAX_NECUNOSCUT
+from predictor_logic import (
+    flaguri_remark,
+    extrage_indicatori_curba,
+    determina_stil_curba,
+    determina_status_recenta,
+    calculeaza_indicatori_ogar,
+)
+from index_istoric import HistoryIndex
+
+BOXE_VALIDE = range(1, 7)
+
+
+def _cumulat(valori, functie=lambda a, b: a + b, initial=0):
+    """
+    Listă de lungime len(valori)+1: elementul k este agregatul primelor k valori.
+    """
+    rezultat = [initial]
+    for valoare in valori:
+        rezultat.append(functie(rezultat[-1], valoare))
+    return rezultat
+
+
+def _ultimul_index(conditii):
+    """
+    Elementul k = indexul ultimei poziții < k care îndeplinește condiția, sau -1.
+    """
+    rezultat = [-1]
+    for i, conditie in enumerate(conditii):
+        rezultat.append(i if conditie else rezultat[-1])
+    return rezultat
+
+
+class AgregatePrefix:
+    """
+    Agregate prefix pentru rândurile unui (ogar, pistă, distanță), sortate crescător după dată.
+    """
+
+    def __init__(self, randuri_crescator):
+        self.randuri = randuri_crescator
+        self.date = [r['Data Cursei Parsata'] for r in randuri_crescator]
+
+        timpi = [r.get('Timp Final (s)') for r in randuri_crescator]
+        timpi_validi = [t is not None and t > 0.0 for t in timpi]
+        self.suma_timp = _cumulat([t if v else 0.0 for t, v in zip(timpi, timpi_validi)], initial=0.0)
+        self.numar_timp = _cumulat([int(v) for v in timpi_validi])
+        self.min_timp = _cumulat([t if v else TIMP_MAX_NECUNOSCUT for t, v in zip(timpi, timpi_validi)], min,
+                                 initial=TIMP_MAX_NECUNOSCUT)
+
+        sectionale = [r.get('Timp Secțional 1 (s)') for r in randuri_crescator]
+        sectionale_valide = [s is not None and s > 0.0 for s in sectionale]
+        self.suma_sectional = _cumulat([s if v else 0.0 for s, v in zip(sectionale, sectionale_valide)], initial=0.0)
+        self.numar_sectional = _cumulat([int(v) for v in sectionale_valide])
+        self.min_sectional = _cumulat([s if v else TIMP_MAX_NECUNOSCUT for s, v in zip(sectionale, sectionale_valide)],
+                                      min, initial=TIMP_MAX_NECUNOSCUT)
+
+        boxe = [r.get('Numar Box (Trap)') for r in randuri_crescator]
+        boxe_valide = [isinstance(b, int) and 1 <= b <= 6 for b in boxe]
+        self.suma_box_start = _cumulat([b if v else 0 for b, v in zip(boxe, boxe_valide)])
+        self.numar_box_start = _cumulat([int(v) for v in boxe_valide])
+        self.suma_timp_box = {}
+        self.numar_timp_box = {}
+        for box in BOXE_VALIDE:
+            cu_box = [b == box and v for b, v in zip(boxe, timpi_validi)]
+            self.suma_timp_box[box] = _cumulat([t if c else 0.0 for t, c in zip(timpi, cu_box)], initial=0.0)
+            self.numar_timp_box[box] = _cumulat([int(c) for c in cu_box])
+
+        are_remark = [r.get('REMARK', '') is not None for r in randuri_crescator]
+        flaguri = [flaguri_remark(r) if a else (False, False) for r, a in zip(randuri_crescator, are_remark)]
+        self.numar_remark = _cumulat([int(a) for a in are_remark])
+        self.numar_probleme = _cumulat([int(p) for p, _ in flaguri])
+        self.numar_liber = _cumulat([int(liber) for _, liber in flaguri])
+
+        curbe = [extrage_indicatori_curba(r.get('CURBA', r.get('Curba', ''))) for r in randuri_crescator]
+        self.suma_media_curba = _cumulat([c[1] if c[1] is not None else 0.0 for c in curbe], initial=0.0)
+        self.numar_media_curba = _cumulat([int(c[1] is not None) for c in curbe])
+        self.suma_ultima_curba = _cumulat([c[2] if c[2] is not None else 0 for c in curbe])
+        self.numar_ultima_curba = _cumulat([int(c[2] is not None) for c in curbe])
+        self.suma_diferenta_curba = _cumulat([c[3] if c[3] is not None else 0 for c in curbe])
+        self.numar_diferenta_curba = _cumulat([int(c[3] is not None) for c in curbe])
+
+        self.ultim_cu_varsta = _ultimul_index([r.get('Varsta') is not None for r in randuri_crescator])
+        self.ultim_cu_sex = _ultimul_index([r.get('Sex') is not None and str(r.get('Sex')).strip() != ''
+                                            for r in randuri_crescator])
+
+    def numar_inainte_de(self, data):
+        """
+        Câte rânduri au data strict anterioară datei date (None = toate).
+        """
+        return len(self.date) if data is None else bisect_left(self.date, data)
+
+
+def _randuri_datate_crescator(randuri_descrescator):
+    # Lista din HistoryIndex este descrescătoare (stabilă); inversând-o, "primul rând cel mai recent"
+    # din calculeaza_indicatori_ogar devine ultimul rând din prefix.
+    return [r for r in reversed(randuri_descrescator) if isinstance(r.get('Data Cursei Parsata'), datetime)]
+
+
+class IndicatoriAsOf:
+    """
+    Interogări as-of peste un HistoryIndex. Agregatele fiecărei chei se construiesc la prima interogare.
+    indicatori_ogar(...) are aceeași semnătură ca IstoricColumnar.indicatori_ogar, deci obiectul poate fi dat
+    ca index_istoric în prezice_cursa_combinata (data cursei devine data de referință).
+    """
+
+    def __init__(self, index_istoric):
+        if not isinstance(index_istoric, HistoryIndex):
+            index_istoric = HistoryIndex(index_istoric)
+        self.index = index_istoric
+        self.istoric = index_istoric.istoric
+        self._agregate = {}
+        self._date_ogar = {}
+
+    def _agregate_pentru(self, nume_ogar, pista, distanta):
+        cheie = (nume_ogar, pista, distanta)
+        agregate = self._agregate.get(cheie)
+        if agregate is None:
+            agregate = AgregatePrefix(_randuri_datate_crescator(self.index.randuri_relevante(*cheie)))
+            self._agregate[cheie] = agregate
+        return agregate
+
+    def _are_istoric_inainte_de(self, nume_ogar, data):
+        date = self._date_ogar.get(nume_ogar)
+        if date is None:
+            date = sorted(r['Data Cursei Parsata'] for r in self.index.randuri_ogar(nume_ogar)
+                          if isinstance(r.get('Data Cursei Parsata'), datetime))
+            self._date_ogar[nume_ogar] = date
+        return bool(date) if data is None else bisect_left(date, data) > 0
+
+    def indicatori_ogar(self, nume_ogar, pista_cursa, distanta_cursa, box_curent, data_cursa_curenta):
+        """
+        Indicatorii ogarului calculați doar din cursele datate strict anterioare data_cursa_curenta
+        (None = toate cursele datate), în forma întoarsă de calculeaza_indicatori_ogar.
+        """
+        if not self._are_istoric_inainte_de(nume_ogar, data_cursa_curenta):
+            return calculeaza_indicatori_ogar([], pista_cursa, distanta_cursa, box_curent, data_cursa_curenta)
+
+        rezultat = calculeaza_indicatori_ogar([], pista_cursa, distanta_cursa, box_curent, data_cursa_curenta)
+        rezultat['Stil_Curba'] = determina_stil_curba(None)
+
+        a = self._agregate_pentru(nume_ogar, pista_cursa, distanta_cursa)
+        k = a.numar_inainte_de(data_cursa_curenta)
+        if k == 0:
+            return rezultat
+
+        if a.numar_remark[k]:
+            rezultat['Prob_Probleme'] = a.numar_probleme[k] / a.numar_remark[k]
+            rezultat['Prob_Liber'] = a.numar_liber[k] / a.numar_remark[k]
+        if a.numar_media_curba[k]:
+            rezultat['Media_Curba'] = a.suma_media_curba[k] / a.numar_media_curba[k]
+        if a.numar_ultima_curba[k]:
+            rezultat['Pozitie_Ultima_Curba'] = a.suma_ultima_curba[k] / a.numar_ultima_curba[k]
+        if a.numar_diferenta_curba[k]:
+            rezultat['Diferenta_Prima_Ultima_Curba'] = a.suma_diferenta_curba[k] / a.numar_diferenta_curba[k]
+        rezultat['Stil_Curba'] = determina_stil_curba(rezultat['Diferenta_Prima_Ultima_Curba'])
+
+        i_varsta = a.ultim_cu_varsta[k]
+        if i_varsta >= 0:
+            rezultat['Varsta'] = a.randuri[i_varsta]['Varsta']
+            rezultat['Are Istoric Varsta'] = True
+        i_sex = a.ultim_cu_sex[k]
+        if i_sex >= 0:
+            rezultat['Sex'] = str(a.randuri[i_sex]['Sex']).strip()
+            rezultat['Are Istoric Sex'] = True
+
+        ultimul_rand = a.randuri[k - 1]
+        rezultat['Are Istoric Recenta'] = True
+        grad = ultimul_rand.get('Grad Cursa')
+        if grad is not None and str(grad).strip() != '':
+            rezultat['Grad Istoric'] = str(grad).strip()
+            rezultat['Are Istoric Grad'] = True
+        status, zile = determina_status_recenta(a.date[k - 1], data_cursa_curenta)
+        rezultat['Recency Status'] = status
+        rezultat['Days Since Last Race'] = zile
+
+        if a.numar_timp[k]:
+            rezultat['Are Istoric Relevant General'] = True
+            rezultat['Cel_Mai_Bun_Timp'] = a.min_timp[k]
+            rezultat['Timp_Mediu'] = a.suma_timp[k] / a.numar_timp[k]
+
+        timpi_medii_per_box = {box: a.suma_timp_box[box][k] / a.numar_timp_box[box][k]
+                               for box in BOXE_VALIDE if a.numar_timp_box[box][k]}
+        if timpi_medii_per_box:
+            rezultat['Timpi_Medii_Per_Box'] = timpi_medii_per_box
+            rezultat['Are Istoric Timpi Per Box'] = True
+            if box_curent is not None and box_curent in timpi_medii_per_box:
+                rezultat['Are Istoric Relevant Box'] = True
+                rezultat['Timp_Mediu_Box_Specific'] = timpi_medii_per_box[box_curent]
+
+        if a.numar_sectional[k]:
+            rezultat['Are Istoric Relevant Sectional'] = True
+            rezultat['Are Istoric Relevant Sectional Avg'] = True
+            rezultat['Cel_Mai_Bun_Sectional'] = a.min_sectional[k]
+            rezultat['Timp_Mediu_Sectional'] = a.suma_sectional[k] / a.numar_sectional[k]
+
+        if a.numar_box_start[k]:
+            rezultat['Are Istoric Relevant Box Start'] = True
+            rezultat['Medie_Box_Start'] = a.suma_box_start[k] / a.numar_box_start[k]
+
+        return rezultat
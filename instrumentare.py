@@ -0,0 +1,201 @@
+# --- Instrumentare: timpi pe etape și contoare pentru fluxul de predicție ---
+# Măsurarea este activă doar în interiorul unui bloc `with masoara() as m:` și doar pe firul care l-a deschis.
+# În afara lui, cronometru()/cronometrat()/numara() se reduc la o căutare de atribut pe un threading.local,
+# deci instrumentarea lasă codul practic neschimbat ca performanță.
+#
+#   with masoara() as m:
+#       prezice_cursa_combinata(...)
+#   print(m.formateaza())            # defalcare pe etape (imbricate) + contoare
+#   m.exporta('profil.pstats')       # pstats (snakeviz, python -m pstats) sau 'profil.folded' (flamegraph.pl, speedscope)
+#
+# Etapele se imbrică după stiva de apeluri; timpul propriu al unei etape = timpul total minus etapele copil.
+
+import functools
+import marshal
+import threading
+import time
+from contextlib import nullcontext
+
+_local = threading.local()
+_FARA_MASURARE = nullcontext()
+
+
+class _Etapa:
+    __slots__ = ('masuratori', 'nume', 'start')
+
+    def __init__(self, masuratori, nume):
+        self.masuratori = masuratori
+        self.nume = nume
+
+    def __enter__(self):
+        self.masuratori._stiva.append(self.nume)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        durata = time.perf_counter() - self.start
+        masuratori = self.masuratori
+        cale = tuple(masuratori._stiva)
+        masuratori._stiva.pop()
+        intrare = masuratori.etape.get(cale)
+        if intrare is None:
+            intrare = masuratori.etape[cale] = [0.0, 0, 0.0]
+        intrare[0] += durata
+        intrare[1] += 1
+        if len(cale) > 1:
+            parinte = masuratori.etape.get(cale[:-1])
+            if parinte is None:
+                parinte = masuratori.etape[cale[:-1]] = [0.0, 0, 0.0]
+            parinte[2] += durata
+        return False
+
+
+class Masuratori:
+    """
+    Rezultatul unei rulări măsurate: etape[cale] = [timp_total_s, apeluri, timp_copii_s], unde cale este tuplul
+    numelor etapelor de la rădăcină; contoare[nume] = valoare.
+    """
+
+    def __init__(self):
+        self.etape = {}
+        self.contoare = {}
+        self.durata_s = 0.0
+        self._stiva = []
+
+    def etapa(self, nume):
+        return _Etapa(self, nume)
+
+    def ca_dict(self):
+        return {
+            'durata_s': self.durata_s,
+            'etape': [{'etapa': ' > '.join(cale), 'total_s': total, 'propriu_s': total - copii, 'apeluri': apeluri}
+                      for cale, (total, apeluri, copii) in self._etape_ordonate()],
+            'contoare': dict(self.contoare),
+        }
+
+    def _etape_ordonate(self):
+        # Arbore în ordine depth-first, copiii descrescător după timpul total
+        copii = {}
+        for cale in self.etape:
+            copii.setdefault(cale[:-1], []).append(cale)
+        rezultat = []
+
+        def viziteaza(parinte):
+            for cale in sorted(copii.get(parinte, []), key=lambda c: -self.etape[c][0]):
+                rezultat.append((cale, self.etape[cale]))
+                viziteaza(cale)
+        viziteaza(())
+        return rezultat
+
+    def formateaza(self):
+        linii = [f"--- Timpi pe etape (total {1000 * self.durata_s:.1f} ms) ---",
+                 f"{'Etapa':<44}{'Total ms':>10}{'Propriu ms':>12}{'Apeluri':>9}{'%':>7}"]
+        for cale, (total, apeluri, copii) in self._etape_ordonate():
+            procent = 100 * total / self.durata_s if self.durata_s else 0.0
+            eticheta = '  ' * (len(cale) - 1) + cale[-1]
+            linii.append(f"{eticheta:<44}{1000 * total:>10.2f}{1000 * (total - copii):>12.2f}{apeluri:>9}{procent:>6.1f}%")
+        if self.contoare:
+            linii.append("Contoare:")
+            for nume, valoare in sorted(self.contoare.items()):
+                linii.append(f"  {nume:<42}{valoare:>10}")
+        return "\n".join(linii)
+
+    def exporta_folded(self, cale_fisier):
+        """
+        Stive "pliate" (o linie 'a;b;c microsecunde_proprii'), formatul citit de flamegraph.pl și speedscope.
+        """
+        with open(cale_fisier, 'w', encoding='utf-8') as f:
+            for cale, (total, _, copii) in self.etape.items():
+                propriu_us = int(round(1e6 * max(total - copii, 0.0)))
+                if propriu_us:
+                    f.write(f"{';'.join(cale)} {propriu_us}\n")
+
+    def exporta_pstats(self, cale_fisier):
+        """
+        Fișier în formatul scris de cProfile (marshal al dicționarului de statistici), citibil cu pstats.Stats,
+        snakeviz etc. Fiecare etapă apare ca o "funcție" ('<instrumentare>', 0, nume_etapa).
+        """
+        statistici = {}
+        for cale, (total, apeluri, copii) in self.etape.items():
+            functie = ('<instrumentare>', 0, cale[-1])
+            cc, nc, tt, ct, apelanti = statistici.get(functie, (0, 0, 0.0, 0.0, {}))
+            statistici[functie] = (cc + apeluri, nc + apeluri, tt + total - copii, ct + total, apelanti)
+            if len(cale) > 1:
+                apelant = ('<instrumentare>', 0, cale[-2])
+                a_cc, a_nc, a_tt, a_ct = apelanti.get(apelant, (0, 0, 0.0, 0.0))
+                apelanti[apelant] = (a_cc + apeluri, a_nc + apeluri, a_tt + total - copii, a_ct + total)
+        with open(cale_fisier, 'wb') as f:
+            marshal.dump(statistici, f)
+
+    def exporta(self, cale_fisier):
+        """
+        Exportă după extensie: '.folded'/'.txt' = stive pliate, altfel pstats.
+        """
+        if cale_fisier.endswith(('.folded', '.txt')):
+            self.exporta_folded(cale_fisier)
+        else:
+            self.exporta_pstats(cale_fisier)
+
+
+class masoara:
+    """
+    Context care activează măsurarea pe firul curent și întoarce obiectul Masuratori al rulării.
+    Blocurile imbricate continuă măsurarea deja activă.
+    """
+
+    def __init__(self, nume='rulare'):
+        self.nume = nume
+        self.masuratori = None
+        self._anterioare = None
+
+    def __enter__(self):
+        self._anterioare = getattr(_local, 'masuratori', None)
+        self.masuratori = self._anterioare if self._anterioare is not None else Masuratori()
+        _local.masuratori = self.masuratori
+        self._etapa = self.masuratori.etapa(self.nume)
+        self._etapa.__enter__()
+        return self.masuratori
+
+    def __exit__(self, *exc):
+        self._etapa.__exit__(*exc)
+        if self._anterioare is None:
+            self.masuratori.durata_s = self.masuratori.etape[(self.nume,)][0]
+        _local.masuratori = self._anterioare
+        return False
+
+
+def masuratori_curente():
+    return getattr(_local, 'masuratori', None)
+
+
+def cronometru(nume):
+    """
+    Context care adaugă durata blocului la etapa `nume` (imbricată în etapa curentă).
+    """
+    masuratori = getattr(_local, 'masuratori', None)
+    return _FARA_MASURARE if masuratori is None else _Etapa(masuratori, nume)
+
+
+def cronometrat(nume):
+    """
+    Decorator: fiecare apel al funcției este cronometrat ca etapa `nume`.
+    """
+    def decorator(functie):
+        @functools.wraps(functie)
+        def invelis(*args, **kwargs):
+            masuratori = getattr(_local, 'masuratori', None)
+            if masuratori is None:
+                return functie(*args, **kwargs)
+            with _Etapa(masuratori, nume):
+                return functie(*args, **kwargs)
+        return invelis
+    return decorator
+
+
+def numara(nume, valoare=1):
+    """
+    Adaugă valoare la contorul `nume` al rulării curente.
+    """
+    masuratori = getattr(_local, 'masuratori', None)
+    if masuratori is not None:
+        masuratori.contoare[nume] = masuratori.contoare.get(nume, 0) + valoare
@@ -0,0 +1,249 @@
+# --- Backend columnar (NumPy) pentru istoricul parsat ---
+# Opțional: necesită numpy. Fiecare câmp numeric devine un array tipizat, iar câmpurile categoriale
+# (nume ogar, pistă, grad, sex) devin coduri întregi + listă de valori. Rândurile sunt grupate pe ogar
+# (cele mai recente curse primele), astfel încât indicatorii se calculează cu măști vectoriale pe o felie.
+
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # backend opțional
+    np = None
+
+from predictor_logic import (
+    flaguri_remark,
+    extrage_indicatori_curba,
+    determina_stil_curba,
+    determina_status_recenta,
+    calculeaza_indicatori_ogar,
+)
+
+# Valori folosite pentru „lipsă” în coloanele întregi
+LIPSA_INT = -1
+LIPSA_DATA = 0  # ordinal 0 nu corespunde niciunei date valide
+
+
+class Categorie:
+    """
+    Coloană categorială: coduri int32 + lista valorilor distincte.
+    Codul -1 = valoare lipsă (None sau șir gol).
+    """
+
+    def __init__(self, valori_randuri):
+        self.valori = []
+        self._cod_pentru = {}
+        coduri = []
+        for valoare in valori_randuri:
+            if valoare is None or valoare == '':
+                coduri.append(LIPSA_INT)
+                continue
+            cod = self._cod_pentru.get(valoare)
+            if cod is None:
+                cod = len(self.valori)
+                self._cod_pentru[valoare] = cod
+                self.valori.append(valoare)
+            coduri.append(cod)
+        self.coduri = np.array(coduri, dtype=np.int32)
+
+    def cod(self, valoare):
+        """
+        Codul valorii; -1 pentru lipsă, -2 pentru o valoare care nu apare în istoric.
+        """
+        if valoare is None or valoare == '':
+            return LIPSA_INT
+        return self._cod_pentru.get(valoare, -2)
+
+    def valoare(self, cod):
+        return self.valori[cod] if cod >= 0 else None
+
+    def reordoneaza(self, ordine):
+        self.coduri = self.coduri[ordine]
+
+    @property
+    def nbytes(self):
+        return self.coduri.nbytes
+
+
+def _float_sau_nan(valoare):
+    return float(valoare) if isinstance(valoare, (int, float)) else np.nan
+
+
+def _int_sau_lipsa(valoare):
+    return valoare if isinstance(valoare, int) else LIPSA_INT
+
+
+class IstoricColumnar:
+    """
+    Istoric stocat pe coloane. Se construiește din rândurile produse de loader (IstoricColumnar.din_randuri)
+    și oferă indicatori_ogar(...), cu aceeași formă a rezultatului ca și calculeaza_indicatori_ogar.
+    """
+
+    def __init__(self, randuri):
+        if np is None:
+            raise ImportError("Backend-ul columnar necesită pachetul 'numpy' (pip install numpy).")
+
+        n = len(randuri)
+        self.timp_final = np.empty(n, dtype=np.float64)
+        self.sectional = np.empty(n, dtype=np.float64)
+        self.varsta = np.empty(n, dtype=np.float64)
+        self.box = np.empty(n, dtype=np.int8)
+        self.pozitie = np.empty(n, dtype=np.int16)
+        self.distanta = np.empty(n, dtype=np.int32)
+        self.data = np.empty(n, dtype=np.int32)
+        self.remark_probleme = np.empty(n, dtype=np.bool_)
+        self.remark_liber = np.empty(n, dtype=np.bool_)
+        self.curba_media = np.empty(n, dtype=np.float64)
+        self.curba_ultima = np.empty(n, dtype=np.int8)
+        self.curba_diferenta = np.empty(n, dtype=np.int8)
+
+        for i, r in enumerate(randuri):
+            self.timp_final[i] = _float_sau_nan(r.get('Timp Final (s)'))
+            self.sectional[i] = _float_sau_nan(r.get('Timp Secțional 1 (s)'))
+            self.varsta[i] = _float_sau_nan(r.get('Varsta'))
+            box = r.get('Numar Box (Trap)')
+            self.box[i] = box if isinstance(box, int) and -128 <= box <= 127 else LIPSA_INT
+            self.pozitie[i] = _int_sau_lipsa(r.get('Pozitie Finala'))
+            self.distanta[i] = _int_sau_lipsa(r.get('Distanta Cursei (m)'))
+            data = r.get('Data Cursei Parsata')
+            self.data[i] = data.toordinal() if isinstance(data, datetime) else LIPSA_DATA
+
+            self.remark_probleme[i], self.remark_liber[i] = flaguri_remark(r)
+
+            _, media, poz_ultima, diff = extrage_indicatori_curba(r.get('CURBA', r.get('Curba', '')))
+            self.curba_media[i] = media if media is not None else np.nan
+            self.curba_ultima[i] = poz_ultima if poz_ultima is not None else LIPSA_INT
+            self.curba_diferenta[i] = diff if diff is not None else -128
+
+        self.nume = Categorie([r.get('Nume Ogar') for r in randuri])
+        self.pista = Categorie([r.get('Pista') for r in randuri])
+        self.grad = Categorie([(r.get('Grad Cursa') or '').strip() or None for r in randuri])
+        self.sex = Categorie([str(r.get('Sex')).strip() if r.get('Sex') is not None else None for r in randuri])
+
+        # Grupare pe ogar, cele mai recente curse primele (rândurile fără dată la final)
+        ordine = np.lexsort((np.arange(n), -self.data.astype(np.int64), self.nume.coduri))
+        for nume_coloana in ('timp_final', 'sectional', 'varsta', 'box', 'pozitie', 'distanta', 'data',
+                             'remark_probleme', 'remark_liber', 'curba_media', 'curba_ultima', 'curba_diferenta'):
+            setattr(self, nume_coloana, getattr(self, nume_coloana)[ordine])
+        for categorie in (self.nume, self.pista, self.grad, self.sex):
+            categorie.reordoneaza(ordine)
+
+        coduri_nume = self.nume.coduri
+        limite = np.searchsorted(coduri_nume, np.arange(len(self.nume.valori) + 1))
+        self._interval_ogar = {cod: (int(limite[cod]), int(limite[cod + 1])) for cod in range(len(self.nume.valori))}
+
+    @classmethod
+    def din_randuri(cls, randuri):
+        return cls(randuri)
+
+    def __len__(self):
+        return len(self.timp_final)
+
+    def memorie_octeti(self):
+        """
+        Memoria ocupată de coloane (fără listele de valori categoriale).
+        """
+        coloane = (self.timp_final, self.sectional, self.varsta, self.box, self.pozitie, self.distanta, self.data,
+                   self.remark_probleme, self.remark_liber, self.curba_media, self.curba_ultima, self.curba_diferenta)
+        return sum(c.nbytes for c in coloane) + sum(c.nbytes for c in (self.nume, self.pista, self.grad, self.sex))
+
+    def indicatori_ogar(self, nume_ogar, pista_cursa, distanta_cursa, box_curent, data_cursa_curenta):
+        """
+        Echivalentul columnar al calculeaza_indicatori_ogar pentru un ogar din istoric.
+        """
+        cod_ogar = self.nume.cod(nume_ogar)
+        if cod_ogar not in self._interval_ogar:
+            return calculeaza_indicatori_ogar([], pista_cursa, distanta_cursa, box_curent, data_cursa_curenta)
+
+        start, sfarsit = self._interval_ogar[cod_ogar]
+        cod_distanta = distanta_cursa if isinstance(distanta_cursa, int) else LIPSA_INT
+        masca = (self.pista.coduri[start:sfarsit] == self.pista.cod(pista_cursa)) & \
+                (self.distanta[start:sfarsit] == cod_distanta)
+        idx = np.flatnonzero(masca) + start
+
+        rezultat = calculeaza_indicatori_ogar([], pista_cursa, distanta_cursa, box_curent, data_cursa_curenta)
+        rezultat['Stil_Curba'] = determina_stil_curba(None)
+        if idx.size == 0:
+            return rezultat
+
+        # REMARK (fiecare rând relevant are REMARK, eventual gol)
+        rezultat['Prob_Probleme'] = float(self.remark_probleme[idx].mean())
+        rezultat['Prob_Liber'] = float(self.remark_liber[idx].mean())
+
+        # CURBA
+        medii = self.curba_media[idx]
+        medii = medii[~np.isnan(medii)]
+        ultime = self.curba_ultima[idx]
+        ultime = ultime[ultime != LIPSA_INT]
+        diferente = self.curba_diferenta[idx]
+        diferente = diferente[diferente != -128]
+        rezultat['Media_Curba'] = float(medii.mean()) if medii.size else None
+        rezultat['Pozitie_Ultima_Curba'] = float(ultime.mean()) if ultime.size else None
+        rezultat['Diferenta_Prima_Ultima_Curba'] = float(diferente.mean()) if diferente.size else None
+        rezultat['Stil_Curba'] = determina_stil_curba(rezultat['Diferenta_Prima_Ultima_Curba'])
+
+        # Vârstă / sex: primul rând relevant (cel mai recent) care le are
+        varste = self.varsta[idx]
+        cu_varsta = np.flatnonzero(~np.isnan(varste))
+        if cu_varsta.size:
+            rezultat['Varsta'] = float(varste[cu_varsta[0]])
+            rezultat['Are Istoric Varsta'] = True
+        coduri_sex = self.sex.coduri[idx]
+        cu_sex = np.flatnonzero(coduri_sex >= 0)
+        if cu_sex.size:
+            rezultat['Sex'] = self.sex.valoare(int(coduri_sex[cu_sex[0]]))
+            rezultat['Are Istoric Sex'] = True
+
+        # Grad și recență: din cea mai recentă cursă datată
+        date = self.data[idx]
+        cu_data = np.flatnonzero(date != LIPSA_DATA)
+        ultima_data = None
+        if cu_data.size:
+            rezultat['Are Istoric Recenta'] = True
+            i_ultim = idx[cu_data[0]]
+            ultima_data = datetime.fromordinal(int(self.data[i_ultim]))
+            cod_grad = int(self.grad.coduri[i_ultim])
+            if cod_grad >= 0:
+                rezultat['Grad Istoric'] = self.grad.valoare(cod_grad)
+                rezultat['Are Istoric Grad'] = True
+        status, zile = determina_status_recenta(ultima_data, data_cursa_curenta)
+        rezultat['Recency Status'] = status
+        rezultat['Days Since Last Race'] = zile
+
+        # Timpi finali
+        timpi = self.timp_final[idx]
+        valid_timp = timpi > 0.0
+        if valid_timp.any():
+            timpi_validi = timpi[valid_timp]
+            rezultat['Are Istoric Relevant General'] = True
+            rezultat['Cel_Mai_Bun_Timp'] = float(timpi_validi.min())
+            rezultat['Timp_Mediu'] = float(timpi_validi.mean())
+
+        # Timpi medii per box
+        boxe = self.box[idx]
+        box_valid = (boxe >= 1) & (boxe <= 6)
+        masca_box_timp = box_valid & valid_timp
+        if masca_box_timp.any():
+            sume = np.bincount(boxe[masca_box_timp], weights=timpi[masca_box_timp], minlength=7)
+            numar = np.bincount(boxe[masca_box_timp], minlength=7)
+            timpi_medii_per_box = {b: float(sume[b] / numar[b]) for b in range(1, 7) if numar[b]}
+            rezultat['Timpi_Medii_Per_Box'] = timpi_medii_per_box
+            rezultat['Are Istoric Timpi Per Box'] = True
+            if box_curent is not None and box_curent in timpi_medii_per_box:
+                rezultat['Are Istoric Relevant Box'] = True
+                rezultat['Timp_Mediu_Box_Specific'] = timpi_medii_per_box[box_curent]
+
+        # Secționale
+        sectionale = self.sectional[idx]
+        sectionale = sectionale[sectionale > 0.0]
+        if sectionale.size:
+            rezultat['Are Istoric Relevant Sectional'] = True
+            rezultat['Are Istoric Relevant Sectional Avg'] = True
+            rezultat['Cel_Mai_Bun_Sectional'] = float(sectionale.min())
+            rezultat['Timp_Mediu_Sectional'] = float(sectionale.mean())
+
+        # Poziția medie de start
+        if box_valid.any():
+            rezultat['Are Istoric Relevant Box Start'] = True
+            rezultat['Medie_Box_Start'] = float(boxe[box_valid].mean())
+
+        return rezultat
@@ -0,0 +1,343 @@
+# --- Backend SQLite (opțional) pentru istoricul parsat ---
+# Pentru istoric de mulți ani și mai multe piste: rândurile parsate sunt păstrate într-o bază SQLite (fișier sau
+# ':memory:'), cu indexuri pe (nume), (nume, pistă, distanță) și (pistă, distanță, dată). Filtrările făcute altfel
+# în Python (ogarul, Pista+Distanta, timp final valid > 0) devin interogări pe index, iar agregatele (timp minim/
+# mediu, secționale, medii per box, REMARK, CURBA) sunt calculate în SQL. indicatori_ogar(...) are aceeași formă
+# a rezultatului ca și calculeaza_indicatori_ogar, deci backend-ul se dă direct predicției (index_istoric=...).
+#
+# Fișierele de istoric se încarcă o singură dată: baza ține semnătura fiecărui fișier și re-inserează rândurile
+# lui doar când fișierul s-a modificat. Inserarea este în loturi (executemany), într-o singură tranzacție.
+#
+#   istoric = IstoricSqlite('istoric.sqlite3')
+#   istoric.incarca_fisier('Towcester.csv', erori)
+#   prezice_cursa_combinata(None, detalii_cursa, index_istoric=istoric)
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+from config import SQLITE_LOT_INSERARE
+from cache_istoric import semnatura_fisier
+from rand_istoric import RandIstoric, interneaza
+from predictor_logic import (
+    flaguri_remark,
+    extrage_indicatori_curba,
+    determina_stil_curba,
+    determina_status_recenta,
+    calculeaza_indicatori_ogar,
+    citeste_si_parseaza_istoric,
+)
+
+# Se incrementează la orice modificare a schemei; bazele vechi sunt recreate (PRAGMA user_version).
+VERSIUNE_SCHEMA = 1
+
+SCHEMA = """
+CREATE TABLE fisiere (
+    id INTEGER PRIMARY KEY,
+    cale TEXT UNIQUE NOT NULL,
+    semnatura TEXT NOT NULL,
+    avertismente TEXT NOT NULL,
+    numar_randuri INTEGER NOT NULL
+);
+CREATE TABLE curse (
+    id INTEGER PRIMARY KEY,
+    fisier_id INTEGER,
+    nume TEXT NOT NULL,
+    pista TEXT,
+    distanta INTEGER,
+    data INTEGER,
+    data_text TEXT,
+    grad TEXT,
+    box INTEGER,
+    sectional REAL,
+    pozitie INTEGER,
+    final_text TEXT,
+    timp_final REAL,
+    varsta,
+    sex TEXT,
+    remark TEXT,
+    curba TEXT,
+    remark_probleme INTEGER NOT NULL,
+    remark_liber INTEGER NOT NULL,
+    curba_media REAL,
+    curba_ultima INTEGER,
+    curba_diferenta INTEGER
+);
+"""
+# Într-o tabelă goală, indexurile se creează după inserarea în masă (mult mai repede decât actualizate rând cu rând)
+INDEXURI = {
+    'idx_curse_nume': 'curse (nume)',
+    'idx_curse_nume_pista_distanta': 'curse (nume, pista, distanta)',
+    'idx_curse_pista_distanta_data': 'curse (pista, distanta, data)',
+    'idx_curse_fisier': 'curse (fisier_id)',
+}
+
+COLOANE_INSERARE = ('fisier_id', 'nume', 'pista', 'distanta', 'data', 'data_text', 'grad', 'box', 'sectional', 'pozitie',
+                    'final_text', 'timp_final', 'varsta', 'sex', 'remark', 'curba', 'remark_probleme', 'remark_liber',
+                    'curba_media', 'curba_ultima', 'curba_diferenta')
+SQL_INSERARE = f"INSERT INTO curse ({', '.join(COLOANE_INSERARE)}) VALUES ({', '.join('?' * len(COLOANE_INSERARE))})"
+
+# Rândurile relevante în ordinea din HistoryIndex: cele mai recente primele, cele fără dată la final
+ORDINE_RELEVANTE = "ORDER BY data IS NULL, data DESC, id"
+FILTRU_RELEVANTE = "nume = ? AND pista IS ? AND distanta IS ?"
+
+SQL_AGREGATE = f"""
+SELECT COUNT(*), SUM(remark_probleme), SUM(remark_liber),
+       AVG(curba_media), AVG(curba_ultima), AVG(curba_diferenta), MAX(data),
+       MIN(CASE WHEN timp_final > 0 THEN timp_final END), SUM(CASE WHEN timp_final > 0 THEN timp_final END),
+       COUNT(CASE WHEN timp_final > 0 THEN 1 END),
+       MIN(CASE WHEN sectional > 0 THEN sectional END), SUM(CASE WHEN sectional > 0 THEN sectional END),
+       COUNT(CASE WHEN sectional > 0 THEN 1 END),
+       SUM(CASE WHEN box BETWEEN 1 AND 6 THEN box END), COUNT(CASE WHEN box BETWEEN 1 AND 6 THEN 1 END)
+FROM curse WHERE {FILTRU_RELEVANTE}
+"""
+SQL_TIMPI_PER_BOX = f"""
+SELECT box, SUM(timp_final), COUNT(*) FROM curse
+WHERE {FILTRU_RELEVANTE} AND box BETWEEN 1 AND 6 AND timp_final > 0
+GROUP BY box ORDER BY box
+"""
+SQL_PRIMELE_VALORI = f"""
+SELECT (SELECT varsta FROM curse WHERE {FILTRU_RELEVANTE} AND varsta IS NOT NULL {ORDINE_RELEVANTE} LIMIT 1),
+       (SELECT sex FROM curse WHERE {FILTRU_RELEVANTE} AND sex IS NOT NULL AND TRIM(sex) != '' {ORDINE_RELEVANTE} LIMIT 1),
+       (SELECT grad FROM curse WHERE {FILTRU_RELEVANTE} AND data IS NOT NULL {ORDINE_RELEVANTE} LIMIT 1)
+"""
+COLOANE_RAND = ('data_text', 'pista', 'distanta', 'grad', 'box', 'sectional', 'pozitie', 'final_text', 'varsta', 'sex',
+                'nume', 'remark', 'curba', 'timp_final', 'data', 'remark_probleme', 'remark_liber')
+SQL_RANDURI = f"SELECT {', '.join(COLOANE_RAND)} FROM curse"
+
+
+@lru_cache(maxsize=16384)
+def _indicatori_curba(curba):
+    # Aceleași câteva mii de șiruri CURBA se repetă în tot istoricul
+    return extrage_indicatori_curba(curba)[1:]
+
+
+def _valori_inserare(rand, fisier_id):
+    media, poz_ultima, diferenta = _indicatori_curba(rand.get('CURBA', rand.get('Curba', '')))
+    are_probleme, alergare_libera = flaguri_remark(rand)
+    data = rand.get('Data Cursei Parsata')
+    return (fisier_id, rand.get('Nume Ogar'), rand.get('Pista'), rand.get('Distanta Cursei (m)'),
+            data.toordinal() if isinstance(data, datetime) else None, rand.get('Data Cursei'), rand.get('Grad Cursa'),
+            rand.get('Numar Box (Trap)'), rand.get('Timp Secțional 1 (s)'), rand.get('Pozitie Finala'), rand.get('FINAL'),
+            rand.get('Timp Final (s)'), rand.get('Varsta'), rand.get('Sex'), rand.get('REMARK'), rand.get('CURBA'),
+            int(are_probleme), int(alergare_libera), media, poz_ultima, diferenta)
+
+
+def _rand_din_valori(valori):
+    # Rândul în forma produsă de parser (aceleași chei și tipuri)
+    (data_text, pista, distanta, grad, box, sectional, pozitie, final_text, varsta, sex, nume, remark, curba,
+     timp_final, data, remark_probleme, remark_liber) = valori
+    return RandIstoric(interneaza(data_text), interneaza(pista), distanta, interneaza(grad), box, sectional, pozitie,
+                       final_text, varsta, interneaza(sex), interneaza(nume), remark, interneaza(curba), timp_final,
+                       datetime.fromordinal(data) if data is not None else None, bool(remark_probleme),
+                       bool(remark_liber))
+
+
+class IstoricSqlite:
+    """
+    Istoric stocat în SQLite. Se construiește din rânduri (IstoricSqlite.din_randuri) sau se încarcă din fișiere
+    (incarca_fisier) și oferă indicatori_ogar(...), plus randuri_ogar / randuri_relevante / are_istoric_relevant
+    pentru codul care lucrează cu rânduri (backtest, testarea ponderilor).
+    """
+
+    def __init__(self, cale_db=':memory:'):
+        self.cale_db = cale_db
+        # Predicția din GUI rulează pe un fir separat: o singură conexiune, protejată de un lock
+        self._conexiune = sqlite3.connect(cale_db, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            if cale_db != ':memory:':
+                self._conexiune.execute("PRAGMA journal_mode=WAL")  # cititori din alte procese în timpul scrierii
+            self._conexiune.execute("PRAGMA synchronous=NORMAL")
+            if self._conexiune.execute("PRAGMA user_version").fetchone()[0] != VERSIUNE_SCHEMA:
+                self._recreeaza_schema()
+
+    def _recreeaza_schema(self):
+        with self._conexiune:
+            self._conexiune.execute("DROP TABLE IF EXISTS curse")
+            self._conexiune.execute("DROP TABLE IF EXISTS fisiere")
+            self._conexiune.executescript(SCHEMA)
+            self._creeaza_indexuri()
+            self._conexiune.execute(f"PRAGMA user_version = {VERSIUNE_SCHEMA}")
+
+    def _creeaza_indexuri(self):
+        for nume, definitie in INDEXURI.items():
+            self._conexiune.execute(f"CREATE INDEX IF NOT EXISTS {nume} ON {definitie}")
+
+    @classmethod
+    def din_randuri(cls, randuri, cale_db=':memory:'):
+        istoric = cls(cale_db)
+        istoric.adauga_randuri(randuri)
+        return istoric
+
+    def inchide(self):
+        with self._lock:
+            self._conexiune.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conexiune.execute("SELECT COUNT(*) FROM curse").fetchone()[0]
+
+    def adauga_randuri(self, randuri, fisier_id=None):
+        """
+        Inserează rândurile parsate în loturi de SQLITE_LOT_INSERARE, într-o singură tranzacție.
+        Returnează numărul de rânduri inserate.
+        """
+        inserate = 0
+        lot = []
+        with self._lock, self._conexiune:
+            tabela_goala = self._conexiune.execute("SELECT 1 FROM curse LIMIT 1").fetchone() is None
+            if tabela_goala:
+                for nume in INDEXURI:
+                    self._conexiune.execute(f"DROP INDEX IF EXISTS {nume}")
+            for rand in randuri:
+                lot.append(_valori_inserare(rand, fisier_id))
+                if len(lot) >= SQLITE_LOT_INSERARE:
+                    self._conexiune.executemany(SQL_INSERARE, lot)
+                    inserate += len(lot)
+                    lot = []
+            if lot:
+                self._conexiune.executemany(SQL_INSERARE, lot)
+                inserate += len(lot)
+            if tabela_goala:
+                self._creeaza_indexuri()
+        return inserate
+
+    def incarca_fisier(self, cale_fisier, lista_erori, foloseste_cache=None):
+        """
+        Aduce în bază rândurile fișierului de istoric (CSV/.xlsx, prin cache-ul obișnuit). Dacă baza are deja
+        fișierul cu aceeași semnătură (cale, dimensiune, mtime, hash, versiunea rândurilor), nu se parsează nimic;
+        altfel rândurile vechi ale fișierului sunt înlocuite. Returnează True dacă fișierul a fost (re)încărcat.
+        """
+        try:
+            semnatura = semnatura_fisier(cale_fisier)
+        except OSError:
+            lista_erori.append(f"Eroare FATALA: Fisierul '{os.path.basename(cale_fisier)}' nu a fost gasit la calea specificata.")
+            return False
+        text_semnatura = json.dumps(semnatura, sort_keys=True)
+
+        with self._lock:
+            intrare = self._conexiune.execute("SELECT id, semnatura, avertismente FROM fisiere WHERE cale = ?",
+                                              (semnatura['cale'],)).fetchone()
+        if intrare is not None and intrare[1] == text_semnatura:
+            lista_erori.extend(json.loads(intrare[2]))
+            return False
+
+        erori = []
+        istoric = citeste_si_parseaza_istoric(cale_fisier, erori, foloseste_cache=foloseste_cache)
+        lista_erori.extend(erori)
+        if [eroare for eroare in erori if "FATALA" in eroare]:
+            return False
+
+        with self._lock, self._conexiune:
+            if intrare is not None:
+                self._conexiune.execute("DELETE FROM curse WHERE fisier_id = ?", (intrare[0],))
+                self._conexiune.execute("DELETE FROM fisiere WHERE id = ?", (intrare[0],))
+            fisier_id = self._conexiune.execute(
+                "INSERT INTO fisiere (cale, semnatura, avertismente, numar_randuri) VALUES (?, ?, ?, ?)",
+                (semnatura['cale'], text_semnatura, json.dumps(erori, ensure_ascii=False), len(istoric))).lastrowid
+            self.adauga_randuri(istoric, fisier_id)
+        return True
+
+    def _randuri(self, conditie, parametri, ordine):
+        with self._lock:
+            return [_rand_din_valori(valori) for valori in
+                    self._conexiune.execute(f"{SQL_RANDURI} WHERE {conditie} {ordine}", parametri)]
+
+    def randuri_ogar(self, nume_ogar):
+        return self._randuri("nume = ?", (nume_ogar,), "ORDER BY id")
+
+    def randuri_relevante(self, nume_ogar, pista, distanta):
+        return self._randuri(FILTRU_RELEVANTE, (nume_ogar, pista, distanta), ORDINE_RELEVANTE)
+
+    def are_istoric_relevant(self, nume_ogar, pista, distanta):
+        with self._lock:
+            return self._conexiune.execute(f"SELECT 1 FROM curse WHERE {FILTRU_RELEVANTE} LIMIT 1",
+                                           (nume_ogar, pista, distanta)).fetchone() is not None
+
+    def indicatori_ogar(self, nume_ogar, pista_cursa, distanta_cursa, box_curent, data_cursa_curenta):
+        """
+        Echivalentul SQL al calculeaza_indicatori_ogar pentru un ogar din istoric.
+        """
+        parametri = (nume_ogar, pista_cursa, distanta_cursa)
+        with self._lock:
+            if self._conexiune.execute("SELECT 1 FROM curse WHERE nume = ? LIMIT 1", (nume_ogar,)).fetchone() is None:
+                return calculeaza_indicatori_ogar([], pista_cursa, distanta_cursa, box_curent, data_cursa_curenta)
+            (numar, probleme, liber, media_curba, ultima_curba, diferenta_curba, ultima_data, timp_minim, suma_timpi,
+             numar_timpi, sectional_minim, suma_sectionale, numar_sectionale, suma_boxe,
+             numar_boxe) = self._conexiune.execute(SQL_AGREGATE, parametri).fetchone()
+            if numar:
+                timpi_per_box = self._conexiune.execute(SQL_TIMPI_PER_BOX, parametri).fetchall()
+                varsta, sex, grad = self._conexiune.execute(SQL_PRIMELE_VALORI, parametri * 3).fetchone()
+
+        rezultat = calculeaza_indicatori_ogar([], pista_cursa, distanta_cursa, box_curent, data_cursa_curenta)
+        rezultat['Stil_Curba'] = determina_stil_curba(None)
+        if not numar:
+            return rezultat
+
+        rezultat['Prob_Probleme'] = probleme / numar
+        rezultat['Prob_Liber'] = liber / numar
+        rezultat['Media_Curba'] = media_curba
+        rezultat['Pozitie_Ultima_Curba'] = ultima_curba
+        rezultat['Diferenta_Prima_Ultima_Curba'] = diferenta_curba
+        rezultat['Stil_Curba'] = determina_stil_curba(diferenta_curba)
+
+        if varsta is not None:
+            rezultat['Varsta'] = varsta
+            rezultat['Are Istoric Varsta'] = True
+        if sex is not None:
+            rezultat['Sex'] = sex.strip()
+            rezultat['Are Istoric Sex'] = True
+
+        data_ultima = None
+        if ultima_data is not None:
+            rezultat['Are Istoric Recenta'] = True
+            data_ultima = datetime.fromordinal(ultima_data)
+            if grad is not None and grad.strip() != '':
+                rezultat['Grad Istoric'] = grad.strip()
+                rezultat['Are Istoric Grad'] = True
+        rezultat['Recency Status'], rezultat['Days Since Last Race'] = determina_status_recenta(data_ultima, data_cursa_curenta)
+
+        if numar_timpi:
+            rezultat['Are Istoric Relevant General'] = True
+            rezultat['Cel_Mai_Bun_Timp'] = timp_minim
+            rezultat['Timp_Mediu'] = suma_timpi / numar_timpi
+
+        if timpi_per_box:
+            timpi_medii_per_box = {box: suma / numar_box for box, suma, numar_box in timpi_per_box}
+            rezultat['Timpi_Medii_Per_Box'] = timpi_medii_per_box
+            rezultat['Are Istoric Timpi Per Box'] = True
+            if box_curent is not None and box_curent in timpi_medii_per_box:
+                rezultat['Are Istoric Relevant Box'] = True
+                rezultat['Timp_Mediu_Box_Specific'] = timpi_medii_per_box[box_curent]
+
+        if numar_sectionale:
+            rezultat['Are Istoric Relevant Sectional'] = True
+            rezultat['Are Istoric Relevant Sectional Avg'] = True
+            rezultat['Cel_Mai_Bun_Sectional'] = sectional_minim
+            rezultat['Timp_Mediu_Sectional'] = suma_sectionale / numar_sectionale
+
+        if numar_boxe:
+            rezultat['Are Istoric Relevant Box Start'] = True
+            rezultat['Medie_Box_Start'] = suma_boxe / numar_boxe
+
+        return rezultat
+
+
+_ISTORICE_DESCHISE = {}
+
+
+def deschide_istoric_sqlite(cale_db):
+    """
+    Conexiunea la baza dată, refolosită în proces (':memory:' creează de fiecare dată o bază nouă).
+    """
+    if cale_db == ':memory:':
+        return IstoricSqlite(cale_db)
+    cale_absoluta = os.path.abspath(cale_db)
+    istoric = _ISTORICE_DESCHISE.get(cale_absoluta)
+    if istoric is None:
+        istoric = _ISTORICE_DESCHISE[cale_absoluta] = IstoricSqlite(cale_absoluta)
+    return istoric
@@ -0,0 +1,241 @@
+# --- Interfață în linie de comandă (fără tkinter) ---
+# Predicție și simulare pentru o cursă (pistă, distanță, grad, dată, boxe) sau pentru un card întreg,
+# cu rezultatul scris pe stdout în JSON sau CSV. Gândită pentru cron și pipeline-uri shell:
+#
+#   python predictor_cli.py --pista Towcester --distanta 500 --grad A3 --data 03/05/2024 \
+#       --box 1 "Thornfield Love" --box 2 "Julies Own" --format csv
+#   python predictor_cli.py --card card_seara.json --istoric Towcester.csv > predictii.json
+#   python predictor_cli.py --card card_seara.json --monte-carlo 50000 --format csv   (probabilități câștig/plasare/lider)
+#
+# Codul de ieșire: 0 = cel puțin un timp prezis, 1 = nicio predicție sau istoric neîncărcat (erorile sunt pe stderr),
+# 2 = argumente invalide.
+
+import argparse
+import csv
+import json
+import sys
+from contextlib import nullcontext
+from datetime import date
+
+from config import TIMP_MAX_NECUNOSCUT, SIMULARE_MC_NUMAR_CURSE
+from predictor_logic import calculeaza_simulare_cursa
+from card_curse import citeste_card_curse, normalizeaza_curse, prezice_card_curse
+from instrumentare import masoara
+from diagnostice import configureaza_logging
+
+# Coloanele ieșirii CSV (un rând per ogar și cursă)
+COLOANE_CSV = ('CURSA', 'PISTA', 'DISTANTA', 'GRAD', 'DATA', 'LOC', 'BOXA', 'NUME', 'TIMP_PREZIS',
+               'CEL_MAI_BUN_TIMP', 'TIMP_MEDIU', 'TIMP_MEDIU_BOX', 'CEL_MAI_BUN_SECTIONAL', 'TIMP_MEDIU_SECTIONAL',
+               'STIL_CURBA', 'ZILE_DE_LA_ULTIMA_CURSA', 'LOCURI_SIMULARE')
+# Coloanele adăugate cu --monte-carlo
+COLOANE_CSV_MONTE_CARLO = ('PROB_CASTIG', 'PROB_PLASAT', 'PROB_LIDER')
+
+
+def _timp(valoare):
+    return valoare if isinstance(valoare, (int, float)) and valoare < TIMP_MAX_NECUNOSCUT else None
+
+
+def predictie_serializabila(predictie_sortata):
+    """
+    Predicția (lista de indicatori întoarsă de prezice_cursa_combinata) redusă la câmpurile afișate în GUI,
+    cu timpii necunoscuți ca None.
+    """
+    return [{
+        'loc': loc,
+        'box': rez.get('Box Nou'),
+        'nume': rez.get('Nume Ogar'),
+        'timp_prezis': _timp(rez.get('Timp_Prezis_Combinat')),
+        'cel_mai_bun_timp': _timp(rez.get('Cel_Mai_Bun_Timp')),
+        'timp_mediu': _timp(rez.get('Timp_Mediu')),
+        'timp_mediu_box': _timp(rez.get('Timp_Mediu_Box_Specific')),
+        'cel_mai_bun_sectional': _timp(rez.get('Cel_Mai_Bun_Sectional')),
+        'timp_mediu_sectional': _timp(rez.get('Timp_Mediu_Sectional')),
+        'stil_curba': rez.get('Stil_Curba'),
+        'varsta': rez.get('Varsta'),
+        'sex': rez.get('Sex'),
+        'zile_de_la_ultima_cursa': rez.get('Days Since Last Race'),
+        'prob_probleme': rez.get('Prob_Probleme'),
+        'prob_liber': rez.get('Prob_Liber'),
+    } for loc, rez in enumerate(predictie_sortata, start=1)]
+
+
+def cursa_serializabila(detalii, predictie, erori, cu_simulare=True, monte_carlo=None):
+    """
+    Rezultatul unei curse (detalii, predicție, simulare structurată, erori) ca dicționar serializabil JSON.
+    monte_carlo: rezultatul simuleaza_monte_carlo, dacă a fost rulată (altfel cheia este None).
+    """
+    simulare = None
+    if cu_simulare and any(rez.get('Timp_Prezis_Combinat', TIMP_MAX_NECUNOSCUT) < TIMP_MAX_NECUNOSCUT for rez in predictie):
+        simulare = calculeaza_simulare_cursa(predictie, detalii).ca_dict()
+    return {
+        'id': detalii.get('id'),
+        'pista': detalii.get('pista'),
+        'distanta_m': detalii.get('distanta_m'),
+        'grad': detalii.get('grad'),
+        'data_cursa': detalii.get('data_cursa'),
+        'predictie': predictie_serializabila(predictie),
+        'simulare': simulare,
+        'monte_carlo': monte_carlo,
+        'erori': erori,
+    }
+
+
+def ruleaza(curse, fisier_istoric=None, greutati=None, cu_simulare=True, numar_curse_monte_carlo=None):
+    """
+    Prezice cursele (istoricul se încarcă o singură dată) și întoarce dicționarul serializabil al rezultatelor.
+    numar_curse_monte_carlo: dacă este dat, se adaugă și simularea Monte Carlo a fiecărei curse.
+    """
+    rezultat_card = prezice_card_curse(curse, fisier_istoric=fisier_istoric, greutati_timp_final_override=greutati,
+                                       numar_curse_monte_carlo=numar_curse_monte_carlo)
+    curse_iesire = [cursa_serializabila(rezultat['detalii'], rezultat['predictie'], rezultat['erori'], cu_simulare,
+                                        rezultat['monte_carlo'])
+                    for rezultat in rezultat_card['curse']]
+    return {'curse': curse_iesire, 'avertismente': rezultat_card['avertismente'], 'durata_s': rezultat_card['durata_s']}
+
+
+def _locuri_simulare(simulare, nume_ogar):
+    # "80m:2 280m:1 500m:1" - locul ogarului la fiecare punct simulat (fără Start)
+    if not simulare:
+        return ''
+    locuri = []
+    for punct in simulare['puncte']:
+        if punct['distanta_m'] == 0:
+            continue
+        for intrare in punct['clasament']:
+            if intrare['nume'] == nume_ogar:
+                locuri.append(f"{punct['distanta_m']}m:{intrare['loc']}")
+                break
+    return ' '.join(locuri)
+
+
+def _probabilitati_monte_carlo(monte_carlo, nume_ogar):
+    # ['0.4123', '0.7010', '80m:0.391 280m:0.402'] - celulele CSV ale ogarului (goale fără simulare)
+    if not monte_carlo:
+        return ['', '', '']
+    for participant in monte_carlo['participanti']:
+        if participant['nume'] == nume_ogar:
+            lider = ' '.join(f"{distanta}m:{probabilitate:.3f}" for distanta, probabilitate in participant['lider'].items())
+            return [f"{participant['castig']:.4f}", f"{participant['plasat']:.4f}", lider]
+    return ['', '', '']
+
+
+def scrie_json(rezultat, iesire):
+    json.dump(rezultat, iesire, ensure_ascii=False, indent=2)
+    iesire.write('\n')
+
+
+def scrie_csv(rezultat, iesire, cu_monte_carlo=False):
+    writer = csv.writer(iesire, lineterminator='\n')
+    writer.writerow(COLOANE_CSV + (COLOANE_CSV_MONTE_CARLO if cu_monte_carlo else ()))
+    for cursa in rezultat['curse']:
+        for rez in cursa['predictie']:
+            writer.writerow([
+                cursa['id'], cursa['pista'], cursa['distanta_m'], cursa['grad'], cursa['data_cursa'],
+                rez['loc'], rez['box'], rez['nume'],
+                *(f"{rez[cheie]:.2f}" if rez[cheie] is not None else '' for cheie in
+                  ('timp_prezis', 'cel_mai_bun_timp', 'timp_mediu', 'timp_mediu_box', 'cel_mai_bun_sectional', 'timp_mediu_sectional')),
+                rez['stil_curba'] or '',
+                '' if rez['zile_de_la_ultima_cursa'] is None else rez['zile_de_la_ultima_cursa'],
+                _locuri_simulare(cursa['simulare'], rez['nume']),
+                *(_probabilitati_monte_carlo(cursa['monte_carlo'], rez['nume']) if cu_monte_carlo else ()),
+            ])
+
+
+def construieste_parser():
+    parser = argparse.ArgumentParser(
+        description="Predicție și simulare curse de ogari, fără interfață grafică. Rezultatul se scrie pe stdout.")
+    sursa = parser.add_mutually_exclusive_group(required=True)
+    sursa.add_argument('--card', help="Card de curse (JSON sau CSV, vezi card_curse.py)")
+    sursa.add_argument('--pista', help="Pista cursei (numele din GUI, ex. 'Towcester', sau abrevierea din CSV)")
+    parser.add_argument('--distanta', type=int, help="Distanța cursei în metri")
+    parser.add_argument('--grad', default='', help="Gradul cursei (ex. A3)")
+    parser.add_argument('--data', default=date.today().strftime('%d/%m/%Y'),
+                        help="Data cursei (DD/MM/YYYY); implicit data de azi")
+    parser.add_argument('--box', nargs=2, action='append', metavar=('BOX', 'NUME'), default=[],
+                        help="Un participant: numărul boxei (1-6) și numele ogarului; se repetă pentru fiecare ogar")
+    parser.add_argument('--istoric', help="Fișierul CSV cu istoricul; implicit fișierele pistelor din CSV_PER_ARENA")
+    parser.add_argument('--ponderi', nargs=3, type=float, metavar=('BEST', 'AVERAGE', 'AVERAGE_TRAP'),
+                        help="Ponderile timpului de bază; implicit PONDERI_TIMP_FINAL_IMPLICITE")
+    parser.add_argument('--format', choices=('json', 'csv'), default='json', help="Formatul ieșirii (implicit json)")
+    parser.add_argument('--fara-simulare', action='store_true', help="Nu rula simularea cursei")
+    parser.add_argument('--monte-carlo', nargs='?', type=int, const=SIMULARE_MC_NUMAR_CURSE, metavar='N',
+                        help="Adaugă simularea Monte Carlo (probabilități de câștig, plasare și lider la fiecare punct) "
+                             "cu N curse simulate; implicit N = SIMULARE_MC_NUMAR_CURSE (necesită numpy)")
+    parser.add_argument('--timpi', action='store_true',
+                        help="Afișează pe stderr timpii pe etape (și îi adaugă în JSON sub cheia 'timpi')")
+    parser.add_argument('--profil', metavar='FISIER',
+                        help="Exportă timpii pe etape: .folded = stive pliate (flamegraph), altfel format pstats (cProfile)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Afișează mesajele de log pe stderr")
+    return parser
+
+
+def main(argv=None):
+    parser = construieste_parser()
+    argumente = parser.parse_args(argv)
+
+    if argumente.verbose:
+        configureaza_logging()
+    else:
+        import logging
+        logging.disable(logging.WARNING)
+
+    if argumente.monte_carlo is not None:
+        if argumente.monte_carlo <= 0:
+            parser.error("--monte-carlo: numărul de curse simulate trebuie să fie pozitiv")
+        from simulare_monte_carlo import np
+        if np is None:
+            parser.error("--monte-carlo necesită pachetul 'numpy' (pip install numpy)")
+
+    greutati = None
+    if argumente.ponderi is not None:
+        if any(pondere < 0 for pondere in argumente.ponderi):
+            parser.error("ponderile nu pot fi negative")
+        greutati = dict(zip(('best', 'average', 'average_trap'), argumente.ponderi))
+
+    erori = []
+    if argumente.card:
+        curse = citeste_card_curse(argumente.card, erori)
+    else:
+        if argumente.distanta is None or argumente.distanta <= 0:
+            parser.error("--distanta (număr pozitiv) este obligatorie împreună cu --pista")
+        if not argumente.box:
+            parser.error("adăugați cel puțin un participant cu --box BOX NUME")
+        curse = normalizeaza_curse([{
+            'id': '1',
+            'pista': argumente.pista,
+            'distanta_m': argumente.distanta,
+            'grad': argumente.grad,
+            'data_cursa': argumente.data,
+            'ogari_participanti': [(nume, box) for box, nume in argumente.box],
+        }], erori)
+
+    for eroare in erori:
+        print(eroare, file=sys.stderr)
+    if not curse:
+        return 1
+
+    with (masoara() if argumente.timpi or argumente.profil else nullcontext()) as masuratori:
+        rezultat = ruleaza(curse, fisier_istoric=argumente.istoric, greutati=greutati, cu_simulare=not argumente.fara_simulare,
+                           numar_curse_monte_carlo=argumente.monte_carlo)
+    if masuratori is not None:
+        if argumente.timpi:
+            print(masuratori.formateaza(), file=sys.stderr)
+            rezultat['timpi'] = masuratori.ca_dict()
+        if argumente.profil:
+            masuratori.exporta(argumente.profil)
+    for mesaj in rezultat['avertismente'] + [eroare for cursa in rezultat['curse'] for eroare in cursa['erori']]:
+        print(mesaj, file=sys.stderr)
+
+    if argumente.format == 'csv':
+        scrie_csv(rezultat, sys.stdout, cu_monte_carlo=argumente.monte_carlo is not None)
+    else:
+        scrie_json(rezultat, sys.stdout)
+    # 1 și când rândurile există, dar niciun timp nu a putut fi prezis (ex. istoricul nu a fost încărcat)
+    if any(mesaj.startswith("Eroare FATALA") for mesaj in rezultat['avertismente']):
+        return 1
+    prezise = any(rez['timp_prezis'] is not None for cursa in rezultat['curse'] for rez in cursa['predictie'])
+    return 0 if prezise else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
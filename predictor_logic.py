@@ -2,22 +2,14 @@
 # Include procesare istoric, calcul indicatori, predicție, simulare, testare ponderi, REMARK, ajustare ponderi REMARK și indicatori CURBA
 
 import csv
+import io
 import re
 import os
 import json
+import hashlib
 from datetime import datetime, timedelta
+from functools import lru_cache
 from statistics import mean
-import logging
-
-# Inițializează logging simplu (în fișier și în consolă)
-logging.basicConfig(
-    level=logging.WARNING,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("greyhound_predictor.log", mode='a', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 
 # Importă toate constantele și setările de configurare
 from config import (
@@ -44,7 +36,60 @@ from config import (
     # ---- ADĂUGAT pentru opțiunea curbe parametrizabilă ----
     COEFICIENT_BONUS_CURBA_FINISHER,
     COEFICIENT_PENALIZARE_CURBA_EARLY,
+    CACHE_ISTORIC_ACTIVAT,
+    PARSARE_RAPIDA_ISTORIC,
+    AGREGATE_OGARI_ACTIVAT,
+    SIMULARE_MEMO_MAX_INTRARI,
+    SNAPSHOT_EXTENSIE,
+    ISTORIC_SQLITE_DB,
 )
+from cache_istoric import calculeaza_hash_continut, incarca_din_cache, incarca_intrare_anterioara, salveaza_in_cache
+from index_istoric import HistoryIndex, _cheie_data_descrescator
+from rand_istoric import RandIstoric, interneaza
+from instrumentare import cronometru, cronometrat, numara
+from diagnostice import raporteaza, cu_diagnostice
+
+# Ponderile implicite pentru timpul de bază (cel mai bun / mediu / mediu pe box)
+PONDERI_TIMP_FINAL_IMPLICITE = {
+    'best': 0.33,
+    'average': 0.34,
+    'average_trap': 0.33
+}
+
+# Indexul fiecărui fișier deja încărcat în acest proces:
+# cale absolută -> {'cheie_stat': (dimensiune, mtime_ns), 'index', 'avertismente', 'stare_parsare', 'agregate'}
+# ('agregate' = AgregateOgari, construit la prima cerere și actualizat odată cu indexul)
+_ISTORIC_INDEXAT_IN_MEMORIE = {}
+
+# --- Clasificator REMARK: cuvintele cheie din config compilate o singură dată ---
+def compileaza_cuvinte_cheie(cuvinte):
+    """
+    Compilează lista de cuvinte cheie într-o singură expresie regulată (alternanță, fără diferențe de majuscule).
+    search() pe textul REMARK (lowercase) este echivalent cu any(cuvant.lower() in remark_l for cuvant in cuvinte).
+    """
+    unice = sorted({cuvant.lower() for cuvant in cuvinte if cuvant}, key=len, reverse=True)
+    return re.compile('|'.join(re.escape(cuvant) for cuvant in unice))
+
+REGEX_REMARK_PROBLEME = compileaza_cuvinte_cheie(PROBLEM_KEYWORDS)
+REGEX_REMARK_LIBER = compileaza_cuvinte_cheie(CLEAR_RUN_KEYWORDS)
+
+def clasifica_remark(remark):
+    """
+    Returnează (are_probleme, alergare_libera) pentru un text REMARK.
+    """
+    remark_l = (remark or '').lower()
+    return (REGEX_REMARK_PROBLEME.search(remark_l) is not None,
+            REGEX_REMARK_LIBER.search(remark_l) is not None)
+
+def flaguri_remark(rand):
+    """
+    Flagurile REMARK ale unui rând parsat: cele calculate la încărcare sau, dacă lipsesc, calculate acum.
+    """
+    are_probleme = rand.get('Remark Probleme')
+    alergare_libera = rand.get('Remark Liber')
+    if are_probleme is None or alergare_libera is None:
+        return clasifica_remark(rand.get('REMARK'))
+    return are_probleme, alergare_libera
 
 # --- Funcție pentru extragere indicatori din coloana CURBA ---
 def extrage_indicatori_curba(curba_string):
@@ -74,11 +119,27 @@ def determina_stil_curba(diff):
     else:
         return "Constant"
 
+def determina_status_recenta(ultima_data, data_cursa_curenta):
+    """
+    Returnează (status recență, zile de la ultima cursă) pe baza pragurilor din config.
+    Dacă una dintre date lipsește sau ultima cursă este după cursa curentă: ('N/A Date', None).
+    """
+    if data_cursa_curenta is None or ultima_data is None or ultima_data > data_cursa_curenta:
+        return 'N/A Date', None
+    zile = (data_cursa_curenta - ultima_data).days
+    if zile <= RECENCY_THRESHOLD_RECENT_DAYS:
+        return 'Very Recent', zile
+    elif zile <= RECENCY_THRESHOLD_MODERATE_DAYS:
+        return 'Recent', zile
+    elif zile <= RECENCY_THRESHOLD_OLD_DAYS:
+        return 'Moderate', zile
+    return 'Old', zile
+
 # --- Funcție pentru procesarea unui rând din fișierul CSV cu istoric ---
 def proceseaza_rand_istoric(rand, nume_coloane, mapare_intern_csv):
     """
     Procesează un rând din CSV, aplicând maparea și conversiile de tip,
-    returnează dict cu toate valorile normalizate.
+    returnează un RandIstoric (citibil ca dict) cu toate valorile normalizate.
     """
     rand_procesat = {}
     for nume_intern, nume_csv in mapare_intern_csv.items():
@@ -178,11 +239,13 @@ def proceseaza_rand_istoric(rand, nume_coloane, mapare_intern_csv):
         except Exception:
             pass
 
-    # Citire REMARK dacă există în rând
-    if 'REMARK' in rand:
-        rand_procesat['REMARK'] = rand.get('REMARK', '').strip()
+    # Citire REMARK dacă există în rând (coloana poate avea alt nume, vezi construieste_mapare_coloane)
+    coloana_remark = mapare_intern_csv.get('REMARK', 'REMARK')
+    if coloana_remark in rand:
+        rand_procesat['REMARK'] = (rand.get(coloana_remark) or '').strip()
     else:
         rand_procesat['REMARK'] = ''
+    rand_procesat['Remark Probleme'], rand_procesat['Remark Liber'] = clasifica_remark(rand_procesat['REMARK'])
 
     # Adaugă și coloana CURBA dacă există
     if 'CURBA' in rand:
@@ -192,98 +255,596 @@ def proceseaza_rand_istoric(rand, nume_coloane, mapare_intern_csv):
 
     # Returnează doar dacă există nume ogar valid
     if rand_procesat.get('Nume Ogar') and str(rand_procesat.get('Nume Ogar')).strip() != '':
-        return rand_procesat
+        return RandIstoric.din_dict(rand_procesat)
     else:
         return None
 
+# --- Parsare rapidă: convertoare precompilate și memoizate pentru valorile care se repetă ---
+_RE_CIFRE_INCEPUT = re.compile(r'^\d+')
+_RE_NON_CIFRE = re.compile(r'\D')
+_RE_SECTIONAL = re.compile(r'^\d*\.?\d*')
+_RE_PRIMUL_NUMAR = re.compile(r'(\d+)')
+
+@lru_cache(maxsize=65536)
+def _converteste_data(text):
+    if text == '':
+        return None
+    try:
+        return datetime.strptime(text, '%d/%m/%Y')
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=4096)
+def _converteste_distanta(text):
+    potrivire = _RE_CIFRE_INCEPUT.match(text)
+    return int(potrivire.group(0)) if potrivire else None
+
+@lru_cache(maxsize=65536)
+def _converteste_timp_final(text):
+    if text == '':
+        return None
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=4096)
+def _converteste_pozitie(text):
+    pozitie_curata = _RE_NON_CIFRE.sub('', text)
+    try:
+        return int(pozitie_curata) if pozitie_curata != '' else None
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=65536)
+def _converteste_sectional(text):
+    potrivire = _RE_SECTIONAL.match(text)
+    if potrivire and potrivire.group(0) != '':
+        try:
+            return float(potrivire.group(0))
+        except ValueError:
+            return None
+    return None
+
+@lru_cache(maxsize=4096)
+def _converteste_box(text):
+    potrivire = _RE_PRIMUL_NUMAR.search(text)
+    return int(potrivire.group(1)) if potrivire else None
+
+@lru_cache(maxsize=4096)
+def _converteste_varsta(text):
+    try:
+        return float(text)
+    except ValueError:
+        return text if text != '' else None
+
+# Câmpurile text ale rândului, în ordinea argumentelor RandIstoric (REMARK și CURBA se citesc separat)
+CHEI_TEXT_CSV = ('Data Cursei', 'Pista', 'Distanta Cursei (m)', 'Grad Cursa', 'Numar Box (Trap)', 'Timp Secțional 1 (s)',
+                 'Pozitie Finala', 'FINAL', 'Varsta', 'Sex', 'Nume Ogar')
+
+def compileaza_convertor_rand(nume_coloane, mapare_intern_csv):
+    """
+    Construiește o singură dată, pentru antetul detectat, o funcție care transformă un rând csv.reader
+    (listă de valori) în același rând (RandIstoric) pe care îl produce proceseaza_rand_istoric.
+    Indicii coloanelor sunt rezolvați aici; conversiile folosesc expresii precompilate și memoizare
+    (datele, distanțele, boxele și pozițiile se repetă de mii de ori).
+    """
+    # La nume de coloană duplicate, DictReader păstrează ultima valoare; facem la fel
+    pozitii_coloane = {nume: i for i, nume in enumerate(nume_coloane)}
+    indici = [pozitii_coloane.get(mapare_intern_csv.get(nume_intern)) for nume_intern in CHEI_TEXT_CSV]
+    idx_remark = pozitii_coloane.get(mapare_intern_csv.get('REMARK', 'REMARK'))
+    idx_curba = pozitii_coloane.get('CURBA')
+    idx_nume = pozitii_coloane.get(mapare_intern_csv.get('Nume Ogar'))
+
+    def convertor(valori):
+        numar_valori = len(valori)
+        # Rândurile fără nume de ogar sunt ignorate înainte de orice conversie
+        if idx_nume is None or idx_nume >= numar_valori or not valori[idx_nume].strip():
+            return None
+
+        (data_cursei, pista, distanta, grad, box, sectional, pozitie, final, varsta, sex,
+         nume) = [valori[i].strip() if i is not None and i < numar_valori else None for i in indici]
+        if idx_remark is not None:
+            remark = (valori[idx_remark] if idx_remark < numar_valori else '').strip()
+        else:
+            remark = ''
+        if idx_curba is not None:
+            curba = (valori[idx_curba] if idx_curba < numar_valori else '').strip()
+        else:
+            curba = ''
+        are_probleme, alergare_libera = clasifica_remark(remark)
+
+        return RandIstoric(
+            interneaza(data_cursei),
+            interneaza(pista),
+            _converteste_distanta(distanta) if distanta else None,
+            interneaza(grad),
+            _converteste_box(box) if box is not None else None,
+            _converteste_sectional(sectional) if sectional is not None else None,
+            _converteste_pozitie(pozitie) if pozitie is not None else None,
+            final,
+            _converteste_varsta(varsta) if varsta is not None else None,
+            interneaza(sex),
+            interneaza(nume),
+            remark,
+            interneaza(curba),
+            _converteste_timp_final(final) if final is not None else None,
+            _converteste_data(data_cursei) if data_cursei is not None else None,
+            are_probleme,
+            alergare_libera,
+        )
+
+    return convertor
+
+# --- Funcție pentru citirea istoricului, cu cache pe disc ---
+def citeste_si_parseaza_istoric(cale_fisier, lista_erori, foloseste_cache=None):
+    """
+    Returnează istoricul parsat al fișierului CSV.
+    Dacă fișierul nu s-a modificat de la ultima parsare (cale, dimensiune, mtime, hash conținut),
+    istoricul se încarcă direct din cache-ul de pe disc. foloseste_cache=False ocolește cache-ul.
+    """
+    istoric_complet, _ = citeste_istoric_cu_stare(cale_fisier, lista_erori, foloseste_cache=foloseste_cache)
+    return istoric_complet
+
+def citeste_istoric_cu_stare(cale_fisier, lista_erori, foloseste_cache=None):
+    """
+    Ca citeste_si_parseaza_istoric, dar returnează (istoric_complet, stare_parsare).
+    Dacă fișierul doar a crescut prin rânduri adăugate la final față de intrarea din cache,
+    se parsează numai coada nouă; altfel (antet sau octeți anteriori modificați) se reconstruiește complet.
+    """
+    if este_fisier_snapshot(cale_fisier):
+        snapshot = deschide_snapshot_istoric(cale_fisier, lista_erori)
+        return (list(snapshot) if snapshot is not None else []), None
+
+    if foloseste_cache is None:
+        foloseste_cache = CACHE_ISTORIC_ACTIVAT
+
+    if foloseste_cache:
+        with cronometru('istoric.cache_disc'):
+            rezultat_cache = incarca_din_cache(cale_fisier)
+        if rezultat_cache is not None:
+            istoric_complet, avertismente, stare_parsare = rezultat_cache
+            lista_erori.extend(avertismente)
+            return istoric_complet, stare_parsare
+
+        intrare_anterioara = incarca_intrare_anterioara(cale_fisier)
+        if intrare_anterioara is not None:
+            istoric_anterior, avertismente, stare_anterioara = intrare_anterioara
+            erori_coada = []
+            rezultat_coada = parseaza_coada_csv(cale_fisier, stare_anterioara, erori_coada,
+                                                numar_randuri_existente=len(istoric_anterior))
+            if rezultat_coada is not None:
+                randuri_noi, stare_parsare = rezultat_coada
+                istoric_complet = istoric_anterior + randuri_noi
+                avertismente = avertismente + erori_coada
+                lista_erori.extend(avertismente)
+                salveaza_in_cache(cale_fisier, istoric_complet, avertismente, stare_parsare)
+                return istoric_complet, stare_parsare
+
+    erori_parsare = []
+    istoric_complet, stare_parsare = parseaza_fisier_csv_cu_stare(cale_fisier, erori_parsare)
+    lista_erori.extend(erori_parsare)
+
+    if foloseste_cache and not [eroare for eroare in erori_parsare if "FATALA" in eroare]:
+        salveaza_in_cache(cale_fisier, istoric_complet, erori_parsare, stare_parsare)
+
+    return istoric_complet, stare_parsare
+
+# --- Funcție pentru încărcarea istoricului împreună cu indexul său ---
+def incarca_istoric_indexat(cale_fisier, lista_erori, foloseste_cache=None):
+    """
+    Returnează (istoric_complet, HistoryIndex) pentru fișierul dat.
+    Indexul se construiește o singură dată per fișier și se reutilizează în proces cât timp
+    fișierul are aceeași dimensiune și același mtime. Dacă fișierul a primit doar rânduri noi
+    la final, acestea sunt parsate și adăugate în indexul existent. foloseste_cache=False forțează re-parsarea.
+    """
+    if este_fisier_snapshot(cale_fisier):
+        # Snapshot-ul răspunde singur la căutările per ogar, fără index construit în memorie
+        snapshot = deschide_snapshot_istoric(cale_fisier, lista_erori)
+        if snapshot is None:
+            return [], HistoryIndex()
+        return snapshot.istoric, snapshot
+
+    if foloseste_cache is None:
+        foloseste_cache = CACHE_ISTORIC_ACTIVAT
+
+    cale_absoluta = os.path.abspath(cale_fisier)
+    try:
+        info = os.stat(cale_absoluta)
+        cheie_stat = (info.st_size, info.st_mtime_ns)
+    except OSError:
+        cheie_stat = None
+
+    intrare = _ISTORIC_INDEXAT_IN_MEMORIE.get(cale_absoluta)
+    if foloseste_cache and cheie_stat is not None and intrare:
+        if intrare['cheie_stat'] == cheie_stat:
+            lista_erori.extend(intrare['avertismente'])
+            return intrare['index'].istoric, intrare['index']
+
+        erori_coada = []
+        rezultat_coada = parseaza_coada_csv(cale_fisier, intrare['stare_parsare'], erori_coada,
+                                            numar_randuri_existente=len(intrare['index']))
+        if rezultat_coada is not None:
+            randuri_noi, stare_parsare = rezultat_coada
+            intrare['index'].adauga(randuri_noi)
+            if intrare.get('agregate') is not None:
+                intrare['agregate'].adauga_randuri(randuri_noi)
+            intrare['avertismente'] = intrare['avertismente'] + erori_coada
+            intrare['stare_parsare'] = stare_parsare
+            intrare['cheie_stat'] = (stare_parsare['offset'], stare_parsare['mtime_ns'])
+            lista_erori.extend(intrare['avertismente'])
+            return intrare['index'].istoric, intrare['index']
+
+    erori_citire = []
+    istoric_complet, stare_parsare = citeste_istoric_cu_stare(cale_fisier, erori_citire, foloseste_cache=foloseste_cache)
+    lista_erori.extend(erori_citire)
+    with cronometru('index.construire'):
+        index = HistoryIndex(istoric_complet)
+
+    if cheie_stat is not None and not [eroare for eroare in erori_citire if "FATALA" in eroare]:
+        _ISTORIC_INDEXAT_IN_MEMORIE[cale_absoluta] = {
+            'cheie_stat': cheie_stat,
+            'index': index,
+            'avertismente': erori_citire,
+            'stare_parsare': stare_parsare,
+        }
+    else:
+        _ISTORIC_INDEXAT_IN_MEMORIE.pop(cale_absoluta, None)
+
+    return index.istoric, index
+
+# --- Funcție pentru încărcarea istoricului în backend-ul columnar (NumPy, opțional) ---
+def incarca_istoric_columnar(cale_fisier, lista_erori, foloseste_cache=None):
+    """
+    Returnează istoricul fișierului ca IstoricColumnar (coloane NumPy + categorii codificate).
+    Rândurile-dict intermediare nu sunt păstrate în memorie. Necesită numpy.
+    """
+    from istoric_columnar import IstoricColumnar
+
+    istoric_complet = citeste_si_parseaza_istoric(cale_fisier, lista_erori, foloseste_cache=foloseste_cache)
+    return IstoricColumnar.din_randuri(istoric_complet)
+
+# --- Funcție pentru încărcarea istoricului în backend-ul SQLite (opțional) ---
+def incarca_istoric_sqlite(cale_fisier, lista_erori, foloseste_cache=None, cale_db=None):
+    """
+    Returnează istoricul ca IstoricSqlite, din baza cale_db (implicit ISTORIC_SQLITE_DB, comună tuturor pistelor).
+    Rândurile fișierului sunt (re)inserate doar dacă acesta s-a modificat de la ultima încărcare în bază.
+    """
+    from istoric_sqlite import deschide_istoric_sqlite
+
+    istoric = deschide_istoric_sqlite(cale_db or ISTORIC_SQLITE_DB)
+    with cronometru('istoric.sqlite'):
+        istoric.incarca_fisier(cale_fisier, lista_erori, foloseste_cache=foloseste_cache)
+    return istoric
+
+# --- Funcție pentru încărcarea agregatelor incrementale per ogar ---
+def incarca_agregate_ogari(cale_fisier, lista_erori, foloseste_cache=None):
+    """
+    Returnează (istoric_complet, AgregateOgari) pentru fișierul dat. Depozitul se construiește o dată din
+    indexul memorat în proces și primește apoi doar rândurile noi (la ingestia incrementală).
+    """
+    from agregate_ogari import AgregateOgari
+
+    istoric_complet, index = incarca_istoric_indexat(cale_fisier, lista_erori, foloseste_cache=foloseste_cache)
+    if not isinstance(index, HistoryIndex):
+        return istoric_complet, index  # snapshot binar: indicatorii se calculează din rândurile ogarului
+    intrare = _ISTORIC_INDEXAT_IN_MEMORIE.get(os.path.abspath(cale_fisier))
+    if intrare is None or intrare['index'] is not index:
+        return istoric_complet, AgregateOgari.din_index(index)
+    if intrare.get('agregate') is None:
+        with cronometru('agregate.construire'):
+            intrare['agregate'] = AgregateOgari.din_index(index)
+    return istoric_complet, intrare['agregate']
+
+# --- Detectarea coloanelor din antet ---
+# Numele acceptate pentru coloana REMARK, în ordinea preferinței
+COLOANE_REMARK = ('REMARK', 'REMARKS')
+
+def construieste_mapare_coloane(nume_coloane_curatate, cale_fisier, lista_erori):
+    """
+    Returnează maparea nume intern -> coloană CSV pentru antetul dat, sau None (cu eroare FATALA)
+    dacă lipsește coloana cu numele ogarului.
+    """
+    mapare_intern_csv = {
+        'Data Cursei': 'DATA',
+        'Pista': 'PISTA',
+        'Distanta Cursei (m)': 'DISTANTA',
+        'Grad Cursa': 'GRAD',
+        'Numar Box (Trap)': 'BOXA',
+        'Timp Secțional 1 (s)': 'SECTIONAL',
+        'Pozitie Finala': 'POZITIE',
+        'FINAL': 'FINAL',
+        'Varsta': 'VARSTA',
+        'Sex': 'SEX'
+    }
+
+    nume_ogar_csv = None
+    campuri_posibile_nume = ['NUME', '\ufeffNUME', 'NAME', '\ufeffNAME']
+    for camp in nume_coloane_curatate:
+        if camp and camp.strip().upper() in [f.strip().upper() for f in campuri_posibile_nume]:
+            nume_ogar_csv = camp
+            break
+
+    if nume_ogar_csv:
+        mapare_intern_csv['Nume Ogar'] = nume_ogar_csv
+    else:
+        lista_erori.append(f"Eroare FATALA: Coloana cu numele ogarului ('NUME' sau 'NAME') nu a fost gasita in antetul fisierului CSV '{os.path.basename(cale_fisier)}'. Verificati numele EXACT al coloanei NUME/NAME.")
+        return None
+
+    # Detectează și coloana REMARK dacă există (în unele registre Excel se numește 'REMARKS')
+    for coloana_remark in COLOANE_REMARK:
+        if coloana_remark in nume_coloane_curatate:
+            mapare_intern_csv['REMARK'] = coloana_remark
+            break
+    if 'CURBA' in nume_coloane_curatate:
+        mapare_intern_csv['CURBA'] = 'CURBA'
+
+    return mapare_intern_csv
+
+@cronometrat('csv.detectare_dialect')
+def detecteaza_dialect(mostra):
+    """
+    Dialectul CSV (',' sau ';') detectat din prima linie; 'excel' dacă detecția eșuează.
+    """
+    try:
+        return csv.Sniffer().sniff(mostra, delimiters=',;')
+    except csv.Error:
+        return 'excel'
+
+@cronometrat('csv.parsare_randuri')
+def _parseaza_randuri(fisier_csv, dialect, nume_coloane_curatate, mapare_intern_csv, mod_rapid, cu_antet):
+    """
+    Parsează rândurile de date din fisier_csv (antetul este sărit dacă cu_antet=True).
+    """
+    if mod_rapid:
+        reader = csv.reader(fisier_csv, dialect=dialect)
+        if cu_antet:
+            next(reader, None)
+        return _converteste_randuri(reader, nume_coloane_curatate, mapare_intern_csv)
+
+    istoric = []
+    reader = csv.DictReader(fisier_csv, fieldnames=nume_coloane_curatate, dialect=dialect)
+    if cu_antet:
+        next(reader.reader, None)
+    for rand in reader:
+        rand_procesat = proceseaza_rand_istoric(rand, nume_coloane_curatate, mapare_intern_csv)
+        if rand_procesat:
+            istoric.append(rand_procesat)
+    numara('randuri_parsate', len(istoric))
+    return istoric
+
+def _converteste_randuri(randuri_valori, nume_coloane_curatate, mapare_intern_csv):
+    """
+    Rândurile date ca liste de valori (csv.reader sau citire_xlsx) trecute prin convertorul compilat pentru antet.
+    """
+    istoric = []
+    convertor = compileaza_convertor_rand(nume_coloane_curatate, mapare_intern_csv)
+    for valori in randuri_valori:
+        if valori:
+            rand_procesat = convertor(valori)
+            if rand_procesat:
+                istoric.append(rand_procesat)
+    numara('randuri_parsate', len(istoric))
+    return istoric
+
 # --- Funcție pentru citirea și parsarea completă a fișierului CSV ---
-def citeste_si_parseaza_istoric(cale_fisier, lista_erori):
+def parseaza_fisier_csv(cale_fisier, lista_erori, mod_rapid=None):
     """
     Citește fișierul CSV și parsează datele istorice, rând cu rând.
+    mod_rapid=True (implicit din config) folosește csv.reader + convertorul compilat pentru antet;
+    mod_rapid=False folosește DictReader + proceseaza_rand_istoric (varianta de referință).
     """
+    istoric_complet, _ = parseaza_fisier_csv_cu_stare(cale_fisier, lista_erori, mod_rapid=mod_rapid)
+    return istoric_complet
+
+@cronometrat('csv.fisier_complet')
+def parseaza_fisier_csv_cu_stare(cale_fisier, lista_erori, mod_rapid=None):
+    """
+    Ca parseaza_fisier_csv, dar returnează și starea parsării (None la eroare):
+    offset-ul în octeți consumat, hash-ul SHA-1 al acestor octeți, antetul și numărul de rânduri,
+    folosite de parseaza_coada_csv pentru a parsa ulterior doar rândurile adăugate.
+    """
+    if este_fisier_xlsx(cale_fisier):
+        return parseaza_fisier_xlsx_cu_stare(cale_fisier, lista_erori)
+    if mod_rapid is None:
+        mod_rapid = PARSARE_RAPIDA_ISTORIC
     istoric_complet = []
     try:
-        with open(cale_fisier, mode='r', encoding='utf-8', newline="") as fisier_csv:
+        info = os.stat(cale_fisier)
+        with open(cale_fisier, mode='rb') as fisier_binar:
+            continut = fisier_binar.read()
+        with io.StringIO(continut.decode('utf-8'), newline="") as fisier_csv:
             try:
                 mostra = fisier_csv.readline()
                 if not mostra or mostra.strip() == '':
                     lista_erori.append(f"Avertisment: Fisierul '{os.path.basename(cale_fisier)}' pare gol sau are doar un rând antet fara date.")
-                    return []
+                    return [], None
                 fisier_csv.seek(0)
 
-                try:
-                    dialect = csv.Sniffer().sniff(mostra, delimiters=',;')
-                except csv.Error:
-                    dialect = 'excel'
+                dialect = detecteaza_dialect(mostra)
+                fisier_csv.seek(0)
+                nume_coloane_curatate = next(csv.reader(fisier_csv, dialect=dialect), None)
                 fisier_csv.seek(0)
-                reader = csv.DictReader(fisier_csv, dialect=dialect)
 
             except Exception as eroare_dictreader:
                 lista_erori.append(f"Eroare FATALA la initializarea cititorului CSV: {eroare_dictreader}. Verificati formatul si antetul fisierului '{os.path.basename(cale_fisier)}'.")
-                return []
+                return [], None
 
-            if reader.fieldnames:
-                reader.fieldnames = [(nume.strip() if nume else '') for nume in reader.fieldnames]
+            if nume_coloane_curatate:
+                nume_coloane_curatate = [(nume.strip() if nume else '') for nume in nume_coloane_curatate]
             else:
                 lista_erori.append(f"Eroare FATALA: Fisierul CSV '{os.path.basename(cale_fisier)}' nu are antet (header).")
-                return []
-
-            mapare_intern_csv = {
-                'Data Cursei': 'DATA',
-                'Pista': 'PISTA',
-                'Distanta Cursei (m)': 'DISTANTA',
-                'Grad Cursa': 'GRAD',
-                'Numar Box (Trap)': 'BOXA',
-                'Timp Secțional 1 (s)': 'SECTIONAL',
-                'Pozitie Finala': 'POZITIE',
-                'FINAL': 'FINAL',
-                'Varsta': 'VARSTA',
-                'Sex': 'SEX'
-            }
-
-            nume_ogar_csv = None
-            campuri_posibile_nume = ['NUME', '\ufeffNUME', 'NAME', '\ufeffNAME']
-            for camp in (reader.fieldnames if reader.fieldnames else []):
-                if camp and camp.strip().upper() in [f.strip().upper() for f in campuri_posibile_nume]:
-                    nume_ogar_csv = camp
-                    break
-
-            if nume_ogar_csv:
-                mapare_intern_csv['Nume Ogar'] = nume_ogar_csv
-            else:
-                lista_erori.append(f"Eroare FATALA: Coloana cu numele ogarului ('NUME' sau 'NAME') nu a fost gasita in antetul fisierului CSV '{os.path.basename(cale_fisier)}'. Verificati numele EXACT al coloanei NUME/NAME.")
-                return []
-
-            # Detectează și coloana REMARK dacă există
-            if 'REMARK' in reader.fieldnames:
-                mapare_intern_csv['REMARK'] = 'REMARK'
-            if 'CURBA' in reader.fieldnames:
-                mapare_intern_csv['CURBA'] = 'CURBA'
+                return [], None
 
-            nume_coloane_curatate = reader.fieldnames
+            mapare_intern_csv = construieste_mapare_coloane(nume_coloane_curatate, cale_fisier, lista_erori)
+            if mapare_intern_csv is None:
+                return [], None
 
-            for rand in reader:
-                rand_procesat = proceseaza_rand_istoric(rand, nume_coloane_curatate, mapare_intern_csv)
-                if rand_procesat:
-                    istoric_complet.append(rand_procesat)
+            istoric_complet = _parseaza_randuri(fisier_csv, dialect, nume_coloane_curatate, mapare_intern_csv,
+                                                mod_rapid, cu_antet=True)
 
         if not istoric_complet and not [eroare for eroare in lista_erori if "FATALA" not in eroare]:
             lista_erori.append(f"Avertisment: Fisierul '{os.path.basename(cale_fisier)}' are antet, dar nu contine randuri de date parsabile.")
 
     except FileNotFoundError:
         lista_erori.append(f"Eroare FATALA: Fisierul '{os.path.basename(cale_fisier)}' nu a fost gasit la calea specificata.")
-        return []
+        return [], None
     except Exception as eroare:
         lista_erori.append(f"A aparut o eroare neasteptata la citirea si parsarea fisierului CSV: {eroare}")
-        return []
+        return [], None
+
+    stare_parsare = {
+        'offset': len(continut),
+        'hash_prefix': hashlib.sha1(continut).hexdigest(),
+        'mtime_ns': info.st_mtime_ns,
+        'linie_completa': continut.endswith(b'\n'),
+        'antet': mostra,
+        'nume_coloane': nume_coloane_curatate,
+        'numar_randuri': len(istoric_complet),
+    }
+    return istoric_complet, stare_parsare
 
-    return istoric_complet
+# --- Citirea directă a fișierelor .xlsx (fără export manual în CSV) ---
+def este_fisier_xlsx(cale_fisier):
+    return str(cale_fisier).lower().endswith(('.xlsx', '.xlsm'))
+
+@cronometrat('xlsx.fisier_complet')
+def parseaza_fisier_xlsx_cu_stare(cale_fisier, lista_erori):
+    """
+    Ca parseaza_fisier_csv_cu_stare, pentru prima foaie a unui fișier .xlsx: rândurile sunt citite în flux
+    (citire_xlsx) și trec prin același convertor ca rândurile CSV. Starea descrie fișierul întreg (un .xlsx nu
+    poate fi citit doar "de la un offset"), deci orice modificare duce la o re-parsare completă.
+    """
+    from citire_xlsx import citeste_randuri_xlsx
+
+    try:
+        info = os.stat(cale_fisier)
+        randuri = citeste_randuri_xlsx(cale_fisier)
+        antet = next(randuri, None)
+        if not antet:
+            lista_erori.append(f"Avertisment: Fisierul '{os.path.basename(cale_fisier)}' pare gol sau are doar un rând antet fara date.")
+            return [], None
+        nume_coloane_curatate = [nume.strip() for nume in antet]
+
+        mapare_intern_csv = construieste_mapare_coloane(nume_coloane_curatate, cale_fisier, lista_erori)
+        if mapare_intern_csv is None:
+            return [], None
+        with cronometru('xlsx.parsare_randuri'):
+            istoric_complet = _converteste_randuri(randuri, nume_coloane_curatate, mapare_intern_csv)
+
+        if not istoric_complet:
+            lista_erori.append(f"Avertisment: Fisierul '{os.path.basename(cale_fisier)}' are antet, dar nu contine randuri de date parsabile.")
+        hash_continut = calculeaza_hash_continut(cale_fisier)
+    except FileNotFoundError:
+        lista_erori.append(f"Eroare FATALA: Fisierul '{os.path.basename(cale_fisier)}' nu a fost gasit la calea specificata.")
+        return [], None
+    except Exception as eroare:
+        lista_erori.append(f"Eroare FATALA la citirea fisierului Excel '{os.path.basename(cale_fisier)}': {eroare}")
+        return [], None
+
+    stare_parsare = {
+        'offset': info.st_size,
+        'hash_prefix': hash_continut,
+        'mtime_ns': info.st_mtime_ns,
+        'linie_completa': False,  # fără ingestie incrementală: parseaza_coada_csv cere re-parsarea completă
+        'antet': None,
+        'nume_coloane': nume_coloane_curatate,
+        'numar_randuri': len(istoric_complet),
+    }
+    return istoric_complet, stare_parsare
+
+# --- Snapshot binar al istoricului (snapshot_istoric.py), deschis cu mmap ---
+def este_fisier_snapshot(cale_fisier):
+    return str(cale_fisier).lower().endswith(SNAPSHOT_EXTENSIE)
+
+def deschide_snapshot_istoric(cale_fisier, lista_erori):
+    """
+    SnapshotIstoric-ul fișierului (refolosit în proces) sau None, cu eroare FATALA, dacă nu poate fi deschis.
+    """
+    from snapshot_istoric import deschide_snapshot
+
+    try:
+        with cronometru('istoric.snapshot'):
+            snapshot = deschide_snapshot(cale_fisier)
+    except FileNotFoundError:
+        lista_erori.append(f"Eroare FATALA: Fisierul '{os.path.basename(cale_fisier)}' nu a fost gasit la calea specificata.")
+        return None
+    except (OSError, ValueError) as eroare:
+        lista_erori.append(f"Eroare FATALA la deschiderea snapshot-ului '{os.path.basename(cale_fisier)}': {eroare}")
+        return None
+    lista_erori.extend(snapshot.avertismente)
+    return snapshot
+
+# --- Funcție pentru ingestia incrementală: doar rândurile adăugate la finalul fișierului ---
+@cronometrat('csv.coada')
+def parseaza_coada_csv(cale_fisier, stare_parsare, lista_erori, numar_randuri_existente=None, mod_rapid=None):
+    """
+    Parsează doar octeții adăugați după stare_parsare['offset'].
+    Returnează (randuri_noi, stare_noua) sau None dacă este necesară o reconstruire completă:
+    fișier micșorat, antet/octeți anteriori modificați (hash prefix diferit), ultima linie incompletă
+    la parsarea anterioară, istoric anterior gol sau număr de rânduri diferit de cel din stare.
+    """
+    if mod_rapid is None:
+        mod_rapid = PARSARE_RAPIDA_ISTORIC
+    if not stare_parsare or not stare_parsare.get('linie_completa') or not stare_parsare.get('numar_randuri'):
+        return None
+    if numar_randuri_existente is not None and numar_randuri_existente != stare_parsare['numar_randuri']:
+        return None
+
+    try:
+        info = os.stat(cale_fisier)
+        with open(cale_fisier, mode='rb') as fisier_binar:
+            continut = fisier_binar.read()
+    except OSError:
+        return None
+
+    offset = stare_parsare['offset']
+    if len(continut) < offset:
+        return None
+    vedere = memoryview(continut)
+    hash_continut = hashlib.sha1(vedere[:offset])
+    if hash_continut.hexdigest() != stare_parsare['hash_prefix']:
+        return None
+    hash_continut.update(vedere[offset:])
+
+    try:
+        coada = bytes(vedere[offset:]).decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+    randuri_noi = []
+    if coada:
+        nume_coloane_curatate = stare_parsare['nume_coloane']
+        mapare_intern_csv = construieste_mapare_coloane(nume_coloane_curatate, cale_fisier, lista_erori)
+        if mapare_intern_csv is None:
+            return None
+        dialect = detecteaza_dialect(stare_parsare['antet'])
+        try:
+            with io.StringIO(coada, newline="") as fisier_csv:
+                randuri_noi = _parseaza_randuri(fisier_csv, dialect, nume_coloane_curatate, mapare_intern_csv,
+                                                mod_rapid, cu_antet=False)
+        except Exception:
+            return None
+
+    stare_noua = dict(stare_parsare)
+    stare_noua.update({
+        'offset': len(continut),
+        'hash_prefix': hash_continut.hexdigest(),
+        'mtime_ns': info.st_mtime_ns,
+        'linie_completa': continut.endswith(b'\n'),
+        'numar_randuri': stare_parsare['numar_randuri'] + len(randuri_noi),
+    })
+    return randuri_noi, stare_noua
 
 # --- Funcție principală pentru calculul indicatorilor unui ogar ---
-def calculeaza_indicatori_ogar(istoric_ogar, pista_cursa, distanta_cursa, box_curent, data_cursa_curenta):
+@cronometrat('indicatori.calcul')
+def calculeaza_indicatori_ogar(istoric_ogar, pista_cursa, distanta_cursa, box_curent, data_cursa_curenta, istoric_relevant=None):
     """
     Calculează indicatori statistici relevanți pentru un ogar pe baza istoricului său.
     Include și procentele pentru probleme și alergare liberă REMARK și indicatorii de curbe.
+    istoric_relevant: rândurile deja filtrate pe Pista+Distanta (ex. din HistoryIndex); dacă lipsește,
+    filtrarea se face aici (cu aceeași ordine, cele mai recente curse primele). Varsta/Sex se iau din primul
+    rând relevant care le are.
     """
     cel_mai_bun_timp = TIMP_MAX_NECUNOSCUT
     timp_mediu = TIMP_MAX_NECUNOSCUT
@@ -297,7 +858,6 @@ def calculeaza_indicatori_ogar(istoric_ogar, pista_cursa, distanta_cursa, box_cu
     sex = None
     grad_istoric = None
 
-    ultima_data_relevanta = None
     zile_de_la_ultima_cursa = None
     status_recent = 'No History'
 
@@ -355,22 +915,25 @@ def calculeaza_indicatori_ogar(istoric_ogar, pista_cursa, distanta_cursa, box_cu
             'Stil_Curba': None
         }
 
-    istoric_relevant = [
-        r for r in istoric_ogar
-        if r.get('Pista') == pista_cursa and
-           r.get('Distanta Cursei (m)') == distanta_cursa
-    ]
+    if istoric_relevant is None:
+        pista_cursa = interneaza(pista_cursa)  # pistele din rânduri sunt internate: comparația se oprește la identitate
+        # Aceeași ordine ca HistoryIndex.randuri_relevante (cele mai recente primele): rezultatul nu depinde de apelant
+        istoric_relevant = sorted((
+            r for r in istoric_ogar
+            if r.get('Pista') == pista_cursa and
+               r.get('Distanta Cursei (m)') == distanta_cursa
+        ), key=_cheie_data_descrescator)
+    numara('randuri_filtrate', len(istoric_relevant))
 
     # Calcul probabilitate probleme și alergare liberă din REMARK & colectare curbe
     for r in istoric_relevant:
         # REMARK
-        remark = r.get('REMARK', '')
-        if remark is not None:
-            remark_l = remark.lower()
+        if r.get('REMARK', '') is not None:
+            are_probleme, alergare_libera = flaguri_remark(r)
             total_curse_remark += 1
-            if any(cuvant.lower() in remark_l for cuvant in PROBLEM_KEYWORDS):
+            if are_probleme:
                 curse_cu_probleme += 1
-            if any(cuvant.lower() in remark_l for cuvant in CLEAR_RUN_KEYWORDS):
+            if alergare_libera:
                 curse_alergare_libera += 1
         # CURBA
         pozitii, media, poz_ultima, diff = extrage_indicatori_curba(r.get('CURBA', r.get('Curba', '')))
@@ -381,6 +944,9 @@ def calculeaza_indicatori_ogar(istoric_ogar, pista_cursa, distanta_cursa, box_cu
         if diff is not None:
             diferente_prima_ultima.append(diff)
 
+    numara('remark_probleme', curse_cu_probleme)
+    numara('remark_liber', curse_alergare_libera)
+
     probabilitate_probleme = (curse_cu_probleme / total_curse_remark) if total_curse_remark > 0 else None
     probabilitate_liber = (curse_alergare_libera / total_curse_remark) if total_curse_remark > 0 else None
 
@@ -426,33 +992,7 @@ def calculeaza_indicatori_ogar(istoric_ogar, pista_cursa, distanta_cursa, box_cu
             grad_istoric = str(ultimul_rand.get('Grad Cursa')).strip()
             gasit_istoric_grad = True
 
-        if data_cursa_curenta is not None and gasit_istoric_recenta and ultima_data is not None:
-            ultima_data_relevanta = ultima_data
-            if ultima_data_relevanta <= data_cursa_curenta:
-                diferenta = data_cursa_curenta - ultima_data_relevanta
-                zile_de_la_ultima_cursa = diferenta.days
-                if zile_de_la_ultima_cursa is not None:
-                    if zile_de_la_ultima_cursa <= RECENCY_THRESHOLD_RECENT_DAYS:
-                        status_recent = 'Very Recent'
-                    elif zile_de_la_ultima_cursa <= RECENCY_THRESHOLD_MODERATE_DAYS:
-                        status_recent = 'Recent'
-                    elif zile_de_la_ultima_cursa <= RECENCY_THRESHOLD_OLD_DAYS:
-                        status_recent = 'Moderate'
-                    else:
-                        status_recent = 'Old'
-                else:
-                    status_recent = 'N/A Date'
-            else:
-                status_recent = 'N/A Date'
-                zile_de_la_ultima_cursa = None
-        else:
-            status_recent = 'N/A Date'
-
-        if not istoric_relevant:
-            status_recent = 'No History'
-            gasit_istoric_recenta = False
-        elif data_cursa_curenta is None or not gasit_istoric_recenta or ultima_data is None:
-            status_recent = 'N/A Date'
+        status_recent, zile_de_la_ultima_cursa = determina_status_recenta(ultima_data, data_cursa_curenta)
 
         timpi_finali_validi = [r['Timp Final (s)'] for r in istoric_relevant
                                if r.get('Timp Final (s)') is not None and r.get('Timp Final (s)') > 0.0]
@@ -530,43 +1070,13 @@ def calculeaza_indicatori_ogar(istoric_ogar, pista_cursa, distanta_cursa, box_cu
         'Stil_Curba': stil_curba_ogar
     }
 
-# ------------------- FUNCȚII PREDICȚIE, SIMULARE, TESTARE PONDERI -------------------
-
-def calculeaza_timp_prezis_combinat(indicatori_ogar, greutati_timp_final_aplicate):
+# --- Ajustările aplicate peste timpul de bază (independente de ponderile timpilor finali) ---
+@cronometrat('predictie.ajustari')
+def calculeaza_ajustari(indicatori_ogar):
     """
-    Calculează timpul prezis combinat pentru un ogar, incluzând ajustările pentru box, vârstă, sex, poziție, grad, recență, REMARK și CURBA.
-    Adaugă validări și logging pentru valori neobișnuite, inclusiv numele ogarului și detalierea ajustărilor.
+    Returnează ajustările (secunde) pentru box, vârstă, sex, poziție, grad, recență, REMARK și CURBA,
+    în ordinea în care se adună la timpul de bază.
     """
-    timp_prezis_combinat_baza = TIMP_MAX_NECUNOSCUT
-
-    weight_best = greutati_timp_final_aplicate.get('best', 0)
-    weight_avg = greutati_timp_final_aplicate.get('average', 0)
-    weight_trap = greutati_timp_final_aplicate.get('average_trap', 0)
-    total_weight = weight_best + weight_avg + weight_trap
-    if weight_best < 0 or weight_avg < 0 or weight_trap < 0:
-        logging.warning("[WARN] Ponderile nu pot fi negative! best=%.2f, avg=%.2f, trap=%.2f", weight_best, weight_avg, weight_trap)
-    if total_weight <= 0:
-        logging.warning("[WARN] Suma ponderilor <= 0 – rezultatele pot fi aberante! best=%.2f, avg=%.2f, trap=%.2f", weight_best, weight_avg, weight_trap)
-
-    indicatori_pentru_baza_ponderata_doar_general = []
-    if indicatori_ogar.get('Cel_Mai_Bun_Timp', TIMP_MAX_NECUNOSCUT) < TIMP_MAX_NECUNOSCUT:
-        indicatori_pentru_baza_ponderata_doar_general.append(('best', indicatori_ogar['Cel_Mai_Bun_Timp']))
-    if indicatori_ogar.get('Timp_Mediu', TIMP_MAX_NECUNOSCUT) < TIMP_MAX_NECUNOSCUT:
-        indicatori_pentru_baza_ponderata_doar_general.append(('average', indicatori_ogar['Timp_Mediu']))
-
-    applicable_weights_sum_baza_generala = 0
-    for tip_indicator, valoare_indicator in indicatori_pentru_baza_ponderata_doar_general:
-        if tip_indicator in greutati_timp_final_aplicate and greutati_timp_final_aplicate[tip_indicator] > 0:
-            applicable_weights_sum_baza_generala += greutati_timp_final_aplicate[tip_indicator]
-
-    suma_ponderata_baza_generala = 0
-    if applicable_weights_sum_baza_generala > 0:
-        for tip_indicator, valoare_indicator in indicatori_pentru_baza_ponderata_doar_general:
-            if tip_indicator in greutati_timp_final_aplicate:
-                normalized_weight = greutati_timp_final_aplicate[tip_indicator] / applicable_weights_sum_baza_generala
-                suma_ponderata_baza_generala += valoare_indicator * normalized_weight
-        timp_prezis_combinat_baza = suma_ponderata_baza_generala
-
     ajustare_box_specifica = 0.0
     timp_mediu_general = indicatori_ogar.get('Timp_Mediu')
     timp_mediu_box_curent = indicatori_ogar.get('Timp_Mediu_Box_Specific')
@@ -587,10 +1097,10 @@ def calculeaza_timp_prezis_combinat(indicatori_ogar, greutati_timp_final_aplicat
     if sex is not None and isinstance(sex, str):
         sex_upper = sex.strip().upper()
         if sex_upper not in SEX_ADJUSTMENTS:
-            logging.warning("Sex necunoscut '%s' pentru ogarul %s. Folosesc ajustarea default.", sex_upper, indicatori_ogar.get('Nume Ogar', '<FĂRĂ NUME>'))
+            raporteaza('sex_necunoscut', indicatori_ogar.get('Nume Ogar'), sex_upper)
         ajustare_sex = SEX_ADJUSTMENTS.get(sex_upper, SEX_ADJUSTMENTS.get('N/A', 0.0))
     else:
-        logging.warning("Sex lipsă pentru ogarul %s. Folosesc ajustarea default.", indicatori_ogar.get('Nume Ogar', '<FĂRĂ NUME>'))
+        raporteaza('sex_lipsa', indicatori_ogar.get('Nume Ogar'))
 
     ajustare_box_pozitie = 0.0
     medie_box_start = indicatori_ogar.get('Medie_Box_Start')
@@ -604,19 +1114,19 @@ def calculeaza_timp_prezis_combinat(indicatori_ogar, greutati_timp_final_aplicat
     if race_grade is not None and isinstance(race_grade, str) and race_grade.strip() != '':
         grad_upper = race_grade.strip().upper()
         if grad_upper not in GRADE_ADJUSTMENTS:
-            logging.warning("Grad necunoscut '%s' pentru ogarul %s. Folosesc ajustarea default.", grad_upper, indicatori_ogar.get('Nume Ogar', '<FĂRĂ NUME>'))
+            raporteaza('grad_necunoscut', indicatori_ogar.get('Nume Ogar'), grad_upper)
         ajustare_grad = GRADE_ADJUSTMENTS.get(grad_upper, GRADE_ADJUSTMENTS.get('', GRADE_ADJUSTMENTS.get('N/A', 0.0)))
     else:
-        logging.warning("Grad lipsă pentru ogarul %s. Folosesc ajustarea default.", indicatori_ogar.get('Nume Ogar', '<FĂRĂ NUME>'))
+        raporteaza('grad_lipsa', indicatori_ogar.get('Nume Ogar'))
 
     ajustare_recency = 0.0
     recency_status = indicatori_ogar.get('Recency Status')
     if recency_status is not None and isinstance(recency_status, str):
         if recency_status not in RECENCY_ADJUSTMENTS:
-            logging.warning("Recency status necunoscut '%s' pentru ogarul %s. Folosesc ajustarea default.", recency_status, indicatori_ogar.get('Nume Ogar', '<FĂRĂ NUME>'))
+            raporteaza('recency_necunoscut', indicatori_ogar.get('Nume Ogar'), recency_status)
         ajustare_recency = RECENCY_ADJUSTMENTS.get(recency_status, 0.0)
     else:
-        logging.warning("Recency status lipsă pentru ogarul %s. Folosesc ajustarea default.", indicatori_ogar.get('Nume Ogar', '<FĂRĂ NUME>'))
+        raporteaza('recency_lipsa', indicatori_ogar.get('Nume Ogar'))
 
     prob_probleme = indicatori_ogar.get('Prob_Probleme', 0)
     prob_liber = indicatori_ogar.get('Prob_Liber', 0)
@@ -635,26 +1145,73 @@ def calculeaza_timp_prezis_combinat(indicatori_ogar, greutati_timp_final_aplicat
         elif diff_curba > 1.0:
             ajustare_curba = COEFICIENT_PENALIZARE_CURBA_EARLY
 
+    return {
+        'box_specific': ajustare_box_specifica,
+        'varsta': ajustare_varsta,
+        'sex': ajustare_sex,
+        'box_pozitie': ajustare_box_pozitie,
+        'grad': ajustare_grad,
+        'recency': ajustare_recency,
+        'remark': ajustare_remark,
+        'curba': ajustare_curba,
+    }
+
+# ------------------- FUNCȚII PREDICȚIE, SIMULARE, TESTARE PONDERI -------------------
+
+@cronometrat('predictie.timp_combinat')
+def calculeaza_timp_prezis_combinat(indicatori_ogar, greutati_timp_final_aplicate):
+    """
+    Calculează timpul prezis combinat pentru un ogar, incluzând ajustările pentru box, vârstă, sex, poziție, grad, recență, REMARK și CURBA.
+    Valorile neobișnuite (ponderi invalide, ajustare totală foarte mare) sunt raportate în diagnostice, cu detalierea ajustărilor.
+    """
+    timp_prezis_combinat_baza = TIMP_MAX_NECUNOSCUT
+
+    weight_best = greutati_timp_final_aplicate.get('best', 0)
+    weight_avg = greutati_timp_final_aplicate.get('average', 0)
+    weight_trap = greutati_timp_final_aplicate.get('average_trap', 0)
+    total_weight = weight_best + weight_avg + weight_trap
+    if weight_best < 0 or weight_avg < 0 or weight_trap < 0:
+        raporteaza('ponderi_negative', valoare=f"best={weight_best:.2f}, avg={weight_avg:.2f}, trap={weight_trap:.2f}")
+    if total_weight <= 0:
+        raporteaza('suma_ponderi_nula', valoare=f"best={weight_best:.2f}, avg={weight_avg:.2f}, trap={weight_trap:.2f}")
+
+    indicatori_pentru_baza_ponderata_doar_general = []
+    if indicatori_ogar.get('Cel_Mai_Bun_Timp', TIMP_MAX_NECUNOSCUT) < TIMP_MAX_NECUNOSCUT:
+        indicatori_pentru_baza_ponderata_doar_general.append(('best', indicatori_ogar['Cel_Mai_Bun_Timp']))
+    if indicatori_ogar.get('Timp_Mediu', TIMP_MAX_NECUNOSCUT) < TIMP_MAX_NECUNOSCUT:
+        indicatori_pentru_baza_ponderata_doar_general.append(('average', indicatori_ogar['Timp_Mediu']))
+
+    applicable_weights_sum_baza_generala = 0
+    for tip_indicator, valoare_indicator in indicatori_pentru_baza_ponderata_doar_general:
+        if tip_indicator in greutati_timp_final_aplicate and greutati_timp_final_aplicate[tip_indicator] > 0:
+            applicable_weights_sum_baza_generala += greutati_timp_final_aplicate[tip_indicator]
+
+    suma_ponderata_baza_generala = 0
+    if applicable_weights_sum_baza_generala > 0:
+        for tip_indicator, valoare_indicator in indicatori_pentru_baza_ponderata_doar_general:
+            if tip_indicator in greutati_timp_final_aplicate:
+                normalized_weight = greutati_timp_final_aplicate[tip_indicator] / applicable_weights_sum_baza_generala
+                suma_ponderata_baza_generala += valoare_indicator * normalized_weight
+        timp_prezis_combinat_baza = suma_ponderata_baza_generala
+
+    ajustari = calculeaza_ajustari(indicatori_ogar)
+    ajustare_box_specifica = ajustari['box_specific']
+    ajustare_varsta = ajustari['varsta']
+    ajustare_sex = ajustari['sex']
+    ajustare_box_pozitie = ajustari['box_pozitie']
+    ajustare_grad = ajustari['grad']
+    ajustare_recency = ajustari['recency']
+    ajustare_remark = ajustari['remark']
+    ajustare_curba = ajustari['curba']
+
     ajustare_totala = sum([
         ajustare_box_specifica, ajustare_varsta, ajustare_sex, ajustare_box_pozitie,
         ajustare_grad, ajustare_recency, ajustare_remark, ajustare_curba
     ])
 
-    nume_ogar = indicatori_ogar.get('Nume Ogar', '')
-    if not nume_ogar or not isinstance(nume_ogar, str) or not nume_ogar.strip():
-        nume_ogar = "<FĂRĂ NUME>"
-
     if abs(ajustare_totala) > 1.0:
-        logging.warning(
-            "Ajustare totală foarte mare (%.2fs) pentru ogarul %s! Verifică datele istorice.",
-            ajustare_totala, nume_ogar
-        )
-        logging.warning(
-            "Detaliu ajustări pentru %s: box_specific=%.2f, varsta=%.2f, sex=%.2f, box_pozitie=%.2f, grad=%.2f, recency=%.2f, remark=%.2f, curba=%.2f",
-            nume_ogar,
-            ajustare_box_specifica, ajustare_varsta, ajustare_sex, ajustare_box_pozitie,
-            ajustare_grad, ajustare_recency, ajustare_remark, ajustare_curba
-        )
+        raporteaza('ajustare_mare', indicatori_ogar.get('Nume Ogar'),
+                   detalii={'total': round(ajustare_totala, 2), **{cheie: round(valoare, 2) for cheie, valoare in ajustari.items()}})
 
     timp_prezis_final = timp_prezis_combinat_baza
     if timp_prezis_combinat_baza < TIMP_MAX_NECUNOSCUT:
@@ -669,10 +1226,88 @@ def calculeaza_timp_prezis_combinat(indicatori_ogar, greutati_timp_final_aplicat
 
     return timp_prezis_final
 
+# --- Data cursei curente (DD/MM/YYYY) ---
+def parseaza_data_cursa_curenta(data_cursa_str, lista_erori):
+    """
+    Returnează data cursei curente ca datetime sau None (cu avertisment dacă lipsește ori e invalidă).
+    """
+    current_race_date = None
+    if data_cursa_str:
+        try:
+            current_race_date = datetime.strptime(data_cursa_str.strip(), '%d/%m/%Y')
+        except ValueError:
+            lista_erori.append(f"Avertisment: Formatul datei cursei curente '{data_cursa_str}' nu este valid (așteptat DD/MM/YYYY). Ajustarea Recenței nu poate fi calculată pentru această cursă.")
+        except Exception as e:
+            lista_erori.append(f"Avertisment: Eroare neasteptata la parsarea datei cursei curente '{data_cursa_str}': {e}. Ajustarea Recenței nu poate fi calculată.")
+    else:
+        if data_cursa_str is not None and data_cursa_str.strip() == '':
+            lista_erori.append("Avertisment: Data cursei curente nu a fost introdusă. Ajustarea Recenței nu poate fi calculată.")
+    return current_race_date
+
+# --- Indicatorii participanților la o cursă (independenți de ponderi) ---
+def calculeaza_indicatori_participanti(detalii_cursa, index_istoric, current_race_date, progres=None):
+    """
+    Returnează [(nume_ogar, indicatori_ogar), ...] în ordinea participanților din detalii_cursa.
+    index_istoric poate fi un HistoryIndex sau un backend cu metoda indicatori_ogar(...).
+    progres: funcție opțională apelată cu un mesaj înaintea fiecărui ogar.
+    """
+    pista_cursa_curenta = detalii_cursa.get('pista')
+    distanta_cursa_curenta = detalii_cursa.get('distanta_m')
+    grad_cursa_curenta = detalii_cursa.get('grad', '').strip()
+
+    rezultate = []
+    numar_ogari = len(detalii_cursa['ogari_participanti'])
+    for i, (ogar_participanti_noua_cursa, box_nou) in enumerate(detalii_cursa['ogari_participanti']):
+        if progres is not None:
+            progres(f"Indicatori: {ogar_participanti_noua_cursa} ({i + 1}/{numar_ogari})")
+        with cronometru('indicatori.ogar'):
+            if hasattr(index_istoric, 'indicatori_ogar'):
+                indicatori_ogar = index_istoric.indicatori_ogar(
+                    ogar_participanti_noua_cursa,
+                    pista_cursa_curenta,
+                    distanta_cursa_curenta,
+                    box_nou,
+                    current_race_date
+                )
+            else:
+                with cronometru('indicatori.filtrare'):
+                    istoric_ogar = index_istoric.randuri_ogar(ogar_participanti_noua_cursa)
+                    istoric_relevant = index_istoric.randuri_relevante(ogar_participanti_noua_cursa, pista_cursa_curenta, distanta_cursa_curenta)
+                indicatori_ogar = calculeaza_indicatori_ogar(
+                    istoric_ogar,
+                    pista_cursa_curenta,
+                    distanta_cursa_curenta,
+                    box_nou,
+                    current_race_date,
+                    istoric_relevant=istoric_relevant,
+                )
+
+        indicatori_ogar['Grad Cursa Curenta'] = grad_cursa_curenta
+        rezultate.append((ogar_participanti_noua_cursa, indicatori_ogar))
+    return rezultate
+
 # --- Funcția principală de Predicție ---
-def prezice_cursa_combinata(fisier_path, detalii_cursa, greutati_timp_final_override=None):
+@cu_diagnostice('predictie')
+@cronometrat('predictie')
+def prezice_cursa_combinata(fisier_path, detalii_cursa, greutati_timp_final_override=None, foloseste_cache=None, index_istoric=None,
+                            progres=None):
+    """
+    Prezice ordinea cursei. Dacă index_istoric este dat, fișierul nu mai este citit; poate fi un
+    HistoryIndex sau un backend cu metoda indicatori_ogar(...) (ex. IstoricColumnar).
+    progres: funcție opțională apelată cu un mesaj la fiecare etapă (încărcare, fiecare ogar). O excepție
+    ridicată din ea întrerupe predicția - așa anulează GUI-ul o rulare depășită.
+    """
     erori_predictie = []
-    istoric_complet = citeste_si_parseaza_istoric(fisier_path, erori_predictie)
+    if index_istoric is None:
+        if progres is not None:
+            progres(f"Încărcare istoric: {os.path.basename(str(fisier_path))}")
+        with cronometru('istoric.incarcare'):
+            if AGREGATE_OGARI_ACTIVAT:
+                istoric_complet, index_istoric = incarca_agregate_ogari(fisier_path, erori_predictie, foloseste_cache=foloseste_cache)
+            else:
+                istoric_complet, index_istoric = incarca_istoric_indexat(fisier_path, erori_predictie, foloseste_cache=foloseste_cache)
+    else:
+        istoric_complet = getattr(index_istoric, 'istoric', [])
 
     if [err for err in erori_predictie if "FATALA" in err]:
         return [], istoric_complet, erori_predictie
@@ -681,57 +1316,29 @@ def prezice_cursa_combinata(fisier_path, detalii_cursa, greutati_timp_final_over
         erori_predictie.append("Eroare: Nu au fost introdusi ogari participanți pentru cursa nouă.")
         return [], istoric_complet, erori_predictie
 
-    pista_cursa_curenta = detalii_cursa.get('pista')
-    distanta_cursa_curenta = detalii_cursa.get('distanta_m')
-    grad_cursa_curenta = detalii_cursa.get('grad', '').strip()
+    if progres is not None:
+        progres(f"Istoric încărcat: {len(istoric_complet)} rânduri")
+
     data_cursa_str = detalii_cursa.get('data_cursa')
 
-    current_race_date = None
-    if data_cursa_str:
-        try:
-            current_race_date = datetime.strptime(data_cursa_str.strip(), '%d/%m/%Y')
-        except ValueError:
-            erori_predictie.append(f"Avertisment: Formatul datei cursei curente '{data_cursa_str}' nu este valid (așteptat DD/MM/YYYY). Ajustarea Recenței nu poate fi calculată pentru această cursă.")
-        except Exception as e:
-            erori_predictie.append(f"Avertisment: Eroare neasteptata la parsarea datei cursei curente '{data_cursa_str}': {e}. Ajustarea Recenței nu poate fi calculată.")
-    else:
-        if data_cursa_str is not None and data_cursa_str.strip() == '':
-            erori_predictie.append("Avertisment: Data cursei curente nu a fost introdusă. Ajustarea Recenței nu poate fi calculată.")
+    current_race_date = parseaza_data_cursa_curenta(data_cursa_str, erori_predictie)
 
     if greutati_timp_final_override is None:
-        greutati_timp_final_aplicate = {
-            'best': 0.33,
-            'average': 0.34,
-            'average_trap': 0.33
-        }
+        greutati_timp_final_aplicate = dict(PONDERI_TIMP_FINAL_IMPLICITE)
     else:
         greutati_timp_final_aplicate = greutati_timp_final_override
 
     predictie_rezultate = []
 
-    for ogar_participanti_noua_cursa, box_nou in detalii_cursa['ogari_participanti']:
-        istoric_ogas_curent = [
-            r for r in istoric_complet
-            if r.get('Nume Ogar') == ogar_participanti_noua_cursa
-        ]
-
-        indicatori_ogar = calculeaza_indicatori_ogar(
-            istoric_ogas_curent,
-            pista_cursa_curenta,
-            distanta_cursa_curenta,
-            box_nou,
-            current_race_date
-        )
-
-        indicatori_ogar['Grad Cursa Curenta'] = grad_cursa_curenta
-
+    participanti = calculeaza_indicatori_participanti(detalii_cursa, index_istoric, current_race_date, progres=progres)
+    for ogar_participanti_noua_cursa, indicatori_ogar in participanti:
+        indicatori_ogar['Nume Ogar'] = ogar_participanti_noua_cursa
         timp_prezis_combinat = calculeaza_timp_prezis_combinat(
             indicatori_ogar,
             greutati_timp_final_aplicate
         )
 
         indicatori_ogar['Timp_Prezis_Combinat'] = timp_prezis_combinat
-        indicatori_ogar['Nume Ogar'] = ogar_participanti_noua_cursa
 
         predictie_rezultate.append(indicatori_ogar)
 
@@ -740,15 +1347,131 @@ def prezice_cursa_combinata(fisier_path, detalii_cursa, greutati_timp_final_over
     return predictie_sortata, istoric_complet, erori_predictie
 
 # --- Funcția de Simulare ---
-def simuleaza_cursa(predictie_sortata, detalii_cursa, istoric_complet):
+class RezultatSimulare:
     """
-    Simulează desfășurarea cursei la punctele intermediare și la finish, pe baza timpilor prezisi și secționali.
+    Rezultatul structurat al simulării deterministe:
+      puncte       - distanțele punctelor simulate (crescător, inclusiv Start și Finish);
+      nume_puncte  - numele afișate ale punctelor, în aceeași ordine;
+      ogari        - (nume, box) pentru fiecare ogar, în ordinea predicției;
+      timpi        - timpi[p][o] = timpul estimat al ogarului o la punctul p (TIMP_MAX_NECUNOSCUT = necunoscut);
+      clasamente   - clasamente[p] = indicii ogarilor la punctul p, cel mai rapid primul.
+    Obiectul este partajat prin memoizare, deci toate câmpurile sunt tupluri.
     """
-    output_simulare = ""
+    __slots__ = ('pista', 'distanta_totala', 'puncte_definite', 'puncte', 'nume_puncte', 'ogari', 'timpi', 'clasamente')
+
+    def __init__(self, pista, distanta_totala, puncte_definite, puncte, nume_puncte, ogari, timpi, clasamente):
+        self.pista = pista
+        self.distanta_totala = distanta_totala
+        self.puncte_definite = puncte_definite
+        self.puncte = puncte
+        self.nume_puncte = nume_puncte
+        self.ogari = ogari
+        self.timpi = timpi
+        self.clasamente = clasamente
+
+    def ca_dict(self):
+        """
+        Forma serializabilă (JSON): un element per punct, cu ogarii în ordinea de la acel punct.
+        """
+        return {
+            'pista': self.pista,
+            'distanta_m': self.distanta_totala,
+            'puncte_definite': self.puncte_definite,
+            'puncte': [{
+                'distanta_m': distanta,
+                'nume': self.nume_puncte[p],
+                'clasament': [{
+                    'loc': loc + 1,
+                    'nume': self.ogari[o][0],
+                    'box': self.ogari[o][1],
+                    'timp_estimat': self.timpi[p][o] if self.timpi[p][o] < TIMP_MAX_NECUNOSCUT else None,
+                } for loc, o in enumerate(self.clasamente[p])],
+            } for p, distanta in enumerate(self.puncte)],
+        }
 
-    distanta_totala = detalii_cursa.get('distanta_m', 0)
-    pista_cursa = detalii_cursa.get('pista', 'necunoscută')
 
+def _nume_puncte_simulare(puncte_simulare, distanta_totala):
+    nume_puncte_map = {0: "Start", distanta_totala: "Finish"}
+    distante_intermediare_sortate = sorted([d for d in puncte_simulare if d > 0 and d < distanta_totala])
+    for i, dist in enumerate(distante_intermediare_sortate):
+        if i == 0:
+            nume_puncte_map[dist] = f"Primul Punct (~{dist}m)"
+        elif i == len(distante_intermediare_sortate) - 1:
+            nume_puncte_map[dist] = f"Ultimul Punct Interm. (~{dist}m)"
+        else:
+            nume_puncte_map[dist] = f"Punct Interm. (~{dist}m)"
+    return nume_puncte_map
+
+
+def _timpi_estimati_ogar(timp_final_prezis, cel_mai_bun_sectional, puncte_simulare, distanta_totala, are_puncte_definite):
+    """
+    Timpii estimați ai unui ogar la punctele simulării: primul punct din cel mai bun secțional (dacă e plauzibil)
+    sau din viteza medie, restul liniar cu viteza rămasă până la finish.
+    """
+    timpi_estimati = {}
+    timpi_estimati[0] = 0.0
+
+    if timp_final_prezis >= TIMP_MAX_NECUNOSCUT:
+        for dist in puncte_simulare:
+            timpi_estimati[dist] = TIMP_MAX_NECUNOSCUT
+        return timpi_estimati
+
+    timpi_estimati[distanta_totala] = timp_final_prezis
+
+    viteza_medie_totala = TIMP_MAX_NECUNOSCUT
+    if distanta_totala > 0 and timp_final_prezis is not None and timp_final_prezis > 0:
+        viteza_medie_totala = distanta_totala / timp_final_prezis
+
+    if are_puncte_definite and viteza_medie_totala < TIMP_MAX_NECUNOSCUT:
+        timp_estimat_primul_punct = TIMP_MAX_NECUNOSCUT
+        distante_simulare_sortate_non_zero = sorted([d for d in puncte_simulare if d > 0])
+        distanta_primul_punct_sim = distante_simulare_sortate_non_zero[0] if distante_simulare_sortate_non_zero else None
+
+        if distanta_primul_punct_sim is not None and distanta_primul_punct_sim > 0:
+            sectional_valid = False
+            if cel_mai_bun_sectional is not None and cel_mai_bun_sectional < TIMP_MAX_NECUNOSCUT and cel_mai_bun_sectional > 0:
+                if cel_mai_bun_sectional < timp_final_prezis:
+                    timp_estimat_primul_punct = cel_mai_bun_sectional
+                    sectional_valid = True
+            if not sectional_valid:
+                if distanta_totala > 0 and viteza_medie_totala > 0:
+                    timp_estimat_primul_punct = distanta_primul_punct_sim / viteza_medie_totala
+                else:
+                    timp_estimat_primul_punct = TIMP_MAX_NECUNOSCUT
+
+            if timp_estimat_primul_punct is not None and timp_estimat_primul_punct < TIMP_MAX_NECUNOSCUT:
+                timpi_estimati[distanta_primul_punct_sim] = timp_estimat_primul_punct
+
+        if distanta_primul_punct_sim is not None and timp_estimat_primul_punct is not None and timp_estimat_primul_punct < TIMP_MAX_NECUNOSCUT:
+            distanta_ramasa = distanta_totala - distanta_primul_punct_sim
+            timp_ramas = timp_final_prezis - timp_estimat_primul_punct
+
+            viteza_dupa_primul_punct = TIMP_MAX_NECUNOSCUT
+            if distanta_ramasa > 0 and timp_ramas is not None and timp_ramas > 0:
+                viteza_dupa_primul_punct = distanta_ramasa / timp_ramas
+
+            if viteza_dupa_primul_punct < TIMP_MAX_NECUNOSCUT and viteza_dupa_primul_punct > 0:
+                for dist_punct_curent in puncte_simulare:
+                    if dist_punct_curent > distanta_primul_punct_sim and dist_punct_curent < distanta_totala:
+                        timp_estimat = timp_estimat_primul_punct + (dist_punct_curent - distanta_primul_punct_sim) / viteza_dupa_primul_punct
+                        timpi_estimati[dist_punct_curent] = timp_estimat
+                    elif dist_punct_curent not in timpi_estimati:
+                        timpi_estimati[dist_punct_curent] = TIMP_MAX_NECUNOSCUT
+
+        elif viteza_medie_totala < TIMP_MAX_NECUNOSCUT and viteza_medie_totala > 0:
+            for dist_punct_curent in puncte_simulare:
+                if dist_punct_curent > 0 and dist_punct_curent < distanta_totala:
+                    timp_estimat = dist_punct_curent / viteza_medie_totala
+                    timpi_estimati[dist_punct_curent] = timp_estimat
+                elif dist_punct_curent not in timpi_estimati:
+                    timpi_estimati[dist_punct_curent] = TIMP_MAX_NECUNOSCUT
+
+    return timpi_estimati
+
+
+@lru_cache(maxsize=SIMULARE_MEMO_MAX_INTRARI)
+def _simuleaza_cursa_memo(pista_cursa, distanta_totala, ogari_intrare):
+    # ogari_intrare: tuplu de (nume, box, timp final prezis, cel mai bun secțional) - singurele date folosite
     distante_specifice_cursa = None
     if pista_cursa in DISTANTE_PUNCTE_SIMULARE and \
        isinstance(distanta_totala, int) and distanta_totala > 0 and \
@@ -756,141 +1479,90 @@ def simuleaza_cursa(predictie_sortata, detalii_cursa, istoric_complet):
 
         distante_specifice_cursa = DISTANTE_PUNCTE_SIMULARE[pista_cursa].get(distanta_totala)
 
-    if distante_specifice_cursa is None:
-        output_simulare += f"\nSimulare: Nu am distanțe definite pentru punctele intermediare pentru pista '{pista_cursa}', distanța {distanta_totala}m.\n"
-        output_simulare += "Simularea la punctele intermediare nu poate rula detaliat. Afișez doar Start și Finish (bazat pe timpii prezisi).\n"
-        puncte_simulare = [0, distanta_totala]
-        nume_puncte_afisare = ["Start", "Finish"]
-    else:
+    are_puncte_definite = distante_specifice_cursa is not None
+    if are_puncte_definite:
         puncte_simulare = sorted(list(set([0] + distante_specifice_cursa + [distanta_totala])))
-        nume_puncte_map = {0: "Start", distanta_totala: "Finish"}
-        distante_intermediare_sortate = sorted([d for d in puncte_simulare if d > 0 and d < distanta_totala])
-        for i, dist in enumerate(distante_intermediare_sortate):
-            if i == 0:
-                nume_puncte_map[dist] = f"Primul Punct (~{dist}m)"
-            elif i == len(distante_intermediare_sortate) - 1:
-                nume_puncte_map[dist] = f"Ultimul Punct Interm. (~{dist}m)"
-            else:
-                nume_puncte_map[dist] = f"Punct Interm. (~{dist}m)"
-
-        nume_puncte_afisare = [nume_puncte_map.get(d, f"{d}m") for d in puncte_simulare]
-
-    output_simulare += f"\n--- Simularea Cursei la '{pista_cursa}', {distanta_totala}m ---\n"
-
-    simulare_ogari = []
-    for rez in predictie_sortata:
-        ogar_nume = rez.get('Nume Ogar', 'N/A')
-        ogar_box = rez.get('Box Nou', 'N/A')
-        timp_final_prezis = rez.get('Timp_Prezis_Combinat', TIMP_MAX_NECUNOSCUT)
-        cel_mai_bun_sectional = rez.get('Cel_Mai_Bun_Sectional', TIMP_MAX_NECUNOSCUT)
-
-        timpi_estimati = {}
-        timpi_estimati[0] = 0.0
-
-        if timp_final_prezis >= TIMP_MAX_NECUNOSCUT:
-            for dist in puncte_simulare:
-                timpi_estimati[dist] = TIMP_MAX_NECUNOSCUT
-        else:
-            timpi_estimati[distanta_totala] = timp_final_prezis
-
-            viteza_medie_totala = TIMP_MAX_NECUNOSCUT
-            if distanta_totala > 0 and timp_final_prezis is not None and timp_final_prezis > 0:
-                viteza_medie_totala = distanta_totala / timp_final_prezis
-
-            if distante_specifice_cursa is not None and viteza_medie_totala < TIMP_MAX_NECUNOSCUT:
-                timp_estimat_primul_punct = TIMP_MAX_NECUNOSCUT
-                distante_simulare_sortate_non_zero = sorted([d for d in puncte_simulare if d > 0])
-                distanta_primul_punct_sim = distante_simulare_sortate_non_zero[0] if distante_simulare_sortate_non_zero else None
-
-                if distanta_primul_punct_sim is not None and distanta_primul_punct_sim > 0:
-                    sectional_valid = False
-                    if cel_mai_bun_sectional is not None and cel_mai_bun_sectional < TIMP_MAX_NECUNOSCUT and cel_mai_bun_sectional > 0:
-                        timp_est_total_pe_viteza_medie = timp_final_prezis
-                        if timp_est_total_pe_viteza_medie is not None and cel_mai_bun_sectional < timp_est_total_pe_viteza_medie:
-                            timp_estimat_primul_punct = cel_mai_bun_sectional
-                            sectional_valid = True
-                        else:
-                            pass
-                    if not sectional_valid:
-                        if distanta_totala > 0 and viteza_medie_totala > 0:
-                            timp_estimat_primul_punct = distanta_primul_punct_sim / viteza_medie_totala
-                        else:
-                            timp_estimat_primul_punct = TIMP_MAX_NECUNOSCUT
-
-                    if timp_estimat_primul_punct is not None and timp_estimat_primul_punct < TIMP_MAX_NECUNOSCUT:
-                        timpi_estimati[distanta_primul_punct_sim] = timp_estimat_primul_punct
-
-                if distanta_primul_punct_sim is not None and timp_estimat_primul_punct is not None and timp_estimat_primul_punct < TIMP_MAX_NECUNOSCUT:
-                    distanta_ramasa = distanta_totala - distanta_primul_punct_sim
-                    timp_ramas = timp_final_prezis - timp_estimat_primul_punct
-
-                    viteza_dupa_primul_punct = TIMP_MAX_NECUNOSCUT
-                    if distanta_ramasa > 0 and timp_ramas is not None and timp_ramas > 0:
-                        viteza_dupa_primul_punct = distanta_ramasa / timp_ramas
-
-                    if viteza_dupa_primul_punct < TIMP_MAX_NECUNOSCUT and viteza_dupa_primul_punct > 0:
-                        for dist_punct_curent in puncte_simulare:
-                            if dist_punct_curent > distanta_primul_punct_sim and dist_punct_curent < distanta_totala:
-                                timp_estimat = timp_estimat_primul_punct + (dist_punct_curent - distanta_primul_punct_sim) / viteza_dupa_primul_punct
-                                timpi_estimati[dist_punct_curent] = timp_estimat
-                            elif dist_punct_curent not in timpi_estimati:
-                                timpi_estimati[dist_punct_curent] = TIMP_MAX_NECUNOSCUT
-
-                elif viteza_medie_totala < TIMP_MAX_NECUNOSCUT and viteza_medie_totala > 0:
-                    for dist_punct_curent in puncte_simulare:
-                        if dist_punct_curent > 0 and dist_punct_curent < distanta_totala:
-                            timp_estimat = dist_punct_curent / viteza_medie_totala
-                            timpi_estimati[dist_punct_curent] = timp_estimat
-                        elif dist_punct_curent not in timpi_estimati:
-                            timpi_estimati[dist_punct_curent] = TIMP_MAX_NECUNOSCUT
-
-        simulare_ogari.append({
-            'Nume Ogar': ogar_nume,
-            'Box': ogar_box,
-            'TimpiEstimati': timpi_estimati
-        })
-
-    all_sim_points = sorted(list(set(point for ogar in simulare_ogari for point in ogar['TimpiEstimati'].keys())))
-    for ogar in simulare_ogari:
-        for point in all_sim_points:
-            if point not in ogar['TimpiEstimati']:
-                ogar['TimpiEstimati'][point] = TIMP_MAX_NECUNOSCUT
-
-    for distanta_simulare in all_sim_points:
-        nume_punct_afisare = f"{distanta_simulare}m"
-        if distante_specifice_cursa is not None:
-            puncte_generale_mapare_nume = sorted(list(set([0] + distante_specifice_cursa + [distanta_totala])))
-            nume_puncte_map = {0: "Start", distanta_totala: "Finish"}
-            distante_intermediare_sortate_nume = sorted([d for d in puncte_generale_mapare_nume if d > 0 and d < distanta_totala])
-
-            for i, dist in enumerate(distante_intermediare_sortate_nume):
-                if i == 0:
-                    nume_puncte_map[dist] = f"Primul Punct (~{dist}m)"
-                elif i == len(distante_intermediare_sortate_nume) - 1:
-                    nume_puncte_map[dist] = f"Ultimul Punct Interm. (~{dist}m)"
-                else:
-                    nume_puncte_map[dist] = f"Punct Interm. (~{dist}m)"
+        nume_puncte_map = _nume_puncte_simulare(puncte_simulare, distanta_totala)
+    else:
+        puncte_simulare = [0, distanta_totala]
+        nume_puncte_map = {}
+
+    timpi_ogari = [_timpi_estimati_ogar(timp_final, sectional, puncte_simulare, distanta_totala, are_puncte_definite)
+                   for _, _, timp_final, sectional in ogari_intrare]
+
+    puncte = sorted(set(punct for timpi_estimati in timpi_ogari for punct in timpi_estimati))
+    timpi = tuple(tuple(timpi_estimati.get(punct, TIMP_MAX_NECUNOSCUT) for timpi_estimati in timpi_ogari)
+                  for punct in puncte)
+    # sorted() este stabil: la egalitate rămâne ordinea predicției
+    clasamente = tuple(tuple(sorted(range(len(timpi_punct)), key=timpi_punct.__getitem__)) for timpi_punct in timpi)
+
+    return RezultatSimulare(
+        pista=pista_cursa,
+        distanta_totala=distanta_totala,
+        puncte_definite=are_puncte_definite,
+        puncte=tuple(puncte),
+        nume_puncte=tuple(nume_puncte_map.get(punct, f"{punct}m") for punct in puncte),
+        ogari=tuple((nume, box) for nume, box, _, _ in ogari_intrare),
+        timpi=timpi,
+        clasamente=clasamente,
+    )
 
-            nume_punct_afisare = nume_puncte_map.get(distanta_simulare, f"{distanta_simulare}m")
 
-        output_simulare += f"\nLa {nume_punct_afisare} ({distanta_simulare}m):\n"
-        output_simulare += "-" * 30 + "\n"
+@cronometrat('simulare')
+def calculeaza_simulare_cursa(predictie_sortata, detalii_cursa):
+    """
+    Simulează desfășurarea cursei la punctele intermediare și la finish, pe baza timpilor prezisi și secționali.
+    Returnează un RezultatSimulare; rezultatele sunt memoizate per (predicție, pistă, distanță), deci GUI-ul,
+    CLI-ul sau exportul le pot cere din nou fără recalculare.
+    """
+    ogari_intrare = tuple(
+        (rez.get('Nume Ogar', 'N/A'),
+         rez.get('Box Nou', 'N/A'),
+         rez.get('Timp_Prezis_Combinat', TIMP_MAX_NECUNOSCUT),
+         rez.get('Cel_Mai_Bun_Sectional', TIMP_MAX_NECUNOSCUT))
+        for rez in predictie_sortata
+    )
+    pista_cursa = detalii_cursa.get('pista', 'necunoscută')
+    distanta_totala = detalii_cursa.get('distanta_m', 0)
+    try:
+        return _simuleaza_cursa_memo(pista_cursa, distanta_totala, ogari_intrare)
+    except TypeError:  # valori nehashabile în detalii - se calculează fără memoizare
+        return _simuleaza_cursa_memo.__wrapped__(pista_cursa, distanta_totala, ogari_intrare)
 
-        ogari_la_punct = sorted(
-            simulare_ogari,
-            key=lambda x: x['TimpiEstimati'].get(distanta_simulare, TIMP_MAX_NECUNOSCUT)
-        )
 
-        for j, ogar in enumerate(ogari_la_punct):
-            timp_estimat = ogar['TimpiEstimati'].get(distanta_simulare, TIMP_MAX_NECUNOSCUT)
+def formateaza_simulare(rezultat):
+    """
+    Textul simulării (formatul afișat în GUI) dintr-un RezultatSimulare.
+    """
+    linii = []
+    if not rezultat.puncte_definite:
+        linii.append(f"\nSimulare: Nu am distanțe definite pentru punctele intermediare pentru pista '{rezultat.pista}', distanța {rezultat.distanta_totala}m.\n")
+        linii.append("Simularea la punctele intermediare nu poate rula detaliat. Afișez doar Start și Finish (bazat pe timpii prezisi).\n")
+    linii.append(f"\n--- Simularea Cursei la '{rezultat.pista}', {rezultat.distanta_totala}m ---\n")
+
+    for p, distanta_simulare in enumerate(rezultat.puncte):
+        linii.append(f"\nLa {rezultat.nume_puncte[p]} ({distanta_simulare}m):\n")
+        linii.append("-" * 30 + "\n")
+        timpi_punct = rezultat.timpi[p]
+        for j, o in enumerate(rezultat.clasamente[p]):
+            nume_ogar, box = rezultat.ogari[o]
+            timp_estimat = timpi_punct[o]
             timp_afisat = f"{timp_estimat:.2f}s" if timp_estimat is not None and timp_estimat < TIMP_MAX_NECUNOSCUT else "N/A"
-            output_simulare += f"{j+1:<5}{ogar['Box']:<5}{ogar['Nume Ogar']:<20} ({timp_afisat})\n"
+            linii.append(f"{j+1:<5}{box:<5}{nume_ogar:<20} ({timp_afisat})\n")
 
-    output_simulare += "\n--- Sfârșitul Simulării ---\n"
+    linii.append("\n--- Sfârșitul Simulării ---\n")
+    return "".join(linii)
 
-    return output_simulare
+
+def simuleaza_cursa(predictie_sortata, detalii_cursa, istoric_complet):
+    """
+    Simulează desfășurarea cursei și întoarce textul afișabil (vezi calculeaza_simulare_cursa și formateaza_simulare).
+    istoric_complet nu este folosit; parametrul se păstrează pentru compatibilitate.
+    """
+    return formateaza_simulare(calculeaza_simulare_cursa(predictie_sortata, detalii_cursa))
 
 # --- Funcția pentru Testarea Sistematică a Ponderilor ---
+@cu_diagnostice('test ponderi')
 def test_ponderi_sistematizat(csv_path, detalii_cursa_base):
     """
     Testează sistematic diverse seturi de ponderi și afișează rezultatele pentru fiecare.
@@ -909,11 +1581,8 @@ def test_ponderi_sistematizat(csv_path, detalii_cursa_base):
     print(f"Testarea pe cursa: Pista='{detalii_cursa_base.get('pista', 'N/A')}', Distanta={detalii_cursa_base.get('distanta_m', 'N/A')}m (Grad: {detalii_cursa_base.get('grad', 'N/A')}, Data: {detalii_cursa_base.get('data_cursa', 'N/A')})")
     print(f"Ogari: {[name for name, box in detalii_cursa_base.get('ogari_participanti', [])]}")
 
-    _, istoric_complet_initial_check, erori_citire_initiala = prezice_cursa_combinata(
-        csv_path,
-        detalii_cursa_base,
-        greutati_timp_final_override=seturi_ponderi_test[0],
-    )
+    erori_citire_initiala = []
+    istoric_complet_initial_check, index_istoric = incarca_istoric_indexat(csv_path, erori_citire_initiala)
 
     if erori_citire_initiala and any("FATALA" in err for err in erori_citire_initiala):
         print("\nErori fatale la citirea fisierului istoric. Testarea ponderilor nu poate continua.")
@@ -927,12 +1596,10 @@ def test_ponderi_sistematizat(csv_path, detalii_cursa_base):
         distanta_test = detalii_cursa_base.get('distanta_m')
         test_participant_names = {name for name, box in detalii_cursa_base['ogari_participanti']}
 
-        for row in istoric_complet_initial_check:
-            if row.get('Nume Ogar') in test_participant_names and \
-               row.get('Pista') == pista_test and \
-               row.get('Distanta Cursei (m)') == distanta_test:
-                found_test_participants_with_relevant_history = True
-                break
+        found_test_participants_with_relevant_history = any(
+            index_istoric.are_istoric_relevant(name, pista_test, distanta_test)
+            for name in test_participant_names
+        )
 
     if not found_test_participants_with_relevant_history:
         print("\nNu s-au gasit date istorice RELEVANTE (Pista+Distanta) pentru niciun ogar din cursa de testare. Testarea ponderilor nu poate continua.")
@@ -952,6 +1619,7 @@ def test_ponderi_sistematizat(csv_path, detalii_cursa_base):
             csv_path,
             detalii_cursa_base,
             greutati_timp_final_override=ponderi_curente,
+            index_istoric=index_istoric,
         )
 
         if predictie_sortata:
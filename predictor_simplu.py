@@ -1,11 +1,11 @@
-import csv
 import sys
-import re
+import queue
+import threading
+from contextlib import nullcontext
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, messagebox
 import os
 import json
-from collections import Counter
 
 # Importă toate constantele și funcțiile necesare din fișierele de configurare și logică
 try:
@@ -31,18 +31,26 @@ try:
         PROBLEM_KEYWORDS,
         CLEAR_RUN_KEYWORDS,
         CSV_PER_ARENA,
+        GUI_INTERVAL_VERIFICARE_MS,
+        GUI_AFISEAZA_TIMPI_ETAPE,
     )
     from predictor_logic import (
         prezice_cursa_combinata,
         simuleaza_cursa,
         test_ponderi_sistematizat,
     )
+    from instrumentare import masoara
+    from diagnostice import configureaza_logging
 
 except ImportError as e:
     messagebox.showerror("Eroare Fatala de Import", f"Nu pot importa modulele necesare: {e}. Asigurați-vă că fișierele 'config.py' și 'predictor_logic.py' există și sunt în același director cu 'predictor_simplu.py' și că nu conțin erori de sintaxă (ex: indentare).")
     sys.exit(1)
 
 
+class PredictieAnulata(Exception):
+    """Ridicată în firul de predicție când rularea a fost anulată (date de intrare modificate sau rulare nouă)."""
+
+
 class GreyhoundPredictorGUI:
     def __init__(self, master):
         self.master = master
@@ -162,11 +170,24 @@ class GreyhoundPredictorGUI:
         master.rowconfigure(3, weight=0)
         master.rowconfigure(4, weight=1)
 
+        # Predicția rulează pe un fir separat; progresul și rezultatul vin printr-o coadă preluată cu after(),
+        # astfel încât fereastra rămâne responsivă. Orice modificare a datelor de intrare anulează rularea curentă.
+        self.prediction_queue = queue.Queue()
+        self.prediction_lock = threading.Lock()
+        self.prediction_run_id = 0
+        self.active_run_id = None
+        self.active_cancel_event = None
+        self.poll_after_id = None
+        for var in [self.csv_file_path, self.pista_gui, self.distanta_m_gui, self.grad_cursa_gui, self.data_cursa_gui,
+                    self.weight_best_timp, self.weight_avg_timp, self.weight_avg_trap] + self.box_name_vars:
+            var.trace_add('write', self.on_input_changed)
+
     def browse_csv_file(self):
+        from tkinter import filedialog  # doar la deschiderea dialogului
         filename = filedialog.askopenfilename(
             initialdir=".",
             title="Selectați Fișierul CSV Istoric",
-            filetypes=(("CSV files", "*.csv"), ("All files", "*.*"))
+            filetypes=(("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("Snapshot istoric", "*.gpsnap"), ("All files", "*.*"))
         )
         if filename:
             self.csv_file_path.set(filename)
@@ -269,6 +290,10 @@ class GreyhoundPredictorGUI:
             print(f"An unexpected error occurred while loading GUI settings: {e}")
 
     def on_closing(self):
+        self.cancel_running_prediction(show_message=False)
+        if self.poll_after_id is not None:
+            self.master.after_cancel(self.poll_after_id)
+            self.poll_after_id = None
         self.save_participants()
         self.save_gui_settings()
         self.master.destroy()
@@ -278,6 +303,91 @@ class GreyhoundPredictorGUI:
         if pista in CSV_PER_ARENA:
             self.csv_file_path.set(CSV_PER_ARENA[pista])
 
+    def on_input_changed(self, *args):
+        self.cancel_running_prediction()
+
+    def cancel_running_prediction(self, show_message=True):
+        if self.active_run_id is None:
+            return
+        self.active_cancel_event.set()
+        self.active_run_id = None
+        self.active_cancel_event = None
+        if show_message:
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, "Rulare anulată: datele de intrare au fost modificate. Apăsați din nou pe Rulează.\n")
+
+    def start_prediction(self, csv_path, detalii_cursa, greutati, pista_gui_name):
+        self.cancel_running_prediction(show_message=False)
+        self.prediction_run_id += 1
+        self.active_run_id = self.prediction_run_id
+        self.active_cancel_event = threading.Event()
+
+        worker = threading.Thread(
+            target=self._prediction_worker,
+            args=(self.active_run_id, self.active_cancel_event, csv_path, detalii_cursa, greutati, pista_gui_name),
+            daemon=True,
+        )
+        worker.start()
+        if self.poll_after_id is None:
+            self.poll_after_id = self.master.after(GUI_INTERVAL_VERIFICARE_MS, self._poll_prediction_queue)
+
+    def _prediction_worker(self, run_id, cancel_event, csv_path, detalii_cursa, greutati, pista_gui_name):
+        # Rulează pe firul separat: nu atinge widget-urile Tk, doar pune mesaje în coadă
+        def progres(mesaj):
+            if cancel_event.is_set():
+                raise PredictieAnulata()
+            self.prediction_queue.put((run_id, 'progres', mesaj))
+
+        timing_output = None
+        try:
+            # O rulare anulată poate încă lucra pe cache-urile din memorie; rulările se execută pe rând
+            with self.prediction_lock, (masoara() if GUI_AFISEAZA_TIMPI_ETAPE else nullcontext()) as masuratori:
+                progres("Pornire predicție")
+                predictie_sortata, istoric_complet, erori_predictie = prezice_cursa_combinata(
+                    csv_path,
+                    detalii_cursa,
+                    greutati_timp_final_override=greutati,
+                    progres=progres,
+                )
+                simulation_output = None
+                if any(rez.get('Timp_Prezis_Combinat', TIMP_MAX_NECUNOSCUT) < TIMP_MAX_NECUNOSCUT for rez in predictie_sortata):
+                    progres("Simulare cursă")
+                    simulation_output = simuleaza_cursa(predictie_sortata, detalii_cursa, istoric_complet)
+                progres("Afișare rezultate")
+            if masuratori is not None:
+                timing_output = "\n" + masuratori.formateaza() + "\n"
+        except PredictieAnulata:
+            return
+        except Exception as e:
+            self.prediction_queue.put((run_id, 'eroare', e))
+            return
+        self.prediction_queue.put((run_id, 'rezultat', (pista_gui_name, detalii_cursa, predictie_sortata, simulation_output, timing_output)))
+
+    def _poll_prediction_queue(self):
+        self.poll_after_id = None
+        try:
+            while True:
+                run_id, tip, continut = self.prediction_queue.get_nowait()
+                if run_id != self.active_run_id:
+                    continue  # mesaj întârziat de la o rulare anulată
+                if tip == 'progres':
+                    self.output_text.delete(1.0, tk.END)
+                    self.output_text.insert(tk.END, f"Rulează... {continut}\n")
+                elif tip == 'rezultat':
+                    self.active_run_id = None
+                    self.active_cancel_event = None
+                    self.show_prediction_results(*continut)
+                elif tip == 'eroare':
+                    self.active_run_id = None
+                    self.active_cancel_event = None
+                    self.output_text.delete(1.0, tk.END)
+                    self.output_text.insert(tk.END, f"Eroare la rularea predicției: {continut}\n")
+                    messagebox.showerror("Eroare Predicție", f"A apărut o eroare la rularea predicției: {continut}")
+        except queue.Empty:
+            pass
+        if self.active_run_id is not None:
+            self.poll_after_id = self.master.after(GUI_INTERVAL_VERIFICARE_MS, self._poll_prediction_queue)
+
     def run_prediction(self):
         csv_path = self.csv_file_path.get()
         pista_gui_name = self.pista_gui.get()
@@ -348,15 +458,10 @@ class GreyhoundPredictorGUI:
 
         self.output_text.delete(1.0, tk.END)
         self.output_text.insert(tk.END, "Rulează...\n")
-        self.output_text.update_idletasks()
+        self.start_prediction(csv_path, detalii_cursa_noua, greutati_input_gui, pista_gui_name)
 
-        predictie_sortata, istoric_complet_gui, erori_predictie = prezice_cursa_combinata(
-            csv_path,
-            detalii_cursa_noua,
-            greutati_timp_final_override=greutati_input_gui,
-        )
-
-        simulation_output = simuleaza_cursa(predictie_sortata, detalii_cursa_noua, istoric_complet_gui)
+    def show_prediction_results(self, pista_gui_name, detalii_cursa_noua, predictie_sortata, simulation_output, timing_output=None):
+        self.output_text.delete(1.0, tk.END)
 
         def curba_emoji(stil):
             if stil == "Finisher":
@@ -381,7 +486,7 @@ class GreyhoundPredictorGUI:
         if predictie_sortata:
             self.output_text.insert(
                 tk.END,
-                f"\nPredictie pentru cursa la '{self.pista_gui.get()}', {detalii_cursa_noua.get('distanta_m', 'N/A')}m (Grad: {detalii_cursa_noua.get('grad', 'N/A')}, Data: {detalii_cursa_noua.get('data_cursa', 'N/A')}):\n"
+                f"\nPredictie pentru cursa la '{pista_gui_name}', {detalii_cursa_noua.get('distanta_m', 'N/A')}m (Grad: {detalii_cursa_noua.get('grad', 'N/A')}, Data: {detalii_cursa_noua.get('data_cursa', 'N/A')}):\n"
             )
             self.output_text.insert(tk.END, "-" * 220 + "\n")
             # HEADER - cu "Stil" și Emoji după "Sex"
@@ -438,8 +543,7 @@ class GreyhoundPredictorGUI:
                 "Stil: FP = Finisher 🏁, EP = EarlyPace 🚀, CP = Constant ➖, ?? = necunoscut/altul\n"
             )
 
-            if any(rez.get('Timp_Prezis_Combinat', TIMP_MAX_NECUNOSCUT) < TIMP_MAX_NECUNOSCUT for rez in predictie_sortata):
-                simulation_output = simuleaza_cursa(predictie_sortata, detalii_cursa_noua, istoric_complet_gui)
+            if simulation_output is not None:
                 self.output_text.insert(tk.END, simulation_output)
             else:
                 self.output_text.insert(tk.END, "\nSimularea nu poate rula din cauza lipsei datelor de predicție valide pentru timpul final.\n")
@@ -447,7 +551,11 @@ class GreyhoundPredictorGUI:
         else:
             self.output_text.insert(tk.END, "\nNu s-au putut genera rezultate de predicție. Verificați fișierul CSV, datele introduse și erorile de mai sus.\n")
 
+        if timing_output:
+            self.output_text.insert(tk.END, timing_output)
+
 if __name__ == "__main__":
+    configureaza_logging()
     root = tk.Tk()
     app = GreyhoundPredictorGUI(root)
     root.mainloop()
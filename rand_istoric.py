@@ -0,0 +1,124 @@
+# --- Rândul de istoric parsat: înregistrare compactă cu __slots__ ---
+# Un dict per rând ține un tabel de hash cu 17 chei și propriile copii ale textelor repetate (pista, grad, sex,
+# numele ogarului). RandIstoric are câmpuri fixe (__slots__, fără __dict__), iar textele categoriale sunt
+# internate la încărcare (sys.intern): toate rândurile unei piste împart același obiect 'Yrmth', iar comparațiile
+# de egalitate se opresc la verificarea identității. Memoria per rând scade de câteva ori.
+#
+# Pentru codul existent, rândul se citește în continuare ca un dict (Mapping): rand['Pista'], rand.get('REMARK'),
+# 'CURBA' in rand, iterarea cheilor, comparația cu un dict cu aceleași valori. Rândurile nu se modifică după
+# parsare, deci înregistrarea este doar pentru citire.
+
+import sys
+from collections.abc import Mapping
+
+# Cheia din rândul parsat -> câmpul înregistrării, în ordinea cheilor din rândurile produse de parser
+CAMPURI = {
+    'Data Cursei': 'data_cursei',
+    'Pista': 'pista',
+    'Distanta Cursei (m)': 'distanta',
+    'Grad Cursa': 'grad',
+    'Numar Box (Trap)': 'box',
+    'Timp Secțional 1 (s)': 'sectional',
+    'Pozitie Finala': 'pozitie',
+    'FINAL': 'final',
+    'Varsta': 'varsta',
+    'Sex': 'sex',
+    'Nume Ogar': 'nume',
+    'REMARK': 'remark',
+    'CURBA': 'curba',
+    'Timp Final (s)': 'timp_final',
+    'Data Cursei Parsata': 'data',
+    'Remark Probleme': 'remark_probleme',
+    'Remark Liber': 'remark_liber',
+}
+CHEI = tuple(CAMPURI)
+
+# Câmpurile text cu puține valori distincte (repetate în mii de rânduri), internate la creare
+CAMPURI_INTERNATE = ('data_cursei', 'pista', 'grad', 'sex', 'nume', 'curba')
+
+
+def interneaza(valoare):
+    return sys.intern(valoare) if type(valoare) is str else valoare
+
+
+class RandIstoric(Mapping):
+    """
+    Un rând de istoric parsat, cu aceleași chei și valori ca dict-ul produs anterior de parser.
+    """
+
+    __slots__ = tuple(CAMPURI.values())
+
+    def __init__(self, data_cursei, pista, distanta, grad, box, sectional, pozitie, final, varsta, sex, nume, remark,
+                 curba, timp_final, data, remark_probleme, remark_liber):
+        self.data_cursei = data_cursei
+        self.pista = pista
+        self.distanta = distanta
+        self.grad = grad
+        self.box = box
+        self.sectional = sectional
+        self.pozitie = pozitie
+        self.final = final
+        self.varsta = varsta
+        self.sex = sex
+        self.nume = nume
+        self.remark = remark
+        self.curba = curba
+        self.timp_final = timp_final
+        self.data = data
+        self.remark_probleme = remark_probleme
+        self.remark_liber = remark_liber
+
+    @classmethod
+    def din_dict(cls, rand):
+        """
+        Înregistrarea pentru un rând-dict (cheile lipsă devin None), cu textele categoriale internate.
+        """
+        valori = [rand.get(cheie) for cheie in CHEI]
+        for i, camp in enumerate(CAMPURI.values()):
+            if camp in CAMPURI_INTERNATE:
+                valori[i] = interneaza(valori[i])
+        return cls(*valori)
+
+    def valori(self):
+        return tuple(getattr(self, camp) for camp in self.__slots__)
+
+    def __reduce__(self):
+        # Pickle compact (cache-ul pe disc, procesele worker): doar tuplul valorilor; la citire textele
+        # categoriale sunt internate din nou (pickle nu păstrează internarea)
+        return _rand_din_valori, (self.valori(),)
+
+    def __getitem__(self, cheie):
+        camp = CAMPURI.get(cheie)
+        if camp is None:
+            raise KeyError(cheie)
+        return getattr(self, camp)
+
+    def get(self, cheie, implicit=None):
+        camp = CAMPURI.get(cheie)
+        return getattr(self, camp) if camp is not None else implicit
+
+    def __contains__(self, cheie):
+        return cheie in CAMPURI
+
+    def __iter__(self):
+        return iter(CHEI)
+
+    def __len__(self):
+        return len(CHEI)
+
+    def __repr__(self):
+        return f"RandIstoric({dict(self.items())!r})"
+
+
+# Pozițiile câmpurilor internate în tuplul valorilor
+_POZITII_INTERNATE = tuple(i for i, camp in enumerate(CAMPURI.values()) if camp in CAMPURI_INTERNATE)
+
+
+def _rand_din_valori(valori):
+    """
+    Reconstrucția la unpickle: ca din_dict, cu textele categoriale internate.
+    """
+    valori = list(valori)
+    for i in _POZITII_INTERNATE:
+        valori[i] = interneaza(valori[i])
+    return RandIstoric(*valori)
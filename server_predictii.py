@@ -0,0 +1,317 @@
+# --- Server local de predicții (asyncio, HTTP/JSON) ---
+# Istoricul și indexul fiecărei piste din CSV_PER_ARENA rămân încărcate în memorie, așa că o predicție
+# costă doar calculul indicatorilor (milisecunde), nu re-citirea CSV-ului. Fișierele sunt verificate
+# periodic; când mtime-ul (sau dimensiunea) se schimbă, pista se reîncarcă pe un fir separat într-un
+# instantaneu nou, înlocuit atomic la final. Cererile în curs lucrează pe instantaneul vechi.
+#
+# Se ascultă doar pe localhost; nu sunt necesare dependențe externe.
+#
+#   POST /predictie  {"pista": "Towcester", "distanta_m": 500, "grad": "A3", "data_cursa": "03/05/2024",
+#                     "ogari": {"1": "Thornfield Love", "2": "Julies Own"}, "ponderi": [0.25, 0.45, 0.3]}
+#   POST /card       {"curse": [...]}   (aceleași câmpuri ca în card_curse.py)
+#   Opțional, în ambele: "simulare": false, "monte_carlo": true sau numărul de curse simulate (necesită numpy)
+#   GET  /stare      pistele încărcate, numărul de rânduri și momentul ultimei încărcări
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from config import (
+    CSV_PER_ARENA,
+    AGREGATE_OGARI_ACTIVAT,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_INTERVAL_VERIFICARE_S,
+    SERVER_MAX_CORP_OCTETI,
+    SERVER_FIRE_PREDICTII,
+    SERVER_MC_MAX_CURSE,
+    SIMULARE_MC_NUMAR_CURSE,
+)
+from predictor_logic import citeste_istoric_cu_stare, prezice_cursa_combinata
+from index_istoric import HistoryIndex
+from card_curse import normalizeaza_curse
+from predictor_cli import cursa_serializabila
+from diagnostice import colecteaza, configureaza_logging
+
+
+class EroareCerere(Exception):
+    """Cerere invalidă; status este codul HTTP întors clientului."""
+
+    def __init__(self, status, mesaj):
+        super().__init__(mesaj)
+        self.status = status
+
+
+def verifica_adresa_locala(host):
+    if host == 'localhost':
+        return
+    try:
+        este_locala = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        este_locala = False
+    if not este_locala:
+        raise ValueError(f"Serverul de predicții ascultă doar pe localhost, nu pe '{host}'.")
+
+
+def _cheie_stat(cale):
+    try:
+        info = os.stat(cale)
+    except OSError:
+        return None
+    return (info.st_size, info.st_mtime_ns)
+
+
+def construieste_instantaneu(cale):
+    """
+    Încarcă istoricul unei piste (cache-ul de pe disc și parsarea doar a cozii noi se aplică în continuare)
+    și construiește un index nou, fără a atinge obiectele folosite de cererile în curs.
+    Returnează dict cu 'cale', 'cheie_stat', 'index', 'avertismente', 'incarcat_la'; 'index' este None la erori fatale.
+    """
+    cheie_stat = _cheie_stat(cale)
+    erori = []
+    istoric, _ = citeste_istoric_cu_stare(cale, erori)
+    index = None
+    if not [eroare for eroare in erori if "FATALA" in eroare]:
+        index = HistoryIndex(istoric)
+        if AGREGATE_OGARI_ACTIVAT:
+            from agregate_ogari import AgregateOgari
+            index = AgregateOgari.din_index(index)
+    return {'cale': cale, 'cheie_stat': cheie_stat, 'index': index, 'avertismente': erori, 'incarcat_la': time.time()}
+
+
+def _citeste_ponderi(ponderi):
+    if ponderi is None:
+        return None
+    if isinstance(ponderi, dict):
+        ponderi = [ponderi.get('best', 0), ponderi.get('average', 0), ponderi.get('average_trap', 0)]
+    try:
+        valori = [float(p) for p in ponderi]
+    except (TypeError, ValueError):
+        raise EroareCerere(HTTPStatus.BAD_REQUEST, "Ponderile trebuie să fie trei numere (best, average, average_trap).")
+    if len(valori) != 3 or any(p < 0 for p in valori):
+        raise EroareCerere(HTTPStatus.BAD_REQUEST, "Ponderile trebuie să fie trei numere nenegative (best, average, average_trap).")
+    return dict(zip(('best', 'average', 'average_trap'), valori))
+
+
+def _citeste_monte_carlo(valoare):
+    # None/false = fără simulare Monte Carlo; true = SIMULARE_MC_NUMAR_CURSE; un număr = atâtea curse simulate
+    if valoare is None or valoare is False:
+        return None
+    numar = SIMULARE_MC_NUMAR_CURSE if valoare is True else valoare
+    if not isinstance(numar, int) or isinstance(numar, bool) or not 0 < numar <= SERVER_MC_MAX_CURSE:
+        raise EroareCerere(HTTPStatus.BAD_REQUEST, f"monte_carlo trebuie să fie true sau un număr între 1 și {SERVER_MC_MAX_CURSE}.")
+    from simulare_monte_carlo import np
+    if np is None:
+        raise EroareCerere(HTTPStatus.NOT_IMPLEMENTED, "Simularea Monte Carlo necesită pachetul 'numpy' pe server.")
+    return numar
+
+
+class ServerPredictii:
+    def __init__(self, fisiere=None, interval_verificare=None):
+        self.fisiere = dict(CSV_PER_ARENA if fisiere is None else fisiere)
+        self.interval_verificare = SERVER_INTERVAL_VERIFICARE_S if interval_verificare is None else interval_verificare
+        self.piste = {}
+        self._reincarcari_in_curs = set()
+        # Un singur fir pentru reîncărcări: parsarea e limitată oricum de GIL, iar ordinea rămâne previzibilă
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='reincarcare-istoric')
+        # Predicțiile și simulările rulează tot pe fire separate: o cerere /card mare nu blochează bucla
+        # (deci nici /stare sau ceilalți clienți)
+        self._executor_cereri = ThreadPoolExecutor(max_workers=SERVER_FIRE_PREDICTII, thread_name_prefix='cerere')
+
+    # --- Istoric în memorie ---
+    async def incarca_toate(self):
+        await asyncio.gather(*(self._reincarca(arena) for arena in self.fisiere))
+
+    async def _reincarca(self, arena):
+        self._reincarcari_in_curs.add(arena)
+        cale = self.fisiere[arena]
+        try:
+            instantaneu = await asyncio.get_running_loop().run_in_executor(self._executor, construieste_instantaneu, cale)
+        except Exception:
+            logging.exception(f"Reîncărcarea istoricului pentru '{arena}' ({cale}) a eșuat.")
+            return
+        finally:
+            self._reincarcari_in_curs.discard(arena)
+        self.piste[arena] = instantaneu
+        if instantaneu['index'] is None:
+            logging.warning(f"Istoricul pentru '{arena}' nu poate fi încărcat: {'; '.join(instantaneu['avertismente'])}")
+        else:
+            logging.info(f"Istoric încărcat pentru '{arena}': {len(instantaneu['index'].istoric)} rânduri din {cale}.")
+
+    async def urmareste_fisiere(self):
+        while True:
+            await asyncio.sleep(self.interval_verificare)
+            for arena, cale in self.fisiere.items():
+                if arena in self._reincarcari_in_curs:
+                    continue
+                instantaneu = self.piste.get(arena)
+                if instantaneu is None or _cheie_stat(cale) != instantaneu['cheie_stat']:
+                    asyncio.get_running_loop().create_task(self._reincarca(arena))
+
+    # --- Predicții ---
+    def _prezice(self, piste, cursa, greutati, cu_simulare, numar_curse_monte_carlo=None):
+        instantaneu = piste.get(cursa.get('pista_gui') or cursa.get('pista'))
+        if instantaneu is None:
+            raise EroareCerere(HTTPStatus.NOT_FOUND, f"Pista '{cursa.get('pista')}' nu are istoric încărcat pe server.")
+        if instantaneu['index'] is None:
+            raise EroareCerere(HTTPStatus.SERVICE_UNAVAILABLE, "; ".join(instantaneu['avertismente']))
+        predictie, istoric_complet, erori = prezice_cursa_combinata(instantaneu['cale'], cursa, greutati_timp_final_override=greutati,
+                                                                    index_istoric=instantaneu['index'])
+        monte_carlo = None
+        if numar_curse_monte_carlo and predictie:
+            from simulare_monte_carlo import simuleaza_monte_carlo
+            monte_carlo = simuleaza_monte_carlo(predictie, cursa, istoric_complet, numar_curse=numar_curse_monte_carlo,
+                                                index_istoric=instantaneu['index'])
+        return cursa_serializabila(cursa, predictie, erori, cu_simulare, monte_carlo)
+
+    def trateaza_cerere(self, metoda, cale, corp):
+        """
+        Tratează o cerere deja citită; returnează (status HTTP, dicționar JSON).
+        Cererea lucrează pe instantaneele pistelor de la începutul ei, chiar dacă între timp o pistă se reîncarcă.
+        """
+        piste = dict(self.piste)
+        if cale == '/stare' and metoda == 'GET':
+            return HTTPStatus.OK, {'piste': {
+                arena: {
+                    'fisier': instantaneu['cale'],
+                    'randuri': len(instantaneu['index'].istoric) if instantaneu['index'] is not None else None,
+                    'incarcat_la': instantaneu['incarcat_la'],
+                    'avertismente': len(instantaneu['avertismente']),
+                } for arena, instantaneu in piste.items()
+            }, 'reincarcari_in_curs': sorted(self._reincarcari_in_curs)}
+
+        if cale not in ('/predictie', '/card'):
+            raise EroareCerere(HTTPStatus.NOT_FOUND, f"Cale necunoscută: {cale}")
+        if metoda != 'POST':
+            raise EroareCerere(HTTPStatus.METHOD_NOT_ALLOWED, f"{cale} acceptă doar POST.")
+
+        try:
+            continut = json.loads(corp.decode('utf-8') or 'null')
+        except (UnicodeDecodeError, json.JSONDecodeError) as eroare:
+            raise EroareCerere(HTTPStatus.BAD_REQUEST, f"Corpul cererii nu este JSON valid: {eroare}")
+        if not isinstance(continut, (dict, list)):
+            raise EroareCerere(HTTPStatus.BAD_REQUEST, "Corpul cererii trebuie să fie un obiect JSON.")
+
+        optiuni = continut if isinstance(continut, dict) else {}
+        greutati = _citeste_ponderi(optiuni.get('ponderi'))
+        cu_simulare = bool(optiuni.get('simulare', True))
+        numar_curse_monte_carlo = _citeste_monte_carlo(optiuni.get('monte_carlo'))
+
+        if cale == '/predictie':
+            curse_brute = [continut]
+        else:
+            curse_brute = continut.get('curse', []) if isinstance(continut, dict) else continut
+
+        avertismente = []
+        curse = normalizeaza_curse(curse_brute, avertismente)
+        if cale == '/predictie':
+            if not curse:
+                raise EroareCerere(HTTPStatus.BAD_REQUEST, "; ".join(avertismente) or "Cursa nu este validă.")
+            return HTTPStatus.OK, self._prezice(piste, curse[0], greutati, cu_simulare, numar_curse_monte_carlo)
+
+        rezultate = []
+        erori_curse = []
+        with colecteaza('card'):
+            for cursa in curse:
+                try:
+                    rezultate.append(self._prezice(piste, cursa, greutati, cu_simulare, numar_curse_monte_carlo))
+                except EroareCerere as eroare:
+                    erori_curse.append(eroare)
+                    rezultate.append({'id': cursa.get('id'), 'pista': cursa.get('pista'), 'predictie': [], 'simulare': None,
+                                      'erori': [str(eroare)]})
+        # Niciun istoric disponibil pentru cursele cardului: eșecul ajunge la client, nu un 200 cu rezultate goale
+        if erori_curse and len(erori_curse) == len(curse):
+            status = (HTTPStatus.SERVICE_UNAVAILABLE if any(e.status == HTTPStatus.SERVICE_UNAVAILABLE for e in erori_curse)
+                      else erori_curse[0].status)
+            raise EroareCerere(status, "; ".join(dict.fromkeys(str(e) for e in erori_curse)))
+        return HTTPStatus.OK, {'curse': rezultate, 'avertismente': avertismente}
+
+    # --- HTTP ---
+    async def trateaza_conexiune(self, reader, writer):
+        try:
+            while True:
+                linie_cerere = await reader.readline()
+                if not linie_cerere:
+                    break
+                antete = {}
+                while True:
+                    linie = await reader.readline()
+                    if linie in (b'\r\n', b'\n', b''):
+                        break
+                    nume, _, valoare = linie.decode('latin-1').partition(':')
+                    antete[nume.strip().lower()] = valoare.strip()
+
+                pastreaza_conexiunea = False
+                try:
+                    parti = linie_cerere.decode('latin-1').split()
+                    if len(parti) != 3:
+                        raise EroareCerere(HTTPStatus.BAD_REQUEST, "Linie de cerere HTTP invalidă.")
+                    metoda, cale, versiune = parti
+                    pastreaza_conexiunea = versiune == 'HTTP/1.1' and antete.get('connection', '').lower() != 'close'
+                    try:
+                        lungime = int(antete.get('content-length') or 0)
+                    except ValueError:
+                        raise EroareCerere(HTTPStatus.BAD_REQUEST, "Content-Length invalid.")
+                    if lungime < 0 or lungime > SERVER_MAX_CORP_OCTETI:
+                        pastreaza_conexiunea = False
+                        raise EroareCerere(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpul cererii este prea mare.")
+                    corp = await reader.readexactly(lungime) if lungime else b''
+                    status, raspuns = await asyncio.get_running_loop().run_in_executor(
+                        self._executor_cereri, self.trateaza_cerere, metoda, cale.split('?', 1)[0], corp)
+                except EroareCerere as eroare:
+                    status, raspuns = eroare.status, {'eroare': str(eroare)}
+                except Exception as eroare:
+                    logging.exception("Eroare neașteptată la tratarea cererii.")
+                    status, raspuns = HTTPStatus.INTERNAL_SERVER_ERROR, {'eroare': str(eroare)}
+
+                await self._scrie_raspuns(writer, status, raspuns, pastreaza_conexiunea)
+                if not pastreaza_conexiunea:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _scrie_raspuns(self, writer, status, raspuns, pastreaza_conexiunea):
+        corp = json.dumps(raspuns, ensure_ascii=False).encode('utf-8')
+        antet = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                 f"Content-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(corp)}\r\n"
+                 f"Connection: {'keep-alive' if pastreaza_conexiunea else 'close'}\r\n\r\n")
+        writer.write(antet.encode('latin-1') + corp)
+        await writer.drain()
+
+    async def ruleaza(self, host=None, port=None):
+        host = SERVER_HOST if host is None else host
+        port = SERVER_PORT if port is None else port
+        verifica_adresa_locala(host)
+
+        await self.incarca_toate()
+        server = await asyncio.start_server(self.trateaza_conexiune, host, port)
+        urmarire = asyncio.get_running_loop().create_task(self.urmareste_fisiere())
+        logging.info(f"Serverul de predicții ascultă pe http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            urmarire.cancel()
+            self._executor.shutdown(wait=False)
+            self._executor_cereri.shutdown(wait=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Server local HTTP/JSON pentru predicții, cu istoricul păstrat în memorie.")
+    parser.add_argument('--host', default=SERVER_HOST, help="Adresa locală (implicit %(default)s)")
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help="Portul (implicit %(default)s)")
+    argumente = parser.parse_args()
+    configureaza_logging(nivel=logging.INFO)
+    try:
+        asyncio.run(ServerPredictii().ruleaza(argumente.host, argumente.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,168 @@
+# --- Simulare Monte Carlo a cursei (NumPy) ---
+# În locul unei singure ordini deterministe (simuleaza_cursa), se simulează un număr mare de curse: timpul final
+# al fiecărui ogar este eșantionat în jurul timpului prezis, cu abaterea standard a timpilor săi istorici pe
+# aceeași pistă și distanță; timpul la primul punct intermediar se eșantionează la fel, din secționale.
+# Rezultatul: probabilități de câștig, de plasare și de a conduce la fiecare punct din DISTANTE_PUNCTE_SIMULARE.
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # dependință opțională
+    np = None
+
+from config import (
+    TIMP_MAX_NECUNOSCUT,
+    DISTANTE_PUNCTE_SIMULARE,
+    SIMULARE_MC_NUMAR_CURSE,
+    SIMULARE_MC_SEED,
+    SIMULARE_MC_SIGMA_IMPLICIT,
+    SIMULARE_MC_SIGMA_SECTIONAL_IMPLICIT,
+    SIMULARE_MC_SIGMA_MINIM,
+    SIMULARE_MC_MIN_CURSE_SIGMA,
+    SIMULARE_MC_PENALIZARE_NECUNOSCUT,
+    SIMULARE_MC_LOCURI_PLASATE,
+)
+
+
+def _abatere_standard(valori):
+    """
+    Abaterea standard de eșantion (n-1); None pentru mai puțin de SIMULARE_MC_MIN_CURSE_SIGMA valori.
+    """
+    n = len(valori)
+    if n < max(SIMULARE_MC_MIN_CURSE_SIGMA, 2):
+        return None
+    medie = sum(valori) / n
+    return math.sqrt(sum((v - medie) ** 2 for v in valori) / (n - 1))
+
+
+def abateri_standard_ogari(istoric, nume_ogari, pista, distanta, index_istoric=None):
+    """
+    Returnează {nume: (sigma_timp_final, sigma_sectional)} din rândurile istorice ale ogarilor pe pista și
+    distanța cursei; valorile lipsă (istoric insuficient) sunt None. Cu index_istoric (HistoryIndex,
+    AgregateOgari, snapshot, SQLite) se citesc doar rândurile relevante ale participanților, fără scanarea istoricului.
+    """
+    if index_istoric is not None and hasattr(index_istoric, 'randuri_relevante'):
+        randuri_per_ogar = {nume: index_istoric.randuri_relevante(nume, pista, distanta) for nume in nume_ogari}
+    else:
+        randuri_per_ogar = {nume: [] for nume in nume_ogari}
+        for rand in istoric:
+            nume = rand.get('Nume Ogar')
+            if nume not in randuri_per_ogar or rand.get('Pista') != pista or rand.get('Distanta Cursei (m)') != distanta:
+                continue
+            randuri_per_ogar[nume].append(rand)
+
+    abateri = {}
+    for nume, randuri in randuri_per_ogar.items():
+        timpi = []
+        sectionale = []
+        for rand in randuri:
+            timp = rand.get('Timp Final (s)')
+            if timp is not None and timp > 0.0:
+                timpi.append(timp)
+            sectional = rand.get('Timp Secțional 1 (s)')
+            if sectional is not None and sectional > 0.0:
+                sectionale.append(sectional)
+        abateri[nume] = (_abatere_standard(timpi), _abatere_standard(sectionale))
+    return abateri
+
+
+def _timp_primul_punct(rez, distanta_primul_punct, distanta_totala):
+    # Aceeași regulă ca în simuleaza_cursa: cel mai bun secțional dacă e plauzibil, altfel viteza medie
+    timp_final = rez['Timp_Prezis_Combinat']
+    sectional = rez.get('Cel_Mai_Bun_Sectional', TIMP_MAX_NECUNOSCUT)
+    if sectional is not None and 0 < sectional < TIMP_MAX_NECUNOSCUT and sectional < timp_final:
+        return sectional
+    return distanta_primul_punct * timp_final / distanta_totala
+
+
+def simuleaza_monte_carlo(predictie_sortata, detalii_cursa, istoric_complet, numar_curse=None, seed=None,
+                          index_istoric=None):
+    """
+    Simulează numar_curse curse (implicit SIMULARE_MC_NUMAR_CURSE) cu un generator inițializat cu seed
+    (implicit SIMULARE_MC_SEED, deci rezultate reproductibile); index_istoric, dacă este dat, înlocuiește
+    scanarea lui istoric_complet la calculul abaterilor standard. Returnează un dict cu:
+      'participanti': [{'nume', 'box', 'castig', 'plasat', 'lider': {distanta: probabilitate}, 'sigma_timp'}],
+      în ordinea predicției;
+      'puncte': distanțele punctelor intermediare; 'numar_curse'; 'locuri_plasate'.
+    None dacă niciun ogar nu are timp prezis.
+    """
+    if np is None:
+        raise ImportError("Simularea Monte Carlo necesită pachetul 'numpy' (pip install numpy).")
+    numar_curse = SIMULARE_MC_NUMAR_CURSE if numar_curse is None else numar_curse
+    seed = SIMULARE_MC_SEED if seed is None else seed
+
+    timpi_prezisi = [rez.get('Timp_Prezis_Combinat', TIMP_MAX_NECUNOSCUT) for rez in predictie_sortata]
+    cunoscuti = [t for t in timpi_prezisi if t < TIMP_MAX_NECUNOSCUT]
+    if not cunoscuti:
+        return None
+
+    distanta_totala = detalii_cursa.get('distanta_m', 0)
+    pista = detalii_cursa.get('pista')
+    puncte = []
+    if isinstance(distanta_totala, int) and distanta_totala > 0:
+        puncte = sorted(d for d in DISTANTE_PUNCTE_SIMULARE.get(pista, {}).get(distanta_totala, []) if 0 < d < distanta_totala)
+
+    nume_ogari = [rez.get('Nume Ogar') for rez in predictie_sortata]
+    abateri = abateri_standard_ogari(istoric_complet or [], nume_ogari, pista, distanta_totala, index_istoric)
+
+    # Ogarii fără timp prezis pornesc din spatele celui mai lent ogar cunoscut
+    timp_necunoscut = max(cunoscuti) + SIMULARE_MC_PENALIZARE_NECUNOSCUT
+    medii_final = np.array([t if t < TIMP_MAX_NECUNOSCUT else timp_necunoscut for t in timpi_prezisi])
+    sigma_final = np.array([max(abateri[nume][0] or SIMULARE_MC_SIGMA_IMPLICIT, SIMULARE_MC_SIGMA_MINIM)
+                            for nume in nume_ogari])
+
+    rng = np.random.default_rng(seed)
+    n = len(predictie_sortata)
+    timpi_finali = medii_final[None, :] + sigma_final[None, :] * rng.standard_normal((numar_curse, n))
+
+    ordine_finala = np.argsort(timpi_finali, axis=1, kind='stable')
+    locuri_plasate = min(SIMULARE_MC_LOCURI_PLASATE, n)
+    castig = np.bincount(ordine_finala[:, 0], minlength=n) / numar_curse
+    plasat = np.bincount(ordine_finala[:, :locuri_plasate].ravel(), minlength=n) / numar_curse
+
+    lideri = {}
+    if puncte:
+        distanta_primul = puncte[0]
+        medii_primul = [_timp_primul_punct(rez, distanta_primul, distanta_totala) if timpi_prezisi[i] < TIMP_MAX_NECUNOSCUT else None
+                        for i, rez in enumerate(predictie_sortata)]
+        primul_necunoscut = max(t for t in medii_primul if t is not None) + \
+            SIMULARE_MC_PENALIZARE_NECUNOSCUT * distanta_primul / distanta_totala
+        medii_primul = np.array([t if t is not None else primul_necunoscut for t in medii_primul])
+        sigma_primul = np.array([max(abateri[nume][1] or SIMULARE_MC_SIGMA_SECTIONAL_IMPLICIT, SIMULARE_MC_SIGMA_MINIM)
+                                 for nume in nume_ogari])
+        timpi_primul = medii_primul[None, :] + sigma_primul[None, :] * rng.standard_normal((numar_curse, n))
+        # Primul punct nu poate fi atins după finish
+        timpi_primul = np.minimum(timpi_primul, timpi_finali)
+        viteza_rest = (distanta_totala - distanta_primul) / np.maximum(timpi_finali - timpi_primul, 1e-9)
+        for distanta in puncte:
+            timpi_punct = timpi_primul + (distanta - distanta_primul) / viteza_rest
+            lideri[distanta] = np.bincount(np.argmin(timpi_punct, axis=1), minlength=n) / numar_curse
+
+    participanti = []
+    for i, rez in enumerate(predictie_sortata):
+        participanti.append({
+            'nume': nume_ogari[i],
+            'box': rez.get('Box Nou'),
+            'castig': float(castig[i]),
+            'plasat': float(plasat[i]),
+            'lider': {distanta: float(probabilitati[i]) for distanta, probabilitati in lideri.items()},
+            'sigma_timp': float(sigma_final[i]),
+        })
+    return {'participanti': participanti, 'puncte': puncte, 'numar_curse': numar_curse, 'locuri_plasate': locuri_plasate}
+
+
+def formateaza_simulare_monte_carlo(rezultat):
+    """
+    Tabel text: probabilități per box (câștig, plasare, lider la fiecare punct intermediar).
+    """
+    if not rezultat:
+        return "\nSimularea Monte Carlo nu poate rula: niciun ogar nu are timp prezis.\n"
+    antet_puncte = "".join(f"{f'Lider {d}m':<12}" for d in rezultat['puncte'])
+    linii = [f"\n--- Simulare Monte Carlo ({rezultat['numar_curse']} curse) ---",
+             f"{'Box':<5}{'Nume Ogar':<20}{'Sigma':<8}{'Castig':<10}{'Plasat (top ' + str(rezultat['locuri_plasate']) + ')':<15}{antet_puncte}"]
+    for p in sorted(rezultat['participanti'], key=lambda p: (p['box'] is None, p['box'])):
+        lider = "".join(f"{100 * p['lider'][d]:>6.1f}%     " for d in rezultat['puncte'])
+        linii.append(f"{str(p['box']):<5}{p['nume']:<20}{p['sigma_timp']:<8.2f}{100 * p['castig']:>6.1f}%   "
+                     f"{100 * p['plasat']:>6.1f}%        {lider}")
+    return "\n".join(linii) + "\n"
@@ -0,0 +1,402 @@
+# --- Snapshot binar al istoricului parsat (deschis cu mmap) ---
+# Chiar și din cache-ul pickle, istoricul trebuie deserializat complet (un obiect per rând) înainte de prima
+# predicție. Snapshot-ul păstrează istoricul parsat într-un fișier binar compact: coloane numerice de lățime
+# fixă, coduri întregi într-o tabelă de texte (nume, piste, grade, REMARK, ...) și un index rândurile per ogar.
+# Fișierul este deschis cu mmap (doar citire): deschiderea nu copiază nimic, iar rândurile se construiesc
+# doar pentru ogarii ceruți. Procesele care deschid același snapshot (GUI, CLI, server, workerii de backtest)
+# împart paginile din cache-ul sistemului de operare.
+#
+# Un snapshot se creează din istoricul unui fișier CSV/.xlsx și poate fi exportat înapoi în CSV:
+#   python snapshot_istoric.py Towcester.csv                   # -> Towcester.gpsnap
+#   python snapshot_istoric.py Towcester.gpsnap --csv export.csv
+# Oriunde se acceptă un fișier de istoric (GUI, CLI, card de curse, server) se poate da și un .gpsnap.
+#
+# Format (little-endian): antet fix (magic, versiunea formatului, versiunea rândurilor, numere de rânduri/
+# texte/ogari), tabela secțiunilor (offset, lungime) și secțiunile aliniate la 8 octeți.
+
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from datetime import datetime
+
+from config import SNAPSHOT_EXTENSIE
+from cache_istoric import VERSIUNE_CACHE
+from index_istoric import _cheie_data_descrescator
+from rand_istoric import RandIstoric
+
+MAGIC_SNAPSHOT = b'GPSNAP\r\n'
+# Se incrementează la orice modificare a aranjării secțiunilor; snapshot-urile vechi sunt refuzate.
+VERSIUNE_SNAPSHOT = 1
+
+ANTET = struct.Struct('<8sIIIII')  # magic, versiune format, versiune rânduri, rânduri, texte, ogari
+INTRARE_SECTIUNE = struct.Struct('<QQ')  # offset, lungime în octeți
+ALINIERE = 8
+
+TEXT_LIPSA = 0xFFFFFFFF
+
+# Coloanele numerice: (cheia din rândul parsat, secțiunea, typecode, bitul "lipsă" din secțiunea flaguri)
+COLOANE_INT = (
+    ('Distanta Cursei (m)', 'distanta', 'q', 1 << 2),
+    ('Numar Box (Trap)', 'box', 'q', 1 << 3),
+    ('Pozitie Finala', 'pozitie', 'q', 1 << 4),
+)
+COLOANE_FLOAT = (
+    ('Timp Final (s)', 'timp_final', 'd', 1 << 5),
+    ('Timp Secțional 1 (s)', 'sectional', 'd', 1 << 6),
+)
+BIT_REMARK_PROBLEME = 1 << 0
+BIT_REMARK_LIBER = 1 << 1
+BIT_VARSTA_LIPSA = 1 << 7  # vârsta nu este numerică (lipsă sau text în text_varsta)
+
+# Coloanele text: (cheia din rândul parsat, secțiunea cu codurile din tabela de texte)
+COLOANE_TEXT = (
+    ('Data Cursei', 'text_data'),
+    ('Pista', 'text_pista'),
+    ('Grad Cursa', 'text_grad'),
+    ('FINAL', 'text_final'),
+    ('Sex', 'text_sex'),
+    ('Nume Ogar', 'text_nume'),
+    ('REMARK', 'text_remark'),
+    ('CURBA', 'text_curba'),
+)
+
+# Toate secțiunile, în ordinea din fișier: (nume, typecode pentru memoryview.cast)
+SECTIUNI = (
+    tuple((sectiune, tip) for _, sectiune, tip, _ in COLOANE_INT + COLOANE_FLOAT)
+    + (('varsta', 'd'), ('data', 'i'), ('flaguri', 'H'))
+    + tuple((sectiune, 'I') for _, sectiune in COLOANE_TEXT)
+    + (('text_varsta', 'I'), ('texte_offseturi', 'Q'), ('texte', 'B'),
+       ('ogari_nume', 'I'), ('ogari_offseturi', 'I'), ('ogari_randuri', 'I'), ('metadate', 'B'))
+)
+
+# Antetul exportului CSV: coloanele din care parserul reconstruiește exact rândurile snapshot-ului
+ANTET_EXPORT_CSV = ('NUME', 'SEX', 'VARSTA', 'DATA', 'PISTA', 'DISTANTA', 'BOXA', 'SECTIONAL', 'CURBA', 'POZITIE',
+                    'REMARK', 'FINAL', 'GRAD')
+
+
+def cale_snapshot_implicita(cale_istoric):
+    return os.path.splitext(cale_istoric)[0] + SNAPSHOT_EXTENSIE
+
+
+def _verifica_ordinea_octetilor():
+    # Coloanele sunt scrise/citite în ordinea nativă; formatul este definit little-endian
+    if sys.byteorder != 'little':
+        raise ValueError("Snapshot-urile binare sunt suportate doar pe platforme little-endian.")
+
+
+class _TabelaTexte:
+    # Texte distincte -> cod (în ordinea primei apariții)
+    def __init__(self):
+        self.coduri = {}
+        self.offseturi = array('Q', [0])
+        self.octeti = bytearray()
+
+    def cod(self, text):
+        if text is None:
+            return TEXT_LIPSA
+        cod = self.coduri.get(text)
+        if cod is None:
+            cod = self.coduri[text] = len(self.coduri)
+            self.octeti += text.encode('utf-8')
+            self.offseturi.append(len(self.octeti))
+        return cod
+
+
+def scrie_snapshot(cale_snapshot, istoric, sursa=None, avertismente=None):
+    """
+    Scrie rândurile parsate (lista produsă de parser) în fișierul snapshot. Scriere atomică (fișier temporar +
+    os.replace): procesele care au deja snapshot-ul vechi deschis îl citesc în continuare nemodificat.
+    sursa: semnătura fișierului de istoric din care provine (salvată în metadate).
+    """
+    _verifica_ordinea_octetilor()
+    texte = _TabelaTexte()
+    coloane = {sectiune: array(tip) for sectiune, tip in SECTIUNI if sectiune not in ('texte_offseturi', 'texte', 'metadate')}
+    ogari = {}  # cod nume -> rândurile ogarului, în ordinea din istoric
+
+    for i, rand in enumerate(istoric):
+        flaguri = 0
+        for cheie, sectiune, _, bit in COLOANE_INT + COLOANE_FLOAT:
+            valoare = rand.get(cheie)
+            if valoare is None:
+                flaguri |= bit
+                valoare = 0
+            coloane[sectiune].append(valoare)
+
+        varsta = rand.get('Varsta')
+        if isinstance(varsta, float):
+            coloane['varsta'].append(varsta)
+            coloane['text_varsta'].append(TEXT_LIPSA)
+        else:
+            flaguri |= BIT_VARSTA_LIPSA
+            coloane['varsta'].append(0.0)
+            coloane['text_varsta'].append(texte.cod(varsta))
+
+        data = rand.get('Data Cursei Parsata')
+        coloane['data'].append(data.toordinal() if isinstance(data, datetime) else 0)
+        if rand.get('Remark Probleme'):
+            flaguri |= BIT_REMARK_PROBLEME
+        if rand.get('Remark Liber'):
+            flaguri |= BIT_REMARK_LIBER
+        coloane['flaguri'].append(flaguri)
+
+        for cheie, sectiune in COLOANE_TEXT:
+            coloane[sectiune].append(texte.cod(rand.get(cheie)))
+        ogari.setdefault(coloane['text_nume'][i], []).append(i)
+
+    for cod_nume, randuri in ogari.items():
+        coloane['ogari_nume'].append(cod_nume)
+        coloane['ogari_randuri'].extend(randuri)
+        coloane['ogari_offseturi'].append(len(coloane['ogari_randuri']) - len(randuri))
+    coloane['ogari_offseturi'].append(len(coloane['ogari_randuri']))
+
+    coloane['texte_offseturi'] = texte.offseturi
+    coloane['texte'] = texte.octeti
+    coloane['metadate'] = json.dumps({'sursa': sursa, 'avertismente': list(avertismente or []),
+                                      'creat': datetime.now().isoformat(timespec='seconds')},
+                                     ensure_ascii=False).encode('utf-8')
+
+    cale_tmp = cale_snapshot + f'.{os.getpid()}.tmp'
+    with open(cale_tmp, 'wb') as f:
+        f.write(ANTET.pack(MAGIC_SNAPSHOT, VERSIUNE_SNAPSHOT, VERSIUNE_CACHE, len(coloane['flaguri']),
+                           len(texte.coduri), len(ogari)))
+        offset = _aliniaza(ANTET.size + INTRARE_SECTIUNE.size * len(SECTIUNI))
+        continut = []
+        for sectiune, _ in SECTIUNI:
+            octeti = bytes(coloane[sectiune]) if isinstance(coloane[sectiune], (bytes, bytearray)) else coloane[sectiune].tobytes()
+            f.write(INTRARE_SECTIUNE.pack(offset, len(octeti)))
+            continut.append((offset, octeti))
+            offset = _aliniaza(offset + len(octeti))
+        for offset, octeti in continut:
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(octeti)
+    os.replace(cale_tmp, cale_snapshot)
+    return cale_snapshot
+
+
+def _aliniaza(offset):
+    return (offset + ALINIERE - 1) // ALINIERE * ALINIERE
+
+
+class SnapshotIstoric:
+    """
+    Istoricul dintr-un snapshot, citit direct din paginile mapate. Se comportă ca lista rândurilor parsate
+    (len, indexare, iterare - rândurile se construiesc la cerere) și ca un HistoryIndex
+    (randuri_ogar / randuri_relevante / are_istoric_relevant), deci poate fi dat direct predicției.
+    """
+
+    def __init__(self, cale_snapshot):
+        _verifica_ordinea_octetilor()
+        self.cale = os.path.abspath(cale_snapshot)
+        with open(self.cale, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < ANTET.size:
+                raise ValueError(f"'{os.path.basename(self.cale)}' nu este un snapshot de istoric (fișier prea scurt).")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, versiune, versiune_randuri, self.numar_randuri, self.numar_texte, self.numar_ogari = ANTET.unpack_from(self._mmap, 0)
+        if magic != MAGIC_SNAPSHOT:
+            self.inchide()
+            raise ValueError(f"'{os.path.basename(self.cale)}' nu este un snapshot de istoric.")
+        if versiune != VERSIUNE_SNAPSHOT or versiune_randuri != VERSIUNE_CACHE:
+            self.inchide()
+            raise ValueError(f"Snapshot-ul '{os.path.basename(self.cale)}' are versiunea {versiune}.{versiune_randuri}, "
+                             f"se așteaptă {VERSIUNE_SNAPSHOT}.{VERSIUNE_CACHE}; recreați-l din fișierul de istoric.")
+
+        vedere = memoryview(self._mmap)
+        self._coloane = {}
+        for i, (sectiune, tip) in enumerate(SECTIUNI):
+            offset, lungime = INTRARE_SECTIUNE.unpack_from(self._mmap, ANTET.size + i * INTRARE_SECTIUNE.size)
+            if offset + lungime > len(self._mmap):
+                self.inchide()
+                raise ValueError(f"Snapshot-ul '{os.path.basename(self.cale)}' este trunchiat.")
+            self._coloane[sectiune] = vedere[offset:offset + lungime].cast(tip)
+        vedere.release()
+
+        metadate = json.loads(bytes(self._coloane['metadate']).decode('utf-8'))
+        self.sursa = metadate.get('sursa')
+        self.avertismente = metadate.get('avertismente', [])
+        self._texte = {}
+        self._index_ogari = None
+        self._randuri_ogar = {}
+        self._randuri_relevante = {}
+
+    def __reduce__(self):
+        # Către procesele worker se trimite doar calea: fiecare redeschide fișierul și împarte aceleași pagini
+        return deschide_snapshot, (self.cale,)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.inchide()
+        return False
+
+    def inchide(self):
+        for coloana in getattr(self, '_coloane', {}).values():
+            coloana.release()
+        self._coloane = {}
+        self._mmap.close()
+
+    @property
+    def istoric(self):
+        return self
+
+    def coloana(self, nume_sectiune):
+        """
+        Secțiunea ca memoryview tipizat peste paginile mapate (fără copiere), ex. coloana('timp_final').
+        """
+        return self._coloane[nume_sectiune]
+
+    def text(self, cod):
+        if cod == TEXT_LIPSA:
+            return None
+        text = self._texte.get(cod)
+        if text is None:
+            offseturi = self._coloane['texte_offseturi']
+            text = self._texte[cod] = str(self._coloane['texte'][offseturi[cod]:offseturi[cod + 1]], 'utf-8')
+        return text
+
+    def rand(self, i):
+        """
+        Rândul i, cu aceleași chei și valori ca rândul produs de parser.
+        """
+        c = self._coloane
+        flaguri = c['flaguri'][i]
+        valori = {}
+        for cheie, sectiune in COLOANE_TEXT:
+            valori[cheie] = self.text(c[sectiune][i])
+        for cheie, sectiune, _, bit in COLOANE_INT + COLOANE_FLOAT:
+            valori[cheie] = None if flaguri & bit else c[sectiune][i]
+        valori['Varsta'] = self.text(c['text_varsta'][i]) if flaguri & BIT_VARSTA_LIPSA else c['varsta'][i]
+        data = c['data'][i]
+        valori['Data Cursei Parsata'] = datetime.fromordinal(data) if data else None
+        valori['Remark Probleme'] = bool(flaguri & BIT_REMARK_PROBLEME)
+        valori['Remark Liber'] = bool(flaguri & BIT_REMARK_LIBER)
+        return RandIstoric.din_dict(valori)
+
+    def __len__(self):
+        return self.numar_randuri
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.rand(j) for j in range(*i.indices(self.numar_randuri))]
+        if i < 0:
+            i += self.numar_randuri
+        if not 0 <= i < self.numar_randuri:
+            raise IndexError("index rând în afara snapshot-ului")
+        return self.rand(i)
+
+    def __iter__(self):
+        return (self.rand(i) for i in range(self.numar_randuri))
+
+    def _index_ogar(self, nume_ogar):
+        if self._index_ogari is None:
+            # Doar numele ogarilor sunt decodate (o dată, la prima căutare)
+            self._index_ogari = {self.text(cod): i for i, cod in enumerate(self._coloane['ogari_nume'])}
+        return self._index_ogari.get(nume_ogar)
+
+    def randuri_ogar(self, nume_ogar):
+        randuri = self._randuri_ogar.get(nume_ogar)
+        if randuri is None:
+            index = self._index_ogar(nume_ogar)
+            if index is None:
+                return []
+            offseturi = self._coloane['ogari_offseturi']
+            randuri = self._randuri_ogar[nume_ogar] = [
+                self.rand(i) for i in self._coloane['ogari_randuri'][offseturi[index]:offseturi[index + 1]]]
+        return randuri
+
+    def randuri_relevante(self, nume_ogar, pista, distanta):
+        cheie = (nume_ogar, pista, distanta)
+        randuri = self._randuri_relevante.get(cheie)
+        if randuri is None:
+            randuri = [rand for rand in self.randuri_ogar(nume_ogar)
+                       if rand['Pista'] == pista and rand['Distanta Cursei (m)'] == distanta]
+            randuri.sort(key=_cheie_data_descrescator)
+            self._randuri_relevante[cheie] = randuri
+        return randuri
+
+    def are_istoric_relevant(self, nume_ogar, pista, distanta):
+        return bool(self.randuri_relevante(nume_ogar, pista, distanta))
+
+
+_SNAPSHOTURI_DESCHISE = {}
+
+
+def deschide_snapshot(cale_snapshot):
+    """
+    Snapshot-ul deschis pentru cale, refolosit în proces cât timp fișierul are aceeași dimensiune și același mtime
+    (un snapshot înlocuit este redeschis; cel vechi rămâne valid pentru cine îl folosește încă).
+    """
+    cale_absoluta = os.path.abspath(cale_snapshot)
+    info = os.stat(cale_absoluta)
+    cheie_stat = (info.st_size, info.st_mtime_ns)
+    intrare = _SNAPSHOTURI_DESCHISE.get(cale_absoluta)
+    if intrare is None or intrare[0] != cheie_stat:
+        intrare = _SNAPSHOTURI_DESCHISE[cale_absoluta] = (cheie_stat, SnapshotIstoric(cale_absoluta))
+    return intrare[1]
+
+
+def creeaza_snapshot(cale_istoric, cale_snapshot=None, foloseste_cache=None):
+    """
+    Parsează fișierul de istoric (CSV sau .xlsx, prin cache-ul obișnuit) și scrie snapshot-ul lui.
+    Returnează (cale_snapshot, numar_randuri). Ridică ValueError la erorile fatale de parsare.
+    """
+    from cache_istoric import semnatura_fisier
+    from predictor_logic import citeste_si_parseaza_istoric
+
+    cale_snapshot = cale_snapshot or cale_snapshot_implicita(cale_istoric)
+    erori = []
+    istoric = citeste_si_parseaza_istoric(cale_istoric, erori, foloseste_cache=foloseste_cache)
+    fatale = [eroare for eroare in erori if "FATALA" in eroare]
+    if fatale:
+        raise ValueError(fatale[0])
+    sursa = semnatura_fisier(cale_istoric)
+    scrie_snapshot(cale_snapshot, istoric, sursa=sursa, avertismente=erori)
+    return cale_snapshot, len(istoric)
+
+
+def _text_csv(valoare):
+    return '' if valoare is None else str(valoare)
+
+
+def exporta_csv(snapshot, cale_csv):
+    """
+    Scrie rândurile snapshot-ului (obiect sau cale) într-un CSV pe care parserul îl citește înapoi în aceleași
+    rânduri (coloanele absente din fișierul original devin valori goale). Returnează numărul de rânduri.
+    """
+    import csv
+
+    if not isinstance(snapshot, SnapshotIstoric):
+        snapshot = deschide_snapshot(snapshot)
+    with open(cale_csv, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, lineterminator='\r\n')
+        writer.writerow(ANTET_EXPORT_CSV)
+        for rand in snapshot:
+            writer.writerow([_text_csv(rand[cheie]) for cheie in (
+                'Nume Ogar', 'Sex', 'Varsta', 'Data Cursei', 'Pista', 'Distanta Cursei (m)', 'Numar Box (Trap)',
+                'Timp Secțional 1 (s)', 'CURBA', 'Pozitie Finala', 'REMARK', 'FINAL', 'Grad Cursa')])
+    return len(snapshot)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Creează un snapshot binar al istoricului sau îl exportă în CSV.")
+    parser.add_argument('fisier', help="Fișierul de istoric (CSV/.xlsx) sau un snapshot (pentru --csv)")
+    parser.add_argument('-o', '--iesire', help=f"Snapshot-ul creat (implicit: același nume cu {SNAPSHOT_EXTENSIE})")
+    parser.add_argument('--csv', help="Exportă snapshot-ul dat în acest fișier CSV")
+    args = parser.parse_args()
+
+    try:
+        if args.csv:
+            numar = exporta_csv(args.fisier, args.csv)
+            print(f"{numar} rânduri -> {args.csv}")
+        else:
+            cale, numar = creeaza_snapshot(args.fisier, args.iesire)
+            print(f"{numar} rânduri -> {cale} ({os.path.getsize(cale) / 1024:.0f} KB)")
+    except (OSError, ValueError) as eroare:
+        print(f"Eroare: {eroare}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,76 @@
+# Verifică faptul că registrul .xlsx al unei piste dă același istoric parsat și aceleași predicții
+# ca exportul .csv al aceleiași foi (ex. coloana 'REMARKS' din Towcester.xlsx = 'REMARK' din CSV).
+# Utilizare: python verifica_paritate_xlsx.py [Towcester Yarmouth ...]   (implicit pistele cu ambele fișiere)
+# Codul de ieșire este 1 dacă apare vreo diferență.
+
+import os
+import sys
+import logging
+from datetime import timedelta
+
+from config import CSV_PER_ARENA
+from predictor_logic import citeste_istoric_cu_stare, prezice_cursa_combinata
+from index_istoric import HistoryIndex
+
+
+def curse_de_verificat(index, numar_ogari=6):
+    """
+    O cursă per (pistă, distanță) din istoric, cu ogarii care au alergat acolo, datată după ultima cursă din fișier.
+    """
+    date = [rand.get('Data Cursei Parsata') for rand in index.istoric if rand.get('Data Cursei Parsata')]
+    data_cursa = (max(date) + timedelta(days=1)).strftime('%d/%m/%Y') if date else ''
+    ogari_per_traseu = {}
+    for nume, pista, distanta in index.per_ogar_pista_distanta:
+        ogari_per_traseu.setdefault((pista, distanta), []).append(nume)
+    return [{
+        'pista': pista,
+        'distanta_m': distanta,
+        'grad': '',
+        'data_cursa': data_cursa,
+        'ogari_participanti': [(nume, box) for box, nume in enumerate(sorted(ogari)[:numar_ogari], start=1)],
+    } for (pista, distanta), ogari in ogari_per_traseu.items() if pista and distanta]
+
+
+def verifica_paritate(cale_csv, cale_xlsx, afiseaza_max=10):
+    """
+    Compară rândurile parsate și predicțiile; returnează lista diferențelor (texte).
+    """
+    erori_csv, erori_xlsx = [], []
+    istoric_csv, _ = citeste_istoric_cu_stare(cale_csv, erori_csv, foloseste_cache=False)
+    istoric_xlsx, _ = citeste_istoric_cu_stare(cale_xlsx, erori_xlsx, foloseste_cache=False)
+    diferente = [f"erori la citire: {eroare}" for eroare in erori_csv + erori_xlsx if "FATALA" in eroare]
+    if len(istoric_csv) != len(istoric_xlsx):
+        diferente.append(f"număr de rânduri diferit: CSV {len(istoric_csv)}, xlsx {len(istoric_xlsx)}")
+
+    for linie, (rand_csv, rand_xlsx) in enumerate(zip(istoric_csv, istoric_xlsx), start=1):
+        for cheie in rand_csv:
+            if rand_csv.get(cheie) != rand_xlsx.get(cheie):
+                diferente.append(f"rândul {linie}, '{cheie}': CSV {rand_csv.get(cheie)!r}, xlsx {rand_xlsx.get(cheie)!r}")
+
+    index_csv, index_xlsx = HistoryIndex(istoric_csv), HistoryIndex(istoric_xlsx)
+    for cursa in curse_de_verificat(index_csv):
+        predictie_csv = prezice_cursa_combinata(cale_csv, cursa, index_istoric=index_csv)[0]
+        predictie_xlsx = prezice_cursa_combinata(cale_xlsx, cursa, index_istoric=index_xlsx)[0]
+        if predictie_csv != predictie_xlsx:
+            diferente.append(f"predicții diferite pentru {cursa['pista']} {cursa['distanta_m']}m")
+
+    for diferenta in diferente[:afiseaza_max]:
+        print(f"  {diferenta}")
+    if len(diferente) > afiseaza_max:
+        print(f"  ... încă {len(diferente) - afiseaza_max} diferențe")
+    return diferente
+
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)  # avertismentele predicției (grad lipsă etc.) sunt aceleași pe ambele fișiere
+    arene = sys.argv[1:] or [arena for arena, fisier in CSV_PER_ARENA.items()
+                             if os.path.isfile(fisier) and os.path.isfile(os.path.splitext(fisier)[0] + '.xlsx')]
+    cu_diferente = False
+    for arena in arene:
+        cale_csv = CSV_PER_ARENA.get(arena, f"{arena}.csv")
+        cale_xlsx = os.path.splitext(cale_csv)[0] + '.xlsx'
+        print(f"{arena}: {cale_csv} <-> {cale_xlsx}")
+        diferente = verifica_paritate(cale_csv, cale_xlsx)
+        cu_diferente = cu_diferente or bool(diferente)
+        print("  identice" if not diferente else f"  {len(diferente)} diferențe")
+    sys.exit(1 if cu_diferente else 0)